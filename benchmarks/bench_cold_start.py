@@ -0,0 +1,87 @@
+"""
+Холодний старт і вартість rerun застосунку (app.py) через
+streamlit.testing AppTest, кожен замір — у свіжому процесі:
+
+- перший запуск сторінки (імпорти модулів + рендер режиму за замовчуванням);
+- перше перемикання на кожен режим (підвантаження його залежностей);
+- середній rerun уже відкритої сторінки.
+
+З --baseline REV те саме міряється для версії REV (через git archive),
+щоб порівняти до і після.
+
+Запуск:  python benchmarks/bench_cold_start.py [--baseline HEAD~1] [--reruns 20]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+_PROBE = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+app, reruns = sys.argv[1], int(sys.argv[2])
+before = len(sys.modules)
+at = AppTest.from_file(app, default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+result = {"cold": time.perf_counter() - t0, "modules": len(sys.modules) - before, "modes": {}}
+
+t0 = time.perf_counter()
+for _ in range(reruns):
+    at.run()
+result["rerun"] = (time.perf_counter() - t0) / reruns
+
+for label in at.sidebar.selectbox[0].options:
+    at.sidebar.selectbox[0].set_value(label)
+    t0 = time.perf_counter()
+    at.run()
+    result["modes"][label] = time.perf_counter() - t0
+print(json.dumps(result))
+"""
+
+
+def measure(root: str, reruns: int) -> dict:
+    env = dict(os.environ, METRICS_LOG_PATH=os.devnull)
+    out = subprocess.run([sys.executable, "-c", _PROBE, os.path.join(root, "app.py"), str(reruns)],
+                         cwd=root, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def checkout(rev: str, directory: str) -> str:
+    archive = subprocess.run(["git", "-C", ROOT, "archive", "--format=tar", rev],
+                             capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory)
+    return directory
+
+
+def report(name: str, r: dict):
+    print(f"{name}: холодний старт {r['cold'] * 1000:7.0f} ms ({r['modules']} модулів), "
+          f"rerun {r['rerun'] * 1000:6.1f} ms")
+    for label, seconds in r["modes"].items():
+        print(f"    перше відкриття «{label}»: {seconds * 1000:7.0f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--baseline", default=None, metavar="REV", help="версія для порівняння")
+    ap.add_argument("--reruns", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            report(args.baseline, measure(checkout(args.baseline, tmp), args.reruns))
+    report("поточна версія", measure(ROOT, args.reruns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Стиснення транскриптів перед запитом до GPT (compaction.py, llm.preflight)
+на синтетичних багатогодинних транскриптах Whisper: швидкість кожного
+кроку і всього preflight, кількість токенів до і після стиснення.
+
+Транскрипт — ~140 слів на хвилину лекції: речення зі словника, звуки
+вагання й вставні слова, заїкання на службових словах, повтори речень,
+без переносів рядків.
+
+Запуск:  python benchmarks/bench_compaction.py [години,через,кому]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from compaction import collapse_repeated_sentences, drop_fillers, normalize_whitespace
+from llm import count_tokens, preflight, tiktoken
+
+WORDS_PER_MINUTE = 140
+ROUNDS = 3
+
+_VOCAB = ("мережа", "протокол", "пакет", "вузол", "маршрутизатор", "адреса", "передача", "канал",
+          "швидкість", "затримка", "сервер", "клієнт", "запит", "відповідь", "з'єднання", "порт",
+          "шифрування", "ключ", "сертифікат", "рівень", "модель", "стек", "кадр", "комутатор")
+_LINKS = ("і", "але", "тому", "що", "коли", "якщо", "як", "для", "через", "на", "в", "з")
+_HESITATIONS = ("ну,", "е-е", "ем", "ммм...", "а-а,")
+_PARENTHETICALS = (", типу,", ", короче,", ", значить,", ", так би мовити,")
+_STUTTERS = ("я", "і", "в", "на", "до")
+
+
+def make_transcript(hours: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    target = int(hours * 60 * WORDS_PER_MINUTE)
+    sentences, said, words = [], [], 0
+    while words < target:
+        if said and rng.random() < 0.08:
+            # лектор повторює вже сказане
+            sentence = rng.choice(said[-50:])
+        else:
+            parts = []
+            for _ in range(rng.randint(6, 18)):
+                word = rng.choice(_VOCAB) if rng.random() < 0.6 else rng.choice(_LINKS)
+                roll = rng.random()
+                if roll < 0.05:
+                    parts.append(rng.choice(_HESITATIONS))
+                elif roll < 0.08:
+                    word += rng.choice(_PARENTHETICALS)
+                elif roll < 0.10:
+                    parts.append(rng.choice(_STUTTERS))  # заїкання: «я я»
+                    parts.append(parts[-1])
+                parts.append(word)
+            sentence = " ".join(parts).capitalize() + rng.choice(".....?")
+            said.append(sentence)
+        sentences.append(sentence)
+        words += sentence.count(" ") + 1
+    # сегменти Whisper склеюються пробілом, подекуди подвійним
+    return " ".join(s + ("  " if rng.random() < 0.1 else "") for s in sentences)
+
+
+def _best(fn, arg):
+    best, out = float("inf"), None
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        out = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    hours = [float(h) for h in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1, 3, 8]
+    print(f"підрахунок токенів: {'tiktoken' if tiktoken is not None else 'оцінка за символами'}")
+    for h in hours:
+        text = make_transcript(h)
+        mb = len(text.encode("utf-8")) / 1e6
+        stages = []
+        out = text
+        for name, fn in (("пробіли", normalize_whitespace), ("паразити", drop_fillers),
+                         ("повтори речень", collapse_repeated_sentences)):
+            out, seconds = _best(fn, out)
+            stages.append(f"{name} {seconds * 1000:.0f} ms")
+        (_, report), total = _best(lambda t: preflight(t, chunked=None), text)
+        print(f"{h:g} год: {len(text.split())} слів, {mb:.2f} MB, токенів {count_tokens(text)} → "
+              f"{report['compacted_tokens']} (−{1 - report['compacted_tokens'] / report['input_tokens']:.0%}); "
+              f"preflight {total * 1000:.0f} ms ({mb / total:.1f} MB/s): {', '.join(stages)}")
+
+
+if __name__ == "__main__":
+    main()
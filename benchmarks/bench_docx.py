@@ -0,0 +1,81 @@
+"""
+Порівняння рушіїв parse_from_word: DOM python-docx проти потокового
+розбору word/document.xml. Кожен рушій запускається в окремому процесі,
+щоб виміряти пікове RSS.
+
+Запуск:  python benchmarks/bench_docx.py [кількість_питань]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+def make_docx(path, questions):
+    """Документ з питаннями-абзацами, жирними відповідями та inline-питаннями."""
+    from docx import Document
+
+    doc = Document()
+    for q in range(questions):
+        if q % 10 == 9:
+            # inline-формат із багатьма ранами — найгірший випадок для старого рушія
+            p = doc.add_paragraph(f"Питання {q}: ")
+            for a in range(6):
+                run = p.add_run(f"варіант {a} до {q}; ")
+                run.bold = a == 2
+            continue
+        doc.add_paragraph(f"{q + 1}. Що означає поняття номер {q} у цьому курсі?")
+        for a, letter in enumerate("ABCD"):
+            p = doc.add_paragraph(f"{letter}. ")
+            p.add_run(f"Відповідь {a} до питання {q}").bold = a == q % 4
+    doc.save(path)
+
+
+def peak_rss_mb() -> float:
+    """
+    Пікове RSS поточного процесу. VmHWM з /proc скидається при exec, а
+    ru_maxrss на Linux успадковується від батьківського процесу.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(engine, path):
+    from parsers import parse_from_word
+    t0 = time.perf_counter()
+    qs, errs = parse_from_word(path, engine=engine)
+    elapsed = time.perf_counter() - t0
+    rss_mb = peak_rss_mb()
+    print(f"{engine:12} {len(qs)} питань, {len(errs)} помилок: "
+          f"{elapsed:6.2f} s, пікове RSS {rss_mb:7.1f} MB")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.docx")
+        make_docx(path, n)
+        print(f"{n} питань, файл {os.path.getsize(path) / 1e6:.1f} MB")
+
+        from parsers import parse_from_word
+        assert parse_from_word(path, engine="python-docx") == parse_from_word(path, engine="stream"), \
+            "результати рушіїв відрізняються"
+        for engine in ("python-docx", "stream"):
+            subprocess.run([sys.executable, __file__, "--child", engine, path], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Порівняння парсера Excel: попередня реалізація (повне завантаження книги,
+ws['A'], проміжний список items) проти потокового режиму read_only.
+
+Кожен варіант запускається в окремому процесі, щоб виміряти пікове RSS.
+
+Запуск:  python benchmarks/bench_excel.py [кількість_рядків]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+
+def legacy_parse_from_excel(uploaded_file):
+    """Попередня реалізація parse_from_excel (лише активний аркуш)."""
+    from openpyxl import load_workbook
+    from parsers import _is_correct_cell
+
+    wb = load_workbook(uploaded_file, data_only=True)
+    ws = wb.active
+    items = []
+    for cell in ws['A']:
+        txt = str(cell.value).strip() if cell.value is not None else ""
+        items.append((txt, _is_correct_cell(cell)))
+    blocks, curr = [], []
+    for txt, corr in items:
+        if not txt and curr:
+            blocks.append(curr)
+            curr = []
+        elif txt:
+            curr.append((txt, corr))
+    if curr:
+        blocks.append(curr)
+    questions, errors = [], []
+    for idx, blk in enumerate(blocks, 1):
+        if len(blk) < 3:
+            errors.append((idx, "Потрібно принаймні 1 питання та 2 відповіді"))
+            continue
+        questions.append({"text": blk[0][0], "answers": blk[1:]})
+    return questions, errors
+
+
+def make_workbook(path, rows):
+    """
+    Книга з блоками «питання + 4 відповіді + порожній рядок», одна жовта.
+    Звичайний режим збереження дає shared strings і <dimension>, як у Excel.
+    """
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    yellow = PatternFill('solid', start_color='FFFF00')
+    r, q = 1, 0
+    while r <= rows:
+        ws.cell(r, 1, f"Питання {q}: що таке поняття {q}?")
+        for a in range(4):
+            cell = ws.cell(r + 1 + a, 1, f"Відповідь {a} до питання {q}")
+            if a == q % 4:
+                cell.fill = yellow
+        r += 6
+        q += 1
+    wb.save(path)
+
+
+def peak_rss_mb() -> float:
+    """
+    Пікове RSS поточного процесу. VmHWM з /proc скидається при exec, а
+    ru_maxrss на Linux успадковується від батьківського процесу.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(impl, path):
+    from parsers import parse_from_excel
+    fn = legacy_parse_from_excel if impl == "legacy" else parse_from_excel
+    t0 = time.perf_counter()
+    qs, errs = fn(path)
+    elapsed = time.perf_counter() - t0
+    rss_mb = peak_rss_mb()
+    print(f"{impl:8} {len(qs)} питань, {len(errs)} помилок: "
+          f"{elapsed:6.2f} s, пікове RSS {rss_mb:7.1f} MB")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        make_workbook(path, rows)
+        print(f"{rows} рядків, файл {os.path.getsize(path) / 1e6:.1f} MB")
+        for impl in ("legacy", "stream"):
+            subprocess.run([sys.executable, __file__, "--child", impl, path], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Порівняння часу генерації питань з довгого тексту: послідовні запити по
+фрагментах проти паралельних (generate_questions_chunked) на локальній
+заглушці API.
+
+Запуск:  python benchmarks/bench_gpt_chunked.py [кількість_абзаців]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import openai
+
+import llm
+from stub_llm_server import start_stub_server
+
+
+def make_text(paragraphs: int) -> str:
+    return "\n\n".join(
+        " ".join(f"Поняття{p}_{s} описує властивість системи номер {s} у розділі {p}."
+                 for s in range(40))
+        for p in range(paragraphs)
+    )
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    server, base = start_stub_server()
+    openai.api_base, openai.api_key = base, "stub"
+    text = make_text(paragraphs)
+    chunks = llm.split_text(text, max_tokens=1500)
+    print(f"текст {len(text)} символів, {len(chunks)} фрагментів")
+
+    per_chunk = max(3, -(-2 * 10 // len(chunks)))
+    prompt = llm.CHUNK_PROMPT.format(count=per_chunk)
+    t0 = time.perf_counter()
+    for chunk in chunks:
+        llm.chat_completion(chunk, system_prompt=prompt, cache=None)
+    serial = time.perf_counter() - t0
+    print(f"послідовно:             {serial:6.2f} s")
+
+    for concurrency in (2, 4, 8):
+        t0 = time.perf_counter()
+        qs, errs = llm.generate_questions_chunked(text, count=10, max_tokens=1500,
+                                                  concurrency=concurrency, cache=None)
+        elapsed = time.perf_counter() - t0
+        print(f"паралельно (ліміт {concurrency}):  {elapsed:6.2f} s, "
+              f"{len(qs)} питань, {len(errs)} помилок, x{serial / elapsed:.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
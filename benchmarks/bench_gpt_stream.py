@@ -0,0 +1,61 @@
+"""
+Потокова генерація проти повної відповіді: час до першого питання, загальний
+час і скільки символів відповіді реально згенеровано. Заглушка API віддає
+на кілька питань більше, ніж просить промпт, — потік обривається після
+десятого коректного питання.
+
+Запуск:  python benchmarks/bench_gpt_stream.py [зайвих_питань]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import openai
+
+import llm
+from stub_llm_server import StubHandler, start_stub_server
+
+TEXT = " ".join(f"Поняття{i} описує властивість мережі номер {i}." for i in range(200))
+
+
+def main():
+    extra = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    class Handler(StubHandler):
+        latency = 0.3
+        per_token = 0.0
+        stream_delay = 0.005
+
+    Handler.extra = extra
+    server, base = start_stub_server(handler=Handler)
+    openai.api_base, openai.api_key = base, "stub"
+
+    # як раніше: повна відповідь, потім підрахунок і обрізання регулярними виразами
+    Handler.generated_chars = 0
+    t0 = time.perf_counter()
+    text = llm.chat_completion(TEXT, cache=None)
+    parts = re.findall(r'(<question[\s\S]*?</question>)', text)[:10]
+    elapsed = time.perf_counter() - t0
+    print(f"повна відповідь:  {elapsed:6.2f} s до будь-якого питання, {len(parts)} питань, "
+          f"згенеровано {Handler.generated_chars} символів")
+
+    Handler.generated_chars = 0
+    t0 = time.perf_counter()
+    first, valid = None, 0
+    for fragment, err in llm.stream_questions(TEXT, count=10, cache=None):
+        if fragment is not None:
+            valid += 1
+            first = first or time.perf_counter() - t0
+    elapsed = time.perf_counter() - t0
+    time.sleep(0.1)  # сервер помічає обрив на наступному записі
+    print(f"потоково:         {first:6.2f} s до першого питання, {elapsed:.2f} s усього, "
+          f"{valid} питань, згенеровано {Handler.generated_chars} символів")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
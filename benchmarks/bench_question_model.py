@@ -0,0 +1,61 @@
+"""
+Порівняння представлень питання: словник {"text", "answers": [(текст, bool)]}
+проти Question (question.py) з __slots__ і заздалегідь порахованими типом,
+штрафом та оцінками.
+
+Міряє пам'ять на питання (tracemalloc, тексти спільні для обох варіантів,
+тож рахується лише сама структура) і швидкість генерації XML write_moodle_xml.
+
+Запуск:  python benchmarks/bench_question_model.py [кількість_питань]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_xml_writer import _CountingSink, _questions
+from moodle_xml import write_moodle_xml
+from question import Question
+
+ROUNDS = 3
+
+
+def _memory(build):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    qs = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return qs, after - before
+
+
+def _emit(qs) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        sink = _CountingSink()
+        t0 = time.perf_counter()
+        write_moodle_xml(qs, sink)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    source = list(_questions(n))
+
+    variants = (
+        ("dict", lambda: [{"text": q["text"], "answers": list(q["answers"])} for q in source]),
+        ("Question", lambda: [Question(q["text"], q["answers"]) for q in source]),
+    )
+    for name, build in variants:
+        qs, size = _memory(build)
+        elapsed = _emit(qs)
+        print(f"{name:9} {n} питань: {size / n:6.0f} Б/питання, "
+              f"XML {elapsed:5.2f} s ({n / elapsed:8.0f} питань/с)")
+
+
+if __name__ == "__main__":
+    main()
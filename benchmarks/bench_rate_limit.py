@@ -0,0 +1,86 @@
+"""
+Перевірка openai_client під навантаженням: багато «сесій» одночасно
+надсилають запити до заглушки API, яка пропускає лише кілька запитів за
+секунду (429 з Retry-After) і зрідка відповідає 503.
+
+Без шару openai_client частина запитів падає; з ним — усі завершуються,
+однакові запити з різних сесій об'єднуються в один виклик, а сервер бачить
+набагато менше 429.
+
+Запуск:  python benchmarks/bench_rate_limit.py [сесій] [запитів_на_сесію]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import openai
+
+import openai_client
+from stub_llm_server import StubHandler, start_stub_server, throttling_handler
+
+RPS = 5
+ERROR_RATE = 0.05
+# Кількість різних текстів: решта запитів — повтори, які можна об'єднати
+DISTINCT = 10
+
+
+class FastHandler(StubHandler):
+    latency = 0.3
+    per_token = 0.0
+
+
+def _params(i: int):
+    return {
+        "model": "gpt-4",
+        "temperature": 0,
+        "messages": [{"role": "system", "content": "Створіть 3 питання"},
+                     {"role": "user", "content": f"Текст лекції номер {i % DISTINCT} про мережі."}],
+    }
+
+
+def run(label, call, sessions: int, per_session: int):
+    handler = throttling_handler(rps=RPS, error_rate=ERROR_RATE, retry_after=0.5, base=FastHandler)
+    server, base = start_stub_server(handler=handler)
+    openai.api_base, openai.api_key = base, "stub"
+
+    def session(s):
+        ok = failed = 0
+        for r in range(per_session):
+            try:
+                call(_params(s * per_session + r))
+                ok += 1
+            except openai.error.OpenAIError:
+                failed += 1
+        return ok, failed
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(session, range(sessions)))
+    elapsed = time.perf_counter() - t0
+    server.shutdown()
+    ok = sum(r[0] for r in results)
+    failed = sum(r[1] for r in results)
+    print(f"{label:22} {elapsed:6.2f} s  успішних {ok:4}  невдалих {failed:4}  "
+          f"викликів API {handler.served:4}  429: {handler.throttled:4}  503: {handler.failed:3}")
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print(f"{sessions} сесій × {per_session} запитів, сервер: {RPS} запитів/с, {ERROR_RATE:.0%} 503")
+
+    run("без openai_client", lambda p: openai.ChatCompletion.create(**p), sessions, per_session)
+
+    limiter = openai_client.RateLimiter(rpm=RPS * 60 * 0.9)
+    limiter.requests.capacity = limiter.requests.tokens = RPS  # без сплеску на старті
+    openai_client.BACKOFF_BASE = 0.25
+    run("openai_client", lambda p: openai_client.create_chat(limiter=limiter, **p),
+        sessions, per_session)
+
+
+if __name__ == "__main__":
+    main()
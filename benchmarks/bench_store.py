@@ -0,0 +1,93 @@
+"""
+Сховище питань (question_store.py) на великому банку: час імпорту і
+експорту вибірки з 1000 питань у Moodle XML за повнотекстовим пошуком,
+фільтрами за типом і джерелом та їх поєднанням.
+
+Запуск:  python benchmarks/bench_store.py [кількість_питань] [шлях_до_бази]
+(без шляху база створюється в тимчасовому каталозі й видаляється)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from question import Question
+from question_store import QuestionStore
+
+_LETTERS = "абвгдежзиклмнопрстуфхцчшщюяєії"
+SOURCES = [f"лекція_{i:02d}.docx" for i in range(50)]
+EXPORT = 1000
+
+
+def make_words(count: int = 20000, seed: int = 1):
+    """Словник випадкових слів і ваги за законом Ціпфа (частота ~ 1 / ранг)."""
+    rng = random.Random(seed)
+    words = list({"".join(rng.choices(_LETTERS, k=rng.randint(3, 10))) for _ in range(count)})
+    return words, [1 / rank for rank in range(1, len(words) + 1)]
+
+
+WORDS, WEIGHTS = make_words()
+
+
+def make_questions(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    cum = list(accumulate(WEIGHTS))
+    for i in range(n):
+        text = " ".join(rng.choices(WORDS, cum_weights=cum, k=rng.randint(8, 16))) + "?"
+        if i % 4 == 3:
+            answers = [("true", rng.random() < 0.5), ("false", False)]
+        else:
+            correct = rng.sample(range(4), 1 if i % 4 else 2)
+            answers = [(" ".join(rng.choices(WORDS, cum_weights=cum, k=3)), j in correct)
+                       for j in range(4)]
+        yield SOURCES[i % len(SOURCES)], Question(text, answers)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    tmp = None
+    if len(sys.argv) > 2:
+        path = sys.argv[2]
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "questions.db")
+    store = QuestionStore(path)
+
+    if store.count() < n:
+        t0 = time.perf_counter()
+        by_source = {}
+        for source, q in make_questions(n):
+            by_source.setdefault(source, []).append(q)
+        for source, qs in by_source.items():
+            store.add(qs, source)
+        print(f"імпорт {n} питань: {time.perf_counter() - t0:.1f} s, "
+              f"база {os.path.getsize(path) / 1e6:.0f} MB")
+
+    cases = (
+        ("часте слово", dict(query=WORDS[0])),
+        ("рідкісне слово", dict(query=WORDS[5000])),
+        ("префікс", dict(query=WORDS[3][:2] + "*")),
+        ("тип single", dict(types=["single"])),
+        ("джерело + тип", dict(sources=[SOURCES[7]], types=["multiple", "truefalse"])),
+        ("пошук + джерело", dict(query=WORDS[42], sources=SOURCES[:25])),
+    )
+    for name, filters in cases:
+        t0 = time.perf_counter()
+        total = store.count(**filters)
+        counted = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        xml = store.export(limit=EXPORT, **filters)
+        exported = time.perf_counter() - t0
+        print(f"{name:18} знайдено {total:7}, count {counted * 1000:6.1f} ms, "
+              f"експорт {min(total, EXPORT)} питань {exported * 1000:6.1f} ms ({len(xml) / 1e6:.2f} MB)")
+
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Пропускна здатність парсера готового тесту: попередня реалізація
+(re.split усього тексту + повторні re.match) проти потокового
+iter_text_format — для рядка в пам'яті та для файлу.
+
+Запуск:  python benchmarks/bench_text_parser.py [розмір_МБ]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from parsers import parse_text_format
+
+
+def legacy_parse_text_format(text: str):
+    """Попередня реалізація parse_text_format."""
+    mapping = {'а':'A','А':'A','б':'B','Б':'B','в':'C','В':'C','г':'D','Г':'D'}
+    blocks = re.split(r"(?m)(?=^\d+\.)", text.strip())
+    blocks = [blk for blk in blocks if blk.strip()]
+    corr_pattern = re.compile(r"(?i)^(?:правильн\w*\s+(?:ответ|відповід))[:]?", re.IGNORECASE)
+    questions, errors = [], []
+    for idx, block in enumerate(blocks, 1):
+        lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
+        m_q = re.match(r"^\d+\.\s*(.+)", lines[0])
+        q_text = m_q.group(1).strip() if m_q else lines[0]
+        corr_idx = next((i for i, ln in enumerate(lines) if corr_pattern.match(ln)), None)
+        if corr_idx is None:
+            errors.append((idx, "Не знайдено рядок із правильними відповідями"))
+            continue
+        ans_lines = lines[1:corr_idx]
+        corr_line = lines[corr_idx]
+        letters = re.findall(r"[A-ГA-D]", corr_line)
+        correct_set = {mapping.get(l, l.upper()) for l in letters}
+        answers = []
+        if len(ans_lines) == 1 and re.search(r"(?i)true", ans_lines[0]):
+            is_true = re.search(r"(?i)true", corr_line) is not None
+            answers = [("true", is_true), ("false", not is_true)]
+        else:
+            for ln in ans_lines:
+                m_a = re.match(r"^([A-Г])[\)\.]*\s*(.+)", ln)
+                if not m_a:
+                    errors.append((idx, f"Невірний формат відповіді: '{ln}'"))
+                    break
+                letter = mapping.get(m_a.group(1), m_a.group(1).upper())
+                answers.append((m_a.group(2).strip(), letter in correct_set))
+            if len(answers) < 2:
+                errors.append((idx, "Менше двох варіантів відповіді"))
+                continue
+        questions.append({"text": q_text, "answers": answers})
+    return questions, errors
+
+
+def make_text(target_bytes: int) -> str:
+    parts, size, i = [], 0, 0
+    while size < target_bytes:
+        if i % 4 == 3:
+            block = (f"{i + 1}. Твердження номер {i} є істинним?\n"
+                     f"Варіанти: True / False\nПравильна відповідь: True\n")
+        else:
+            block = (f"{i + 1}. Що означає поняття номер {i} у цьому курсі?\n"
+                     f"A. Перший варіант {i}\nБ) Другий варіант {i}\n"
+                     f"C. Третій варіант {i}\nD. Четвертий варіант {i}\n"
+                     f"Правильна відповідь: Б\n")
+        parts.append(block)
+        size += len(block.encode('utf-8'))
+        i += 1
+    return "\n".join(parts)
+
+
+def _run(name, fn, arg, size_mb):
+    t0 = time.perf_counter()
+    qs, errs = fn(arg)
+    elapsed = time.perf_counter() - t0
+    print(f"{name:22} {len(qs)} питань, {len(errs)} помилок: "
+          f"{elapsed:6.2f} s, {size_mb / elapsed:6.1f} МБ/с")
+    return qs, errs
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    text = make_text(int(size_mb * 1024 * 1024))
+    legacy = _run("legacy (рядок)", legacy_parse_text_format, text, size_mb)
+    stream = _run("stream (рядок)", parse_text_format, text, size_mb)
+    assert legacy == stream, "результати парсерів відрізняються"
+
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as f:
+        f.write(text)
+    try:
+        with open(f.name, encoding='utf-8') as fp:
+            _run("legacy (файл, read())", lambda p: legacy_parse_text_format(p.read()), fp, size_mb)
+        with open(f.name, encoding='utf-8') as fp:
+            _run("stream (файл)", parse_text_format, fp, size_mb)
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Порівняння пікової пам'яті та часу: generate_moodle_xml_string + encode
+проти потокового write_moodle_xml.
+
+Запуск:  python benchmarks/bench_xml_writer.py [кількість_питань]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from moodle_xml import generate_moodle_xml_string, write_moodle_xml
+
+
+class _CountingSink:
+    """Файлоподібний об'єкт, що лише рахує байти (імітує файл/сокет)."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, chunk):
+        self.size += len(chunk)
+
+
+def _questions(n):
+    """Лінивий генератор синтетичних питань різних типів."""
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            answers = [(f"Відповідь {j} до питання {i}", j == 1) for j in range(4)]
+        elif kind == 1:
+            answers = [(f"Варіант {j} до питання {i}", j < 2) for j in range(4)]
+        else:
+            answers = [("true", True), ("false", False)]
+        yield {"text": f"Питання номер {i}: що означає термін {i}?", "answers": answers}
+
+
+def _measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # для звичайного шляху список питань уже існує в пам'яті, тож
+    # міряємо лише генерацію, а не побудову самих питань
+    qs = list(_questions(n))
+
+    def string_path():
+        return len(generate_moodle_xml_string(qs).encode('utf-8'))
+
+    def stream_path():
+        sink = _CountingSink()
+        write_moodle_xml(qs, sink)
+        return sink.size
+
+    for name, fn in (("string+encode", string_path), ("write_moodle_xml", stream_path)):
+        size, elapsed, peak = _measure(fn)
+        print(f"{name:18} {n} питань: {size / 1e6:8.1f} MB XML, "
+              f"{elapsed:6.2f} s, пік пам'яті {peak / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Генератор синтетичного корпусу для бенчмарків: Excel із жовтими правильними
+відповідями, Word із жирними відповідями, готовий тест у тексті, банк
+питань у Moodle XML та списки питань для generate_moodle_xml_string.
+
+.xlsx і .docx пишуться напряму як zip із XML (shared strings, <dimension>,
+стилі із заливкою) — так 100k питань генеруються за секунди і без
+залежності від швидкості openpyxl/python-docx на запис.
+"""
+import os
+import zipfile
+from xml.sax.saxutils import escape
+
+ANSWERS = 4
+
+
+def question_text(i: int) -> str:
+    return f"Що означає поняття номер {i} у розділі {i // 50 + 1} цього курсу?"
+
+
+def answer_text(i: int, a: int) -> str:
+    return f"Варіант відповіді {a + 1} до питання {i}"
+
+
+def correct_answers(i: int):
+    """Кожне п'яте питання — з кількома правильними відповідями."""
+    return {i % ANSWERS, (i + 2) % ANSWERS} if i % 5 == 4 else {i % ANSWERS}
+
+
+def make_questions(n: int):
+    """Питання у форматі, який приймає generate_moodle_xml_string."""
+    qs = []
+    for i in range(n):
+        if i % 4 == 3:
+            answers = [("true", i % 2 == 0), ("false", i % 2 == 1)]
+        else:
+            corr = correct_answers(i)
+            answers = [(answer_text(i, a), a in corr) for a in range(ANSWERS)]
+        qs.append({"text": question_text(i), "answers": answers})
+    return qs
+
+# ================== Готовий тест (.txt) ==================
+
+def make_ready_text(path: str, n: int):
+    letters = "ABCD"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            if i % 4 == 3:
+                f.write(f"{i + 1}. Твердження номер {i} є істинним?\n"
+                        f"Варіанти: True / False\n"
+                        f"Правильна відповідь: {'True' if i % 2 == 0 else 'False'}\n\n")
+                continue
+            f.write(f"{i + 1}. {question_text(i)}\n")
+            for a in range(ANSWERS):
+                f.write(f"{letters[a]}. {answer_text(i, a)}\n")
+            corr = ", ".join(letters[a] for a in sorted(correct_answers(i)))
+            f.write(f"Правильна відповідь: {corr}\n\n")
+
+# ================== Excel (.xlsx) ==================
+
+_XLSX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+</Types>"""
+
+_XLSX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_XLSX_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Питання" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_XLSX_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+
+# Стиль 1 — суцільна заливка FFFF00 (позначка правильної відповіді)
+_XLSX_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>
+<fill><patternFill patternType="solid"><fgColor rgb="FFFFFF00"/><bgColor indexed="64"/></patternFill></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="0" fontId="0" fillId="2" borderId="0" xfId="0" applyFill="1"/></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+
+def make_xlsx(path: str, n: int):
+    """Колонка A: питання, 4 відповіді (правильні — жовті), порожній рядок."""
+    rows = n * (ANSWERS + 2) - 1
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _XLSX_RELS)
+        zf.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _XLSX_STYLES)
+
+        strings = n * (ANSWERS + 1)
+        with zf.open("xl/sharedStrings.xml", "w") as f:
+            f.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                     '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                     f'count="{strings}" uniqueCount="{strings}">').encode())
+            for i in range(n):
+                parts = [question_text(i)] + [answer_text(i, a) for a in range(ANSWERS)]
+                f.write("".join(f"<si><t>{escape(p)}</t></si>" for p in parts).encode())
+            f.write(b"</sst>")
+
+        with zf.open("xl/worksheets/sheet1.xml", "w") as f:
+            f.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                     '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                     f'<dimension ref="A1:A{rows}"/><sheetData>').encode())
+            row, sst = 1, 0
+            for i in range(n):
+                corr = correct_answers(i)
+                cells = [f'<row r="{row}"><c r="A{row}" t="s"><v>{sst}</v></c></row>']
+                for a in range(ANSWERS):
+                    r = row + 1 + a
+                    style = ' s="1"' if a in corr else ""
+                    cells.append(f'<row r="{r}"><c r="A{r}"{style} t="s"><v>{sst + 1 + a}</v></c></row>')
+                f.write("".join(cells).encode())
+                row += ANSWERS + 2
+                sst += ANSWERS + 1
+            f.write(b"</sheetData></worksheet>")
+
+# ================== Word (.docx) ==================
+
+_DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+_DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def _w_para(*runs) -> str:
+    """Абзац з ранів (текст, жирний)."""
+    body = "".join(
+        f'<w:r>{"<w:rPr><w:b/></w:rPr>" if bold else ""}'
+        f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+        for text, bold in runs
+    )
+    return f"<w:p>{body}</w:p>"
+
+
+def make_docx(path: str, n: int):
+    """Абзац «N. питання», далі абзаци «A. » + відповідь (правильна — жирна)."""
+    letters = "ABCD"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _DOCX_RELS)
+        with zf.open("word/document.xml", "w") as f:
+            f.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                     '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                     '<w:body>').encode())
+            for i in range(n):
+                corr = correct_answers(i)
+                paras = [_w_para((f"{i + 1}. {question_text(i)}", False))]
+                paras.extend(_w_para((f"{letters[a]}. ", False), (answer_text(i, a), a in corr))
+                             for a in range(ANSWERS))
+                f.write("".join(paras).encode())
+            f.write(b"<w:sectPr/></w:body></w:document>")
+
+
+# ================== Moodle XML (банк питань) ==================
+
+def make_moodle_xml(path: str, n: int):
+    """Банк питань у Moodle XML — вихід самого застосунку для make_questions(n)."""
+    from moodle_xml import write_moodle_xml
+
+    with open(path, "wb") as f:
+        write_moodle_xml(make_questions(n), f)
+
+
+FORMATS = {
+    "excel": (".xlsx", make_xlsx),
+    "word": (".docx", make_docx),
+    "text": (".txt", make_ready_text),
+    "moodle": (".xml", make_moodle_xml),
+}
+
+
+def corpus_file(directory: str, fmt: str, n: int) -> str:
+    """Шлях до файлу корпусу; файл генерується, якщо його ще немає."""
+    ext, make = FORMATS[fmt]
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{fmt}_{n}{ext}")
+    if not os.path.exists(path):
+        tmp = path + ".part"
+        make(tmp, n)
+        os.replace(tmp, path)
+    return path
@@ -0,0 +1,186 @@
+"""
+Набір бенчмарків парсерів і генератора XML на синтетичному корпусі.
+
+Кожен вимір виконується в окремому процесі (чисте пікове RSS), результати
+пишуться в JSON для відстеження регресій між релізами.
+
+Приклади:
+    python benchmarks/run.py                              # усі формати, 10/1k/10k/100k
+    python benchmarks/run.py --sizes 10,1000 --only text,xml
+    python benchmarks/run.py --out new.json --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+import corpus
+
+DEFAULT_SIZES = (10, 1_000, 10_000, 100_000)
+
+# назва бенчмарку → (формат корпусу або None, функція, що вимірюється)
+BENCHMARKS = {
+    "excel": ("excel", "parse_from_excel"),
+    "word": ("word", "parse_from_word"),
+    "text": ("text", "parse_text_format"),
+    "moodle": ("moodle", "parse_from_moodle_xml"),
+    "xml": (None, "generate_moodle_xml_string"),
+}
+
+# Відносне погіршення, з якого --compare позначає регресію
+REGRESSION_THRESHOLD = 0.10
+
+
+def _rss_mb(field: str) -> float:
+    """VmRSS/VmHWM з /proc (Linux); 0, якщо недоступно."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _measure(name: str, path: str, n: int) -> dict:
+    """Виконується в дочірньому процесі: один вимір одного бенчмарку."""
+    import parsers
+    import moodle_xml
+
+    if name == "xml":
+        arg = corpus.make_questions(n)
+        fn = moodle_xml.generate_moodle_xml_string
+        input_bytes = None
+    else:
+        fn = getattr(parsers, BENCHMARKS[name][1])
+        input_bytes = os.path.getsize(path)
+        arg = path
+
+    baseline = _rss_mb("VmRSS")
+    if name == "text":
+        t0 = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            qs, errs = fn(f)
+        elapsed = time.perf_counter() - t0
+        count, errors = len(qs), len(errs)
+    elif name == "xml":
+        t0 = time.perf_counter()
+        out = fn(arg)
+        elapsed = time.perf_counter() - t0
+        count, errors = n, 0
+        output_bytes = len(out.encode("utf-8"))
+    else:
+        t0 = time.perf_counter()
+        qs, errs = fn(arg)
+        elapsed = time.perf_counter() - t0
+        count, errors = len(qs), len(errs)
+
+    peak = _rss_mb("VmHWM")
+    nbytes = input_bytes if input_bytes is not None else output_bytes
+    return {
+        "benchmark": name,
+        "function": BENCHMARKS[name][1],
+        "size": n,
+        "questions": count,
+        "errors": errors,
+        "seconds": round(elapsed, 6),
+        "questions_per_s": round(count / elapsed, 1) if elapsed else None,
+        "bytes": nbytes,
+        "mb_per_s": round(nbytes / 1e6 / elapsed, 3) if elapsed else None,
+        "peak_rss_mb": round(peak, 1),
+        "rss_delta_mb": round(peak - baseline, 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old: dict, new: dict):
+    """Порівнює час і пам'ять двох запусків; повертає список регресій."""
+    index = {(r["benchmark"], r["size"]): r for r in old["results"]}
+    regressions = []
+    for r in new["results"]:
+        prev = index.get((r["benchmark"], r["size"]))
+        if not prev:
+            continue
+        for key in ("seconds", "peak_rss_mb"):
+            if prev[key] and r[key] > prev[key] * (1 + REGRESSION_THRESHOLD):
+                regressions.append((r["benchmark"], r["size"], key, prev[key], r[key]))
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Бенчмарки парсерів і генератора Moodle XML")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                    help="кількості питань через кому")
+    ap.add_argument("--only", default=",".join(BENCHMARKS), help="бенчмарки через кому")
+    ap.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "moodle_xml_corpus"),
+                    help="каталог для згенерованого корпусу (перевикористовується)")
+    ap.add_argument("--out", default="bench_results.json", help="файл результатів JSON")
+    ap.add_argument("--compare", default=None, help="попередній JSON для пошуку регресій")
+    ap.add_argument("--child", nargs=3, metavar=("NAME", "PATH", "N"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        name, path, n = args.child
+        print(json.dumps(_measure(name, path, int(n))))
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    names = [b for b in args.only.split(",") if b]
+    results = []
+    for name in names:
+        fmt = BENCHMARKS[name][0]
+        for n in sizes:
+            path = corpus.corpus_file(args.corpus_dir, fmt, n) if fmt else "-"
+            proc = subprocess.run([sys.executable, __file__, "--child", name, path, str(n)],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{name:6} {n:>7}: помилка\n{proc.stderr}", file=sys.stderr)
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append(r)
+            print(f"{name:6} {n:>7}: {r['seconds']:8.3f} s  {r['questions_per_s'] or 0:>10.0f} пит/с  "
+                  f"{r['mb_per_s'] or 0:7.2f} МБ/с  пік RSS {r['peak_rss_mb']:7.1f} MB "
+                  f"(+{r['rss_delta_mb']:.1f})")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результати: {args.out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), report)
+        for name, n, key, before, after in regressions:
+            print(f"РЕГРЕСІЯ {name} {n}: {key} {before} → {after}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
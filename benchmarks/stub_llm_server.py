@@ -0,0 +1,181 @@
+"""
+Локальна заглушка OpenAI Chat Completions API для офлайн-перевірок і бенчмарків.
+
+Відповідає на POST /v1/chat/completions питаннями у форматі «готового тесту»
+(кількість береться з «Створіть N» у системному промпті) із затримкою
+latency + per_token * кількість_токенів_запиту, а на
+POST /v1/audio/transcriptions — фіксованим транскриптом. Якщо системний
+промпт просить XML, питання віддаються у форматі Moodle XML. Генерація
+імітується паузою stream_delay на кожні stream_piece символів; "stream": true
+віддає відповідь фрагментами (SSE) у міру «генерації».
+
+throttling_handler() додає обмеження запитів за секунду (429 з Retry-After)
+і випадкові 503 — для перевірки лімітера і повторів в openai_client.
+
+Запуск окремо:  python benchmarks/stub_llm_server.py [порт]
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from moodle_xml import generate_moodle_xml_string
+from parsers import parse_text_format
+
+
+def fake_questions(user_text: str, count: int) -> str:
+    """Детерміновані питання з прив'язкою до слів вхідного тексту."""
+    words = re.findall(r"\w{4,}", user_text) or ["текст"]
+    blocks = []
+    for i in range(count):
+        w = words[(i * 7) % len(words)]
+        n = i + 1
+        if i % 4 == 2:
+            blocks.append(f"{n}. Твердження {i} про «{w}» є правильним?\n"
+                          f"Варіанти: True / False\nПравильна відповідь: True")
+        elif i % 4 == 3:
+            blocks.append(f"{n}. Які ознаки {i} має «{w}»?\nA. перша\nB. друга\n"
+                          f"C. третя\nD. четверта\nПравильна відповідь: A, C")
+        else:
+            blocks.append(f"{n}. Що означає «{w}» у контексті {i}?\nA. варіант 1\n"
+                          f"B. варіант 2\nC. варіант 3\nD. варіант 4\nПравильна відповідь: B")
+    return "\n\n".join(blocks)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.5
+    per_token = 0.0005
+    # питань понад запитану кількість (модель, що «не зупиняється»)
+    extra = 0
+    stream_piece = 24
+    stream_delay = 0.01
+    # скільки символів відповідей «згенеровано» (для потоку — до обриву клієнтом)
+    generated_chars = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/audio/transcriptions"):
+            time.sleep(self.latency)
+            self._send_json(200, {"text": "Тестовий транскрипт аудіо."})
+            return
+        body = json.loads(raw)
+        system = next((m["content"] for m in body["messages"] if m["role"] == "system"), "")
+        user = next((m["content"] for m in body["messages"] if m["role"] == "user"), "")
+        m = re.search(r"Створіть\s+\**(\d+)", system)
+        count = int(m.group(1)) if m else 10
+        prompt_tokens = (len(system) + len(user)) // 3
+        time.sleep(self.latency + self.per_token * prompt_tokens)
+
+        content = fake_questions(user, count + self.extra)
+        if "XML" in system:
+            content = generate_moodle_xml_string(parse_text_format(content)[0])
+        if body.get("stream"):
+            self._send_stream(body.get("model", "stub"), content)
+            return
+        # повна відповідь чекає, доки «згенерується» весь текст
+        time.sleep(self.stream_delay * -(-len(content) // self.stream_piece))
+        type(self).generated_chars += len(content)
+        self._send_json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 3,
+                      "total_tokens": prompt_tokens + len(content) // 3},
+        })
+
+    def _send_stream(self, model: str, content: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        try:
+            for i in range(0, len(content), self.stream_piece):
+                piece = content[i:i + self.stream_piece]
+                event = {"id": "chatcmpl-stub", "object": "chat.completion.chunk",
+                         "created": int(time.time()), "model": model,
+                         "choices": [{"index": 0, "finish_reason": None, "delta": {"content": piece}}]}
+                self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                type(self).generated_chars += len(piece)
+                time.sleep(self.stream_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # клієнт обірвав потік — решта відповіді не генерується
+
+    def _send_json(self, status: int, data, headers=None):
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def throttling_handler(rps: float = 5, error_rate: float = 0.0, retry_after: float = 1.0,
+                       seed: int = 0, base=StubHandler):
+    """
+    Обробник, що пропускає не більше rps запитів за секунду (решті — 429 з
+    Retry-After) і з імовірністю error_rate відповідає 503. Лічильники
+    served / throttled / failed — атрибути повернутого класу.
+    """
+    lock = threading.Lock()
+    rng = random.Random(seed)
+    window = []
+
+    class ThrottlingHandler(base):
+        served = 0
+        throttled = 0
+        failed = 0
+
+        def do_POST(self):
+            cls = type(self)
+            with lock:
+                now = time.monotonic()
+                window[:] = [t for t in window if now - t < 1.0]
+                limited = len(window) >= rps
+                broken = not limited and rng.random() < error_rate
+                if limited:
+                    cls.throttled += 1
+                elif broken:
+                    cls.failed += 1
+                else:
+                    window.append(now)
+                    cls.served += 1
+            if limited or broken:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, kind = (429, "requests") if limited else (503, "server_error")
+                self._send_json(status, {"error": {"message": "stub throttling", "type": kind}},
+                                {"Retry-After": str(retry_after)} if limited else None)
+                return
+            super().do_POST()
+
+    return ThrottlingHandler
+
+
+def start_stub_server(port: int = 0, handler=StubHandler):
+    """Запускає сервер у фоновому потоці; повертає (сервер, api_base)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    srv, base = start_stub_server(int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Заглушка OpenAI API: {base}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -0,0 +1,138 @@
+"""Кеш розібраних завантажень, спільний для всіх сесій Streamlit у процесі."""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from moodle_xml import generate_moodle_xml_string
+from uploads import MEMORY_BUDGET, check_size, parse_memory_estimate, spooled_upload
+
+
+def content_hash(data) -> str:
+    """
+    SHA-256 вмісту файлу — ключ кешу, незалежний від імені файлу. data —
+    байти або файл (читається частинами, без копії всього вмісту).
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return hashlib.sha256(data).hexdigest()
+    h = hashlib.sha256()
+    data.seek(0)
+    for chunk in iter(lambda: data.read(1024 * 1024), b""):
+        h.update(chunk)
+    data.seek(0)
+    return h.hexdigest()
+
+
+class LRUCache:
+    """
+    Потокобезпечний кеш з обмеженою кількістю записів і витісненням LRU;
+    з maxweight обмежена ще й сумарна вага записів (put(..., weight=…)).
+    """
+
+    def __init__(self, maxsize: int = 32, maxweight: int = None):
+        self.maxsize = maxsize
+        self.maxweight = maxweight
+        self.weight = 0
+        self._data = OrderedDict()
+        self._weights = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value, weight: int = 0):
+        with self._lock:
+            self.weight += weight - self._weights.get(key, 0)
+            self._data[key] = value
+            self._weights[key] = weight
+            self._data.move_to_end(key)
+            # останній запис лишається, навіть якщо сам важчий за maxweight
+            while len(self._data) > self.maxsize or (
+                    self.maxweight is not None and self.weight > self.maxweight and len(self._data) > 1):
+                old, _ = self._data.popitem(last=False)
+                self.weight -= self._weights.pop(old)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._weights.clear()
+            self.weight = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ParsedUpload:
+    """Результат розбору файлу разом зі згенерованим (за потреби) XML."""
+
+    __slots__ = ("questions", "errors", "_xml", "_lock")
+
+    def __init__(self, questions, errors):
+        self.questions = questions
+        self.errors = errors
+        self._xml = None
+        self._lock = threading.Lock()
+
+    def xml(self) -> str:
+        """Moodle XML для питань; генерується один раз на весь час життя запису."""
+        with self._lock:
+            if self._xml is None:
+                self._xml = generate_moodle_xml_string(self.questions)
+            return self._xml
+
+
+# Модульний рівень: app.py перевиконується на кожен rerun, а імпортовані
+# модулі — ні, тож кеш живе весь час процесу і спільний для всіх сесій.
+# Вага запису — оцінка пам'яті розібраних питань (uploads.parse_memory_estimate).
+PARSE_CACHE = LRUCache(maxsize=int(os.getenv("PARSE_CACHE_SIZE", "32")),
+                       maxweight=int(os.getenv("PARSE_CACHE_BYTES", 512 * 1024 * 1024)))
+
+# (режим, file_id завантажувача, розмір) → ключ PARSE_CACHE за вмістом: на
+# кожен rerun Streamlit віддає той самий UploadedFile, і вміст не хешується знову
+UPLOAD_KEYS = LRUCache(maxsize=1024)
+
+
+def _upload_alias(kind: str, data, size: int):
+    """Ключ завантаження за file_id (UploadedFile Streamlit) або None для байтів і файлів."""
+    file_id = getattr(data, "file_id", None)
+    if not isinstance(file_id, str) or not file_id:
+        return None
+    return kind, file_id, size
+
+
+def cached_parse(kind: str, data, parser) -> ParsedUpload:
+    """
+    Повертає ParsedUpload для вмісту data (байти або завантажений файл),
+    розбираючи його парсером лише при першому зверненні. kind розрізняє
+    режими (excel/word) з однаковим вмістом. Завантаження Streamlit
+    спершу шукається за file_id і розміром, а SHA-256 вмісту рахується
+    лише для нового завантаження (чи якщо запис уже витіснено), тож той
+    самий вміст під іншим іменем чи в іншій сесії теж не розбирається знову.
+
+    Завеликий файл відхиляється (UploadTooLarge); парсер читає копію в
+    тимчасовому файлі (uploads.spooled_upload) і на час розбору резервує
+    оцінку своєї пам'яті в uploads.MEMORY_BUDGET (MemoryBudgetExceeded,
+    якщо місця так і не звільнилось).
+    """
+    size = check_size(data)
+    alias = _upload_alias(kind, data, size)
+    key = UPLOAD_KEYS.get(alias) if alias is not None else None
+    entry = PARSE_CACHE.get(key) if key is not None else None
+    if entry is not None:
+        return entry
+
+    key = (kind, content_hash(data))
+    entry = PARSE_CACHE.get(key)
+    if entry is None:
+        with spooled_upload(data) as f:
+            estimate = parse_memory_estimate(kind, f, size)
+            with MEMORY_BUDGET.reserve(estimate):
+                entry = ParsedUpload(*parser(f))
+        PARSE_CACHE.put(key, entry, weight=estimate)
+    if alias is not None:
+        UPLOAD_KEYS.put(alias, key)
+    return entry
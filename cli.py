@@ -0,0 +1,277 @@
+"""
+Пакетна конвертація файлів (.xlsx, .docx, .txt, Moodle .xml) у Moodle XML
+без веб-інтерфейсу.
+
+Приклади:
+    python cli.py dumps/ -o out/
+    python cli.py "dumps/**/*.docx" -o out/ --jobs 4
+    python cli.py bank.xml new/ --merge merged.xml
+    python cli.py bank.xml new/ --merge merged.xml --dedupe 0.85
+    python cli.py course/ --zip course.zip --shard-size 5M --shard-questions 500
+    python cli.py course/ --store                # у банк питань (question_store.py)
+    METRICS_LOG=stderr python cli.py dumps/ -o out/   # з JSON-логом етапів (metrics.py)
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dedup import DEFAULT_THRESHOLD, dedupe_bank
+from metrics import set_mode
+from modes import FORMATS
+from moodle_xml import category_path, write_moodle_xml, write_sharded_zip
+
+# Вибір парсера за розширенням файлу (реєстр форматів спільний із застосунком)
+PARSERS = {ext: fmt.parse for ext, fmt in FORMATS.items()}
+
+# Потокові варіанти парсерів для злиття (--merge) і zip (--zip)
+ITERATORS = {ext: fmt.iterate for ext, fmt in FORMATS.items()}
+
+
+def available_cpus() -> int:
+    """Кількість ядер, доступних процесу (з урахуванням affinity/cgroups)."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def collect_inputs(patterns):
+    """Розгортає каталоги та glob-шаблони у відсортований список файлів."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, f) for f in files)
+        else:
+            paths.update(glob.glob(pattern, recursive=True))
+    return sorted(p for p in paths
+                  if os.path.splitext(p)[1].lower() in PARSERS and os.path.isfile(p))
+
+
+def _format_error(err):
+    """Парсери повертають або (блок, повідомлення), або просто рядок."""
+    if isinstance(err, tuple):
+        idx, msg = err
+        return f"Блок {idx}: {msg}"
+    return str(err)
+
+
+def convert_file(path: str, out_path: str) -> dict:
+    """
+    Конвертує один файл у Moodle XML. Виконується у процесі-воркері,
+    тому повертає лише прості дані для підсумку.
+    """
+    set_mode("cli")
+    parser = PARSERS[os.path.splitext(path)[1].lower()]
+    result = {"input": path, "output": None, "questions": 0, "errors": []}
+    try:
+        qs, errs = parser(path)
+    except Exception as e:
+        result["errors"].append(f"Помилка читання файлу: {e}")
+        return result
+    result["errors"] = [_format_error(e) for e in errs]
+    result["questions"] = len(qs)
+    if qs:
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        with open(out_path, 'wb') as f:
+            write_moodle_xml(qs, f)
+        result["output"] = out_path
+    return result
+
+
+def _iter_questions(path: str, result: dict):
+    """Потоково читає питання файлу, рахуючи їх і помилки в result."""
+    try:
+        for q, err in ITERATORS[os.path.splitext(path)[1].lower()](path):
+            if err is not None:
+                result["errors"].append(f"{path}: {_format_error(err)}")
+            else:
+                result["questions"] += 1
+                yield q
+    except Exception as e:
+        result["errors"].append(f"{path}: Помилка читання файлу: {e}")
+
+
+def merge_files(paths, out_path: str, dedupe: float = None) -> dict:
+    """
+    Зливає питання з усіх файлів в один Moodle XML. Файли читаються і
+    записуються потоково, тож пам'ять не залежить від розміру банків.
+    З dedupe (поріг схожості) питання збираються в пам'ять, і з кожної
+    групи майже однакових лишається перше.
+    """
+    set_mode("cli")
+    result = {"output": out_path, "files": len(paths), "questions": 0, "errors": [],
+              "duplicates": 0}
+
+    qs = (q for path in paths for q in _iter_questions(path, result))
+    if dedupe is not None:
+        qs, clusters = dedupe_bank(list(qs), dedupe)
+        result["duplicates"] = sum(len(c) - 1 for c in clusters)
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    with open(out_path, 'wb') as f:
+        write_moodle_xml(qs, f)
+    return result
+
+
+def zip_files(paths, out_path: str, max_bytes: int = None, max_questions: int = None) -> dict:
+    """
+    Пакує питання з усіх файлів у zip із кількох Moodle XML, обмежених
+    розміром і/або кількістю питань. Кожен файл отримує власну категорію
+    $course$/<шлях без розширення> (підкаталоги стають вкладеними категоріями).
+    """
+    set_mode("cli")
+    result = {"output": out_path, "files": len(paths), "questions": 0, "errors": [], "shards": []}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    sections = (
+        (category_path(*os.path.splitext(os.path.relpath(os.path.abspath(p), root))[0].split(os.sep)),
+         _iter_questions(p, result))
+        for p in paths
+    )
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    with open(out_path, 'wb') as f:
+        result["shards"] = write_sharded_zip(
+            sections, f, max_bytes, max_questions,
+            name=os.path.splitext(os.path.basename(out_path))[0])
+    return result
+
+
+def store_files(paths, db_path: str = None) -> dict:
+    """
+    Імпортує питання з усіх файлів у сховище питань (джерело — шлях до
+    файлу); однакові питання, що вже є в банку, не дублюються.
+    """
+    from question_store import DEFAULT_STORE_PATH, QuestionStore
+
+    set_mode("cli")
+    store = QuestionStore(db_path or DEFAULT_STORE_PATH)
+    result = {"output": store.path, "files": len(paths), "questions": 0, "errors": [], "added": 0}
+    for path in paths:
+        result["added"] += store.add(_iter_questions(path, result), source=path)
+    return result
+
+
+def parse_size(text: str) -> int:
+    """Розмір у байтах: 500000, 800K, 5M, 1G."""
+    text = text.strip().upper().rstrip('B')
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _output_path(path: str, inputs_root: str, out_dir: str) -> str:
+    rel = os.path.relpath(path, inputs_root) if inputs_root else os.path.basename(path)
+    return os.path.join(out_dir, os.path.splitext(rel)[0] + '.xml')
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Пакетна конвертація тестів у Moodle XML")
+    ap.add_argument('inputs', nargs='+', help="каталоги або glob-шаблони вхідних файлів")
+    ap.add_argument('-o', '--out-dir', default='moodle_xml_out', help="каталог для XML-файлів")
+    ap.add_argument('-j', '--jobs', type=int, default=None,
+                    help="кількість процесів (за замовчуванням — кількість доступних ядер)")
+    ap.add_argument('--summary', default=None,
+                    help="шлях до JSON-підсумку (за замовчуванням <out-dir>/summary.json)")
+    target = ap.add_mutually_exclusive_group()
+    target.add_argument('--merge', default=None, metavar='FILE',
+                    help="злити всі питання в один Moodle XML замість окремих файлів")
+    ap.add_argument('--dedupe', type=float, nargs='?', const=DEFAULT_THRESHOLD, default=None,
+                    metavar='THRESHOLD',
+                    help=f"з --merge: вилучити майже однакові питання (поріг схожості, "
+                         f"за замовчуванням {DEFAULT_THRESHOLD})")
+    target.add_argument('--zip', default=None, metavar='FILE',
+                    help="запакувати всі питання в zip з кількох Moodle XML, "
+                         "з окремою категорією на кожен вхідний файл")
+    ap.add_argument('--shard-size', type=parse_size, default=None, metavar='SIZE',
+                    help="з --zip: максимальний розмір одного XML (наприклад 800K, 5M)")
+    ap.add_argument('--shard-questions', type=int, default=None, metavar='N',
+                    help="з --zip: максимальна кількість питань в одному XML")
+    target.add_argument('--store', nargs='?', const='', default=None, metavar='DB',
+                    help="додати всі питання в банк питань SQLite (за замовчуванням "
+                         "QUESTION_STORE_PATH або ~/.cache/generation_moodle_xml/questions.db)")
+    args = ap.parse_args(argv)
+    if args.dedupe is not None and not args.merge:
+        ap.error("--dedupe можна використовувати лише з --merge")
+    if (args.shard_size is not None or args.shard_questions is not None) and not args.zip:
+        ap.error("--shard-size і --shard-questions можна використовувати лише з --zip")
+
+    # результати попередніх запусків (.xml) не є вхідними файлами
+    skip = [os.path.abspath(p) for p in (args.out_dir, args.merge, args.zip) if p]
+    files = [p for p in collect_inputs(args.inputs)
+             if not any(os.path.abspath(p) == s or os.path.abspath(p).startswith(s + os.sep) for s in skip)]
+    if not files:
+        print("Не знайдено жодного .xlsx/.docx/.txt/.xml файлу", file=sys.stderr)
+        return 2
+
+    if args.merge:
+        res = merge_files(files, args.merge, args.dedupe)
+        for err in res["errors"]:
+            print(f"✗ {err}", file=sys.stderr)
+        print(f"Готово: {res['questions'] - res['duplicates']} питань з {res['files']} файлів "
+              f"у {res['output']}, вилучено дублікатів: {res['duplicates']}, "
+              f"помилок: {len(res['errors'])}", file=sys.stderr)
+        return 1 if res["errors"] else 0
+
+    if args.store is not None:
+        res = store_files(files, args.store or None)
+        for err in res["errors"]:
+            print(f"✗ {err}", file=sys.stderr)
+        print(f"Готово: {res['questions']} питань з {res['files']} файлів, нових у банку "
+              f"{res['output']}: {res['added']}, помилок: {len(res['errors'])}", file=sys.stderr)
+        return 1 if res["errors"] else 0
+
+    if args.zip:
+        res = zip_files(files, args.zip, args.shard_size, args.shard_questions)
+        for err in res["errors"]:
+            print(f"✗ {err}", file=sys.stderr)
+        print(f"Готово: {res['questions']} питань з {res['files']} файлів у {res['output']} "
+              f"({len(res['shards'])} XML), помилок: {len(res['errors'])}", file=sys.stderr)
+        return 1 if res["errors"] else 0
+
+    # зберігаємо структуру підкаталогів відносно спільного кореня вхідних файлів
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in files])
+    jobs = max(1, min(args.jobs or available_cpus(), len(files)))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(convert_file, p, _output_path(os.path.abspath(p), root, args.out_dir)): p
+            for p in files
+        }
+        for fut in as_completed(futures):
+            try:
+                res = fut.result()
+            except Exception as e:
+                res = {"input": futures[fut], "output": None, "questions": 0,
+                       "errors": [f"Збій воркера: {e}"]}
+            results.append(res)
+            mark = "✗" if res["errors"] or not res["output"] else "✓"
+            print(f"{mark} {res['input']}: {res['questions']} питань, "
+                  f"{len(res['errors'])} помилок", file=sys.stderr)
+
+    results.sort(key=lambda r: r["input"])
+    failed = [r for r in results if r["errors"] or not r["output"]]
+    summary = {
+        "files": len(results),
+        "converted": sum(1 for r in results if r["output"]),
+        "questions": sum(r["questions"] for r in results),
+        "files_with_errors": len(failed),
+        "results": results,
+    }
+    summary_path = args.summary or os.path.join(args.out_dir, 'summary.json')
+    os.makedirs(os.path.dirname(summary_path) or '.', exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"Готово: {summary['converted']}/{summary['files']} файлів, "
+          f"{summary['questions']} питань, файлів з помилками: {len(failed)}. "
+          f"Підсумок: {summary_path}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Стиснення тексту перед запитом до GPT: нормалізація пробілів, вилучення
+слів-паразитів і повторів (заїкань на службових словах і цілих речень,
+що вже були). Розраховано насамперед на транскрипти Whisper: кілька
+проходів регулярних виразів і один прохід по реченнях, без токенізатора,
+тож багатогодинний транскрипт стискається за десятки мілісекунд.
+"""
+import re
+
+# Звуки вагання: вилучаються будь-де разом із комою чи трикрапкою після них
+HESITATIONS = (r"е+м*", r"м{2,}", r"е-е+", r"м-м+", r"а-а+", r"um+", r"uh+", r"erm", r"hmm+")
+
+# Вставні слова: вилучаються лише відокремлені комами (або на початку
+# речення перед комою), бо без ком вони часто мають зміст («це значить…»,
+# «ну добре»)
+PARENTHETICALS = (
+    "ну", "типу", "короче", "значить", "так би мовити", "як би", "скажімо так", "власне кажучи",
+    "як то кажуть", "you know", "i mean", "like", "so to speak",
+)
+
+# Заїкання: повтор підряд лише цих коротких службових слів («я я думаю»,
+# «the the»). Повтор звичайного слова часто навмисний — «дуже дуже»,
+# «that that», — тож він лишається.
+STUTTER_WORDS = (
+    "я", "ми", "ви", "він", "вона", "вони", "і", "й", "та", "а", "в", "у", "з", "на", "до",
+    "the", "a", "an", "and", "i", "we", "of",
+)
+
+# Усі вирази захоплюють першу літеру після вилученого (група letter): якщо
+# вилучене починало речення з великої, велика переходить на неї
+_HESITATION_RE = re.compile(
+    r"(?<![\w-])(?:(?:%s)(?![\w-])(?:\s*(?:,|…|\.{2,}))?\s*)+(?P<letter>[^\W\d_]?)"
+    % "|".join(HESITATIONS), re.I)
+_PARENTHETICAL_RE = re.compile(
+    r"(?P<lead>,\s*|(?:^|(?<=[.!?…]))\s*)(?:(?:%s)\s*,\s*)+(?P<letter>[^\W\d_]?)"
+    % "|".join(map(re.escape, PARENTHETICALS)),
+    re.I | re.M)
+_STUTTER_RE = re.compile(
+    r"(?<![\w'-])(%s)(?:[\s,]+\1)+(?![\w'-])" % "|".join(STUTTER_WORDS), re.I)
+# Залишки після вилучення: «, ,», « ,», «, .», кома на початку речення
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"[^\S\n]+([,.!?…;:])")
+_DOUBLE_COMMA_RE = re.compile(r",(?:\s*,)+")
+_COMMA_BEFORE_END_RE = re.compile(r",+\s*([.!?…;:])")
+_LEADING_COMMA_RE = re.compile(r"(^|[.!?…]\s+),\s*", re.M)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+")
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def normalize_whitespace(text: str) -> str:
+    """Пробіли й табуляції → один пробіл, рядки без крайніх пробілів, не більше одного порожнього рядка."""
+    text = re.sub(r"[^\S\n]+", " ", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = re.sub(r" ?\n ?", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _sentence_start(text: str, pos: int) -> bool:
+    """Чи pos — початок речення (тексту, рядка чи після .!?…)."""
+    pos -= 1
+    while pos >= 0 and text[pos] in " \t":
+        pos -= 1
+    return pos < 0 or text[pos] in ".!?…\n"
+
+
+def _keep_case(m, removed_at: int) -> str:
+    """Літера після вилученого фрагмента — велика, якщо ним починалось речення з великої."""
+    letter = m.group("letter")
+    if letter and m.string[removed_at].isupper() and _sentence_start(m.string, removed_at):
+        return letter.upper()
+    return letter
+
+
+def _drop_parenthetical(m) -> str:
+    # між комами вставне слово забирає обидві коми, на початку речення — лише свою
+    lead = m.group("lead")
+    if lead.startswith(","):
+        return " " + m.group("letter")
+    return lead + _keep_case(m, m.end("lead"))
+
+
+def drop_fillers(text: str) -> str:
+    """
+    Вилучає звуки вагання, вставні слова-паразити і заїкання на службових
+    словах. Речення, що починалось зі слова-паразита, починається з великої.
+    """
+    text = _HESITATION_RE.sub(lambda m: _keep_case(m, m.start()), text)
+    text = _PARENTHETICAL_RE.sub(_drop_parenthetical, text)
+    text = _STUTTER_RE.sub(r"\1", text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", text)
+    text = _DOUBLE_COMMA_RE.sub(",", text)
+    text = _COMMA_BEFORE_END_RE.sub(r"\1", text)
+    return _LEADING_COMMA_RE.sub(r"\1", text)
+
+
+def collapse_repeated_sentences(text: str) -> str:
+    """
+    Лишає лише перше входження кожного речення (без урахування регістру й
+    розділових знаків) у всьому тексті; речення без жодного слова вилучаються.
+    Абзаци (порожні рядки) зберігаються.
+    """
+    seen = set()
+    paragraphs = []
+    for para in text.split("\n\n"):
+        kept = []
+        for sent in _SENTENCE_RE.split(para):
+            key = _NON_WORD_RE.sub(" ", sent.lower()).strip()
+            if key and key not in seen:
+                seen.add(key)
+                kept.append(sent)
+        if kept:
+            paragraphs.append(" ".join(kept))
+    return "\n\n".join(paragraphs)
+
+
+def compact_text(text: str, fillers: bool = True) -> str:
+    """Усі кроки стиснення: пробіли, (за потреби) слова-паразити, повтори речень."""
+    text = normalize_whitespace(text)
+    if fillers:
+        text = drop_fillers(text)
+    return collapse_repeated_sentences(text)
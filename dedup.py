@@ -0,0 +1,168 @@
+"""
+Пошук майже однакових питань у великих об'єднаних банках (MinHash + LSH).
+
+Кожне питання нормалізується (текст без HTML, регістру й пунктуації плюс
+відсортовані відповіді) і розбивається на біграми слів. MinHash-сигнатури
+рахуються векторно для всіх питань одразу, а кандидати в дублікати
+шукаються через LSH за смугами сигнатури, тож час росте майже лінійно
+з розміром банку, без попарних порівнянь.
+"""
+import html
+import re
+from collections import defaultdict
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 32                 # 32 смуги по 4 рядки: поріг LSH ≈ (1/32)^(1/4) ≈ 0.42
+DEFAULT_THRESHOLD = 0.8    # мінімальна оцінка схожості Жаккара для дубліката
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def _normalize(text: str) -> str:
+    if "&" in text:
+        text = html.unescape(text)
+    if "<" in text:
+        text = _TAG_RE.sub(" ", text)
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def normalize_question(q) -> str:
+    """Текст питання і відсортовані відповіді (порядок варіантів не важливий)."""
+    answers = sorted(a.strip().lower() for a, _ in q["answers"])
+    return _normalize(" | ".join([q["text"] or "", *answers]))
+
+
+def _shingles(questions):
+    """
+    Біграми слів усіх питань одним масивом (uint64, змішані до 32 біт) і
+    початок кожного питання в ньому. Слова кодуються номерами зі спільного
+    словника; питання з одного слова дає один унікальний шингл-слово,
+    порожнє — унікальний шингл, щоб такі питання не злипались.
+    """
+    vocab = defaultdict()
+    vocab.default_factory = vocab.__len__
+    word_id = vocab.__getitem__
+    flat, lengths = [], []
+    for q in questions:
+        words = normalize_question(q).split()
+        flat.extend(map(word_id, words))
+        lengths.append(len(words))
+
+    n = len(lengths)
+    ids = np.fromiter(flat, dtype=np.uint64, count=len(flat))
+    lengths = np.asarray(lengths, dtype=np.intp)
+    doc = np.repeat(np.arange(n), lengths)
+    same_doc = doc[:-1] == doc[1:]
+    values = ((ids[:-1] << np.uint64(32)) | ids[1:])[same_doc]
+    docs = doc[:-1][same_doc]
+
+    short = np.flatnonzero(lengths < 2)
+    if len(short):
+        starts = np.cumsum(lengths) - lengths
+        single = np.where(lengths[short] == 1, ids[np.minimum(starts[short], max(len(ids) - 1, 0))]
+                          if len(ids) else 0, (np.uint64(1) << np.uint64(63)) | short.astype(np.uint64))
+        values = np.concatenate([values, single.astype(np.uint64)])
+        docs = np.concatenate([docs, short])
+        order = np.argsort(docs, kind="stable")
+        values, docs = values[order], docs[order]
+
+    with np.errstate(over="ignore"):
+        values = (values * _MIX) >> np.uint64(32)  # перемішуємо в 32-бітні значення
+    return values, np.searchsorted(docs, np.arange(n))
+
+
+def minhash_signatures(questions, num_perm: int = NUM_PERM, seed: int = 1) -> np.ndarray:
+    """Матриця MinHash-сигнатур (питання × num_perm), uint32."""
+    sh, starts = _shingles(questions)
+    rng = np.random.default_rng(seed)
+    # хешування multiply-shift: (a·x + b) mod 2^64, старші 32 біти; a непарне
+    a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    sig = np.empty((len(starts), num_perm), dtype=np.uint32)
+    buf = np.empty_like(sh)
+    shift = np.uint64(32)
+    with np.errstate(over="ignore"):
+        for p in range(num_perm):
+            np.multiply(sh, a[p], out=buf)
+            np.add(buf, b[p], out=buf)
+            np.right_shift(buf, shift, out=buf)
+            sig[:, p] = np.minimum.reduceat(buf, starts)
+    return sig
+
+
+def _candidate_pairs(sig: np.ndarray, bands: int):
+    """
+    Пари (якір, питання) з однаковою смугою сигнатури. Кожне питання
+    порівнюється лише з першим питанням свого кошика — лінійно від розміру.
+    """
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    pairs = []
+    for band in range(bands):
+        block = sig[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        key = np.zeros(n, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for col in range(rows):
+                key = (key ^ block[:, col]) * _MIX
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        is_start = np.empty(n, dtype=bool)
+        is_start[0] = True
+        np.not_equal(sorted_key[1:], sorted_key[:-1], out=is_start[1:])
+        group_first = order[np.flatnonzero(is_start)][np.cumsum(is_start) - 1]
+        members = ~is_start
+        pairs.append(np.stack([group_first[members], order[members]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.intp)
+    pairs = np.concatenate(pairs)
+    return np.unique(pairs, axis=0) if len(pairs) else pairs
+
+
+def find_duplicate_clusters(questions, threshold: float = DEFAULT_THRESHOLD,
+                            num_perm: int = NUM_PERM, bands: int = BANDS):
+    """
+    Кластери майже однакових питань: списки індексів (за зростанням), лише
+    з двох і більше питань. Схожість оцінюється за часткою збігів MinHash.
+    """
+    if len(questions) < 2:
+        return []
+    sig = minhash_signatures(questions, num_perm)
+    pairs = _candidate_pairs(sig, bands)
+    if len(pairs):
+        similarity = (sig[pairs[:, 0]] == sig[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= threshold]
+
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(x, x) != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for i, j in pairs.tolist():
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # коренем лишається менший індекс — перше входження питання
+            parent[max(ri, rj)] = min(ri, rj)
+
+    clusters = {}
+    for x in parent:
+        clusters.setdefault(find(x), set()).add(x)
+    return sorted((sorted(members | {root}) for root, members in clusters.items()), key=lambda c: c[0])
+
+
+def dedupe_bank(questions, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Лишає по одному питанню (перше входження) з кожного кластера майже
+    однакових. Повертає (питання, кластери).
+    """
+    clusters = find_duplicate_clusters(questions, threshold)
+    dropped = {i for cluster in clusters for i in cluster[1:]}
+    return [q for i, q in enumerate(questions) if i not in dropped], clusters
@@ -0,0 +1,257 @@
+"""
+Фонові завдання для довгих генерацій (YouTube, GPT).
+
+Завдання виконуються пулом потоків з обмеженням кількості одночасних
+робіт на процес (JOBS_MAX_WORKERS); черга обслуговує власників (сесії) по колу, тож один
+користувач із десятком відео не блокує інших. Стан і результат кожного
+завдання лежать на диску (JOBS_DIR/<id>/), тому переживають rerun і
+оновлення сторінки.
+
+Кожне завдання пам'ятає процес, що його виконує (хост, pid і випадковий
+токен запуску): незавершені завдання позначаються перерваними лише тоді,
+коли цього процесу вже немає, тож кілька процесів можуть ділити JOBS_DIR.
+"""
+import contextvars
+import json
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from llm_cache import DEFAULT_CACHE_DIR
+
+JOBS_DIR = os.getenv("JOBS_DIR", os.path.join(DEFAULT_CACHE_DIR, "jobs"))
+JOB_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", 2))
+# Скільки зберігати завершені завдання, секунди
+JOB_TTL = float(os.getenv("JOBS_TTL", 7 * 24 * 3600))
+# Як часто окремий потік прибирає старі завдання і перервані іншими процесами
+HOUSEKEEPING_INTERVAL = float(os.getenv("JOBS_HOUSEKEEPING_INTERVAL", 3600))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Токен запуску процесу: pid після перезапуску контейнера часто той самий
+_PROCESS_TOKEN = uuid.uuid4().hex
+_HOST = socket.gethostname()
+
+
+def _process_info() -> dict:
+    return {"host": _HOST, "pid": os.getpid(), "process": _PROCESS_TOKEN}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # процес є, але чужий
+    except (OverflowError, ValueError):
+        return False
+    return True
+
+
+def _owner_alive(meta: dict) -> bool:
+    """Чи живий процес, якому належить завдання (на іншому хості — вважаємо живим)."""
+    if meta.get("process") == _PROCESS_TOKEN:
+        return True
+    if meta.get("host") != _HOST:
+        return bool(meta.get("host"))  # завдання без запису процесу — зі старої версії
+    pid = meta.get("pid")
+    # той самий pid з іншим токеном — попередній запуск цього ж процесу
+    return isinstance(pid, int) and pid != os.getpid() and _pid_alive(pid)
+
+
+class JobQueue:
+    """
+    Черга завдань з пулом воркерів:
+        job_id = queue.submit("youtube", fn, url, owner=session_id)
+        queue.status(job_id)  # {"status": "running", "progress": 0.3, ...}
+        queue.result(job_id)  # повернене fn значення (JSON)
+    fn викликається як fn(report, *args, **kwargs), де report(частка, текст,
+    partial=None) оновлює прогрес завдання і (необов'язково) проміжний результат.
+    """
+
+    def __init__(self, directory: str = JOBS_DIR, workers: int = JOB_WORKERS, ttl: float = JOB_TTL,
+                 housekeeping_interval: float = HOUSEKEEPING_INTERVAL):
+        self.directory = directory
+        self.workers = max(1, workers)
+        self.ttl = ttl
+        self.housekeeping_interval = housekeeping_interval
+        os.makedirs(directory, exist_ok=True)
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # власник → deque завдань
+        self._running = 0
+        self._threads = []
+        self._recover()
+        self.cleanup()
+        # прибирання — в окремому потоці, щоб не займати воркера завдань
+        self._stop = threading.Event()
+        threading.Thread(target=self._housekeeper, name="job-housekeeper", daemon=True).start()
+
+    # ---------- стан на диску ----------
+
+    def _path(self, job_id: str, name: str) -> str:
+        return os.path.join(self.directory, job_id, name)
+
+    def _write_json(self, job_id: str, name: str, data):
+        path = self._path(job_id, name)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _read_json(self, job_id: str, name: str):
+        if not _JOB_ID_RE.match(job_id or ""):
+            return None
+        try:
+            with open(self._path(job_id, name), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _update(self, job_id: str, **fields):
+        meta = self._read_json(job_id, "job.json") or {}
+        meta.update(fields)
+        self._write_json(job_id, "job.json", meta)
+
+    def _recover(self):
+        """Незавершені завдання процесів, яких уже немає, позначаємо як перервані."""
+        for job_id in os.listdir(self.directory):
+            meta = self._read_json(job_id, "job.json")
+            if meta and meta["status"] in (QUEUED, RUNNING) and not _owner_alive(meta):
+                self._update(job_id, status=FAILED, finished=time.time(),
+                             error="Завдання перервано перезапуском сервера")
+
+    def cleanup(self):
+        """Видаляє завершені завдання, старші за ttl."""
+        deadline = time.time() - self.ttl
+        for job_id in os.listdir(self.directory):
+            meta = self._read_json(job_id, "job.json")
+            if meta is None:
+                continue
+            if meta["status"] in (DONE, FAILED) and (meta.get("finished") or 0) < deadline:
+                shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+
+    # ---------- публічний API ----------
+
+    def submit(self, kind: str, fn, *args, owner: str = "", **kwargs) -> str:
+        """Ставить завдання в чергу і повертає його ID."""
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.directory, job_id))
+        self._write_json(job_id, "job.json", {
+            "id": job_id,
+            "kind": kind,
+            "owner": owner,
+            "status": QUEUED,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "progress": 0.0,
+            "message": "",
+            "error": None,
+            **_process_info(),
+        })
+        # контекст (зокрема режим для metrics) переноситься у воркер
+        ctx = contextvars.copy_context()
+        with self._cond:
+            self._pending.setdefault(owner, deque()).append((job_id, ctx, fn, args, kwargs))
+            self._ensure_workers()
+            self._cond.notify()
+        return job_id
+
+    def status(self, job_id: str):
+        """Метадані завдання або None, якщо такого немає."""
+        return self._read_json(job_id, "job.json")
+
+    def result(self, job_id: str):
+        """Результат виконаного завдання або None."""
+        return self._read_json(job_id, "result.json")
+
+    def partial(self, job_id: str):
+        """Проміжний результат, опублікований завданням через report(..., partial=…)."""
+        return self._read_json(job_id, "partial.json")
+
+    def load(self):
+        """(кількість завдань, що виконуються, кількість у черзі)."""
+        with self._cond:
+            return self._running, sum(len(q) for q in self._pending.values())
+
+    # ---------- воркери ----------
+
+    def _ensure_workers(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._worker, name=f"job-worker-{len(self._threads)}",
+                                 daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _next(self):
+        """Наступне завдання по колу між власниками."""
+        owner, queue = next(iter(self._pending.items()))
+        item = queue.popleft()
+        del self._pending[owner]
+        if queue:
+            self._pending[owner] = queue  # власник переходить у кінець черги
+        return item
+
+    def _housekeeper(self):
+        """Раз на housekeeping_interval позначає перервані й видаляє старі завдання."""
+        while not self._stop.wait(self.housekeeping_interval):
+            try:
+                self._recover()
+                self.cleanup()
+            except OSError:
+                pass  # каталог тимчасово недоступний — наступного разу
+
+    def close(self):
+        """Зупиняє прибирання (воркери-демони завершаться разом із процесом)."""
+        self._stop.set()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                item = self._next()
+                self._running += 1
+            try:
+                self._run(*item)
+            finally:
+                with self._cond:
+                    self._running -= 1
+
+    def _run(self, job_id, ctx, fn, args, kwargs):
+        self._update(job_id, status=RUNNING, started=time.time())
+
+        def report(fraction: float, message: str = "", partial=None):
+            if partial is not None:
+                self._write_json(job_id, "partial.json", partial)
+            self._update(job_id, progress=float(fraction), message=message)
+
+        try:
+            result = ctx.run(fn, report, *args, **kwargs)
+            self._write_json(job_id, "result.json", result)
+        except Exception as e:
+            self._update(job_id, status=FAILED, finished=time.time(), error=str(e))
+        else:
+            self._update(job_id, status=DONE, finished=time.time(), progress=1.0)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Спільна на процес черга (Streamlit перезапускає скрипт, але не модулі)."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
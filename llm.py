@@ -0,0 +1,592 @@
+"""Виклики GPT для генерації питань (спільні для режимів GPT і YouTube)."""
+import asyncio
+import math
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from compaction import compact_text
+from dedup import dedupe_bank
+from llm_cache import DEFAULT_CACHE_DIR, LLMCache
+from metrics import span
+from moodle_xml import generate_moodle_xml_string, question_fragment, quiz_from_fragments
+from openai_client import acreate_chat, create_chat, stream_chat
+from parsers import iter_text_format, parse_text_format
+
+try:
+    import tiktoken
+except ImportError:  # необов'язкова залежність — точніший підрахунок токенів
+    tiktoken = None
+
+GPT_MODEL = "gpt-4"
+
+# Бажана частка типів питань у тесті (і в промпті, і при відборі з частин)
+DEFAULT_MIX = {"single": 0.5, "truefalse": 0.25, "multiple": 0.25}
+
+_MIX_LABELS = {"single": "Single-choice", "truefalse": "True/False", "multiple": "Multiple-choice"}
+
+
+def _plural(n: int, one: str, few: str, many: str) -> str:
+    """Форма слова для числа n: 1 питання, 2 питання, 5 питань."""
+    if n % 10 == 1 and n % 100 != 11:
+        return one
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return few
+    return many
+
+
+def _quotas(count: int, mix) -> dict:
+    """Кількість питань кожного типу з mix, що разом дає рівно count."""
+    total = sum(mix.values())
+    exact = {t: count * share / total for t, share in mix.items()}
+    quotas = {t: int(v) for t, v in exact.items()}
+    # залишок після округлення вниз — типам з найбільшою дробовою частиною
+    for t in sorted(exact, key=lambda t: exact[t] - quotas[t], reverse=True)[:count - sum(quotas.values())]:
+        quotas[t] += 1
+    return quotas
+
+
+def build_system_prompt(count: int = 10, mix=None) -> str:
+    """
+    Промпт звичайної генерації рівно count питань у Moodle XML; для кожного
+    типу з mix — діапазон кількості навколо його частки. Якщо частка менша
+    за два питання, замість діапазону «0–1» тип отримує точну квоту (або
+    не згадується), тож кількості в промпті завжди можуть дати count.
+    """
+    mix = mix or DEFAULT_MIX
+    total = sum(mix.values())
+    quotas = _quotas(count, mix)
+    ranges = []
+    for t, share in mix.items():
+        hi = math.ceil(count * share / total)
+        if hi >= 2:
+            amount = f"{hi - 1}–{hi} {_plural(hi, 'питання', 'питання', 'питань')}"
+        elif quotas[t]:
+            amount = f"{quotas[t]} {_plural(quotas[t], 'питання', 'питання', 'питань')}"
+        else:
+            continue
+        ranges.append(f"   – {amount} {_MIX_LABELS.get(t, t)}")
+    return (
+        f"Ви — асистент із жорстким обмеженням на {count} {_plural(count, 'питання', 'питання', 'питань')}"
+        " у форматі Moodle XML українською мовою.\n"
+        "1) Використайте тільки наданий текст.\n"
+        f"2) Створіть **саме {count}** "
+        f"{_plural(count, 'логічне питання', 'логічні питання', 'логічних питань')} українською:\n"
+        + ",\n".join(ranges) + ".\n"
+        "3) Кожне питання (окрім True/False) має мати 4 варіанти (A, B, C, D).\n"
+        f"4) Перед поверненням перевірте, що загальна кількість питань = {count}.\n"
+        "5) Поверніть **тільки** XML-код (без коментарів) і одразу припиніть"
+        f" після {count}-го питання.\n"
+        "<END>\n"
+    )
+
+
+SYSTEM_PROMPT = build_system_prompt()
+
+# Промпт для одного фрагмента довгого тексту: відповідь у форматі «готового
+# тесту», щоб кандидатів можна було розібрати parse_text_format і відібрати
+CHUNK_PROMPT = (
+    """Ви — асистент, що складає тестові питання українською мовою.
+1) Використайте тільки наданий фрагмент тексту.
+2) Створіть {count} логічних питань українською різних типів: Single-choice, Multiple-choice, True/False.
+3) Кожне питання (окрім True/False) має мати 4 варіанти (A, B, C, D).
+4) Поверніть **тільки** питання (без коментарів) у форматі:
+
+1. Текст питання
+A. Варіант
+B. Варіант
+C. Варіант
+D. Варіант
+Правильна відповідь: B
+
+Для Multiple-choice перелічіть усі правильні літери через кому: Правильна відповідь: A, C
+Для True/False:
+
+2. Твердження
+Варіанти: True / False
+Правильна відповідь: True
+"""
+)
+
+CHUNK_TOKENS = int(os.getenv("GPT_CHUNK_TOKENS", 3000))
+MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", 4))
+
+# Вікно контексту моделей (вхід + відповідь), токенів
+MODEL_CONTEXT_TOKENS = {"gpt-4": 8192, "gpt-4-32k": 32768, "gpt-3.5-turbo": 4096, "gpt-3.5-turbo-16k": 16384}
+# Скільки токенів займає одне питання у відповіді (Moodle XML українською)
+QUESTION_TOKENS = int(os.getenv("GPT_QUESTION_TOKENS", 250))
+# Бюджет токенів тексту користувача; 0 — усе, що лишається у вікні контексту
+# після промпту й відповіді
+INPUT_TOKEN_BUDGET = int(os.getenv("GPT_INPUT_TOKEN_BUDGET", 0))
+# Модель затримки для оцінки до відправлення: накладні витрати запиту,
+# швидкість читання входу і швидкість генерації відповіді
+LATENCY_BASE_SECONDS = float(os.getenv("GPT_LATENCY_BASE_SECONDS", 1.0))
+PREFILL_TOKENS_PER_SECOND = float(os.getenv("GPT_PREFILL_TOKENS_PER_SECOND", 2000))
+OUTPUT_TOKENS_PER_SECOND = float(os.getenv("GPT_OUTPUT_TOKENS_PER_SECOND", 20))
+
+# Кеш на диску спільний для всіх сесій і переживає перезапуск застосунку
+LLM_CACHE = LLMCache(
+    os.getenv("LLM_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "llm_cache.sqlite3")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600)),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", 200 * 1024 * 1024)),
+)
+
+
+def _messages(system_prompt: str, user_text: str):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_text}
+    ]
+
+
+def chat_completion(user_text: str, system_prompt: str = SYSTEM_PROMPT, model: str = GPT_MODEL,
+                    temperature: float = 0, cache: LLMCache = LLM_CACHE, create=None) -> str:
+    """
+    Повертає текст відповіді моделі. При temperature=0 запит детермінований,
+    тому відповідь береться з кешу, якщо такий самий запит уже виконувався.
+    Виклик іде через openai_client (ліміти, повтори, об'єднання запитів);
+    create — функція з сигнатурою openai.ChatCompletion.create (для заглушок).
+    """
+    use_cache = cache is not None and temperature == 0
+    with span("chat_completion", input_size=len(user_text), model=model) as s:
+        if use_cache:
+            key = cache.make_key(model, system_prompt, user_text, temperature=temperature)
+            cached = cache.get(key)
+            s["cache_hit"] = cached is not None
+            if cached is not None:
+                return cached
+
+        resp = create_chat(create, model=model, messages=_messages(system_prompt, user_text),
+                           temperature=temperature)
+        content = resp.choices[0].message.content
+        s["output_size"] = len(content)
+        if use_cache:
+            cache.set(key, content, model=model)
+        return content
+
+async def achat_completion(user_text: str, system_prompt: str = SYSTEM_PROMPT, model: str = GPT_MODEL,
+                          temperature: float = 0, cache: LLMCache = LLM_CACHE, acreate=None) -> str:
+    """Асинхронний варіант chat_completion (openai.ChatCompletion.acreate)."""
+    use_cache = cache is not None and temperature == 0
+    with span("chat_completion", input_size=len(user_text), model=model) as s:
+        if use_cache:
+            key = cache.make_key(model, system_prompt, user_text, temperature=temperature)
+            cached = cache.get(key)
+            s["cache_hit"] = cached is not None
+            if cached is not None:
+                return cached
+
+        resp = await acreate_chat(acreate, model=model, messages=_messages(system_prompt, user_text),
+                                  temperature=temperature)
+        content = resp.choices[0].message.content
+        s["output_size"] = len(content)
+        if use_cache:
+            cache.set(key, content, model=model)
+        return content
+
+# ================== Довгі тексти: map-reduce ==================
+
+def count_tokens(text: str, model: str = GPT_MODEL) -> int:
+    """Кількість токенів (tiktoken, якщо встановлено, інакше оцінка за символами)."""
+    if tiktoken is not None:
+        try:
+            return len(tiktoken.encoding_for_model(model).encode(text))
+        except Exception:
+            pass
+    # кирилиця в токенізаторі GPT-4 дає приблизно токен на 2–3 символи
+    return len(text) // 3 + 1
+
+
+def split_text(text: str, max_tokens: int = CHUNK_TOKENS, model: str = GPT_MODEL):
+    """
+    Ділить текст на фрагменти не довші за max_tokens: спершу за абзацами,
+    задовгі абзаци — за реченнями, а задовгі речення — просто за словами.
+    """
+    pieces = []
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        if count_tokens(para, model) <= max_tokens:
+            pieces.append(para)
+            continue
+        for sent in re.split(r"(?<=[.!?…])\s+", para):
+            if count_tokens(sent, model) <= max_tokens:
+                pieces.append(sent)
+                continue
+            buf, buf_tokens = [], 0
+            for w in sent.split():
+                w_tokens = count_tokens(w, model) + 1
+                if buf and buf_tokens + w_tokens > max_tokens:
+                    pieces.append(" ".join(buf))
+                    buf, buf_tokens = [], 0
+                buf.append(w)
+                buf_tokens += w_tokens
+            if buf:
+                pieces.append(" ".join(buf))
+
+    chunks, curr, curr_tokens = [], [], 0
+    for piece in pieces:
+        tokens = count_tokens(piece, model)
+        if curr and curr_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(curr))
+            curr, curr_tokens = [], 0
+        curr.append(piece)
+        curr_tokens += tokens
+    if curr:
+        chunks.append("\n\n".join(curr))
+    return chunks
+
+
+def select_questions(candidates, count: int = 10, mix=None):
+    """
+    Відбирає count питань з кандидатів згідно з часткою типів mix; якщо
+    питань потрібного типу забракло, добирає будь-якими іншими.
+    Порядок кандидатів зберігається.
+    """
+    quotas = _quotas(count, mix or DEFAULT_MIX)
+
+    picked = set()
+    for i, q in enumerate(candidates):
+        t = q.type
+        if quotas.get(t, 0) > 0:
+            quotas[t] -= 1
+            picked.add(i)
+    for i in range(len(candidates)):
+        if len(picked) >= count:
+            break
+        picked.add(i)
+    return [q for i, q in enumerate(candidates) if i in picked][:count]
+
+
+async def _generate_chunks(chunks, per_chunk: int, concurrency: int, model: str, cache, acreate):
+    sem = asyncio.Semaphore(concurrency)
+    prompt = CHUNK_PROMPT.format(count=per_chunk)
+
+    async def one(chunk):
+        async with sem:
+            return await achat_completion(chunk, system_prompt=prompt, model=model,
+                                          cache=cache, acreate=acreate)
+
+    return await asyncio.gather(*(one(c) for c in chunks))
+
+
+def generate_questions_chunked(text: str, count: int = 10, mix=None, max_tokens: int = CHUNK_TOKENS,
+                               concurrency: int = MAX_CONCURRENCY, model: str = GPT_MODEL,
+                               cache: LLMCache = LLM_CACHE, acreate=None):
+    """
+    Генерація питань з довгого тексту за схемою map-reduce: текст ділиться
+    на фрагменти, запити до моделі йдуть паралельно (не більше concurrency
+    одночасно), кандидати зливаються, майже однакові прибираються
+    (dedup.dedupe_bank, як і при злитті банків), і відбирається count
+    питань з потрібною часткою типів. Повертає (питання, помилки).
+    """
+    chunks = split_text(text, max_tokens, model)
+    if not chunks:
+        return [], []
+    # просимо із запасом, щоб після дедуплікації вистачило на потрібний мікс
+    per_chunk = max(3, -(-2 * count // len(chunks)))
+    replies = asyncio.run(_generate_chunks(chunks, per_chunk, concurrency, model, cache, acreate))
+
+    per_chunk_qs, errors = [], []
+    for n, reply in enumerate(replies, 1):
+        qs, errs = parse_text_format(_strip_fences(reply))
+        per_chunk_qs.append(qs)
+        errors.extend((idx, f"Частина {n}: {msg}") for idx, msg in errs)
+
+    # чергуємо кандидатів між фрагментами, щоб тест покривав увесь матеріал
+    interleaved = [q for group in _round_robin(per_chunk_qs) for q in group]
+    kept, _ = dedupe_bank(interleaved)
+    return select_questions(kept, count, mix), errors
+
+
+def _round_robin(groups):
+    depth = max((len(g) for g in groups), default=0)
+    for i in range(depth):
+        yield [g[i] for g in groups if i < len(g)]
+
+
+def _strip_fences(text: str) -> str:
+    """Видаляє можливі markdown-обгортки ``` … ```."""
+    text = re.sub(r"^```\w*\s*", "", text.strip())
+    return re.sub(r"\s*```$", "", text)
+
+# ================== Потокова генерація ==================
+
+_XML_QUESTION_START_RE = re.compile(r"<question[\s>]")
+_XML_QUESTION_END = "</question>"
+
+
+def _valid_xml_question(fragment: str) -> bool:
+    """Фрагмент — коректний XML питання з текстом і варіантами відповіді."""
+    try:
+        el = ET.fromstring(fragment)
+    except ET.ParseError:
+        return False
+    return (el.get("type") is not None and el.find("questiontext") is not None
+            and (el.find("answer") is not None or el.find("subquestion") is not None))
+
+
+def _iter_xml_questions(chunks):
+    """Пари (фрагмент, помилка) для кожного <question>, щойно він закрився."""
+    buf, idx = "", 0
+    for chunk in chunks:
+        buf += chunk
+        while True:
+            m = _XML_QUESTION_START_RE.search(buf)
+            if m is None:
+                buf = buf[-len("<question"):]  # можливо, початок тегу ще не дійшов
+                break
+            end = buf.find(_XML_QUESTION_END, m.start())
+            if end < 0:
+                buf = buf[m.start():]
+                break
+            end += len(_XML_QUESTION_END)
+            fragment, buf = buf[m.start():end], buf[end:]
+            idx += 1
+            if _valid_xml_question(fragment):
+                yield fragment, None
+            else:
+                yield None, (idx, "Некоректний XML питання")
+
+
+def _iter_stream_lines(chunks):
+    """Рядки тексту з потоку фрагментів (без markdown-обгорток ```)."""
+    buf = ""
+    for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            if not line.lstrip().startswith("```"):
+                yield line + "\n"
+    if buf and not buf.lstrip().startswith("```"):
+        yield buf
+
+
+def _iter_text_questions(chunks):
+    """Пари (фрагмент, помилка) для відповіді у форматі «готового тесту»."""
+    for q, err in iter_text_format(_iter_stream_lines(chunks)):
+        if err is not None:
+            yield None, err
+            continue
+        fragment = question_fragment(q)
+        if fragment:
+            yield fragment, None
+
+
+def _iter_stream_questions(chunks):
+    """
+    Визначає формат відповіді за першими символами (XML чи «готовий тест»)
+    і віддає питання з потоку в міру їх завершення.
+    """
+    chunks = iter(chunks)
+    head = ""
+    for piece in chunks:
+        head += piece
+        body = head.lstrip()
+        if body.startswith("```"):
+            if "\n" not in body:
+                continue
+            body = body.split("\n", 1)[1].lstrip()
+        if body:
+            break
+    else:
+        body = head.strip()
+    rest = _prepend(head, chunks)
+    if body.startswith("<"):
+        yield from _iter_xml_questions(rest)
+    else:
+        yield from _iter_text_questions(rest)
+
+
+def _prepend(first: str, chunks):
+    yield first
+    yield from chunks
+
+
+def stream_questions(user_text: str, count: int = 10, system_prompt: str = None,
+                     model: str = GPT_MODEL, cache: LLMCache = LLM_CACHE, create=None):
+    """
+    Генерує питання з потокової відповіді моделі: пари (фрагмент XML
+    питання, помилка) віддаються, щойно питання закрилось. Потік
+    обривається, щойно набрано count коректних питань, — токени після
+    останнього потрібного питання не генеруються. Без system_prompt
+    модель просять рівно count питань (build_system_prompt).
+    """
+    system_prompt = system_prompt or build_system_prompt(count)
+    key = cache.make_key(model, system_prompt, user_text, temperature=0, stream_count=count) \
+        if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    consumed = []
+
+    def source():
+        if cached is not None:
+            yield cached
+            return
+        for piece in stream_chat(create, model=model, messages=_messages(system_prompt, user_text),
+                                 temperature=0):
+            consumed.append(piece)
+            yield piece
+
+    valid = 0
+    chunks = source()
+    with span("chat_stream", input_size=len(user_text), model=model, cache_hit=cached is not None) as s:
+        t0 = time.perf_counter()
+        try:
+            for fragment, err in _iter_stream_questions(chunks):
+                if fragment is not None:
+                    valid += 1
+                    if valid == 1:
+                        s["first_question_seconds"] = round(time.perf_counter() - t0, 3)
+                yield fragment, err
+                if valid >= count:
+                    break
+        finally:
+            chunks.close()
+            s.update(questions=valid, output_size=sum(map(len, consumed)))
+    if cached is None and cache is not None and valid >= count:
+        cache.set(key, "".join(consumed), model=model)
+
+# ================== Підготовка запиту ==================
+
+def input_budget(count: int = 10, model: str = GPT_MODEL, system_prompt: str = None) -> int:
+    """Бюджет токенів тексту: INPUT_TOKEN_BUDGET або вікно контексту мінус промпт і відповідь."""
+    if INPUT_TOKEN_BUDGET:
+        return INPUT_TOKEN_BUDGET
+    system_prompt = system_prompt or build_system_prompt(count)
+    context = MODEL_CONTEXT_TOKENS.get(model, 8192)
+    return max(0, context - count_tokens(system_prompt, model) - count * QUESTION_TOKENS)
+
+
+def estimate_latency(input_tokens: int, output_tokens: int, calls: int = 1,
+                     concurrency: int = 1) -> float:
+    """
+    Оцінка часу генерації, секунди: calls однакових запитів по input_tokens
+    і output_tokens, що йдуть хвилями по concurrency одночасно.
+    """
+    waves = -(-calls // max(1, concurrency))
+    per_call = (LATENCY_BASE_SECONDS + input_tokens / PREFILL_TOKENS_PER_SECOND
+                + output_tokens / OUTPUT_TOKENS_PER_SECOND)
+    return round(waves * per_call, 1)
+
+
+def trim_to_tokens(text: str, max_tokens: int, model: str = GPT_MODEL) -> str:
+    """Початок тексту не довший за max_tokens, обрізаний по межі речення (або слова)."""
+    tokens = count_tokens(text, model)
+    if tokens <= max_tokens:
+        return text
+    cut = text[:len(text) * max_tokens // tokens]
+    while cut and count_tokens(cut, model) > max_tokens:
+        cut = cut[:len(cut) * 9 // 10]
+    end = max(cut.rfind(p) for p in ".!?…")
+    if end > len(cut) // 2:
+        return cut[:end + 1]
+    return cut.rsplit(None, 1)[0] if " " in cut else cut
+
+
+def preflight(text: str, count: int = 10, chunked=False, compact: bool = True,
+              model: str = GPT_MODEL, system_prompt: str = None):
+    """
+    Підготовка тексту до відправлення: рахує токени, стискає текст
+    (compaction.compact_text) і, якщо він і далі не влазить у бюджет
+    (input_budget), або ділить його на частини (chunked=True; None —
+    автоматично, лише коли не влазить), або обрізає. Повертає (текст,
+    звіт): {"input_tokens", "compacted_tokens", "sent_tokens", "budget",
+    "chunked", "truncated", "calls", "estimated_seconds"}.
+    """
+    with span("preflight", input_size=len(text), model=model) as s:
+        input_tokens = count_tokens(text, model)
+        if compact:
+            text = compact_text(text)
+        compacted_tokens = count_tokens(text, model)
+        budget = input_budget(count, model, system_prompt)
+        if chunked is None:
+            chunked = compacted_tokens > budget
+        truncated = not chunked and compacted_tokens > budget
+        if truncated:
+            text = trim_to_tokens(text, budget, model)
+        sent_tokens = count_tokens(text, model) if truncated else compacted_tokens
+        if chunked:
+            calls = max(1, -(-sent_tokens // CHUNK_TOKENS))
+            per_chunk = max(3, -(-2 * count // calls))
+            seconds = estimate_latency(min(sent_tokens, CHUNK_TOKENS), per_chunk * QUESTION_TOKENS,
+                                       calls, MAX_CONCURRENCY)
+        else:
+            calls = 1
+            seconds = estimate_latency(sent_tokens, count * QUESTION_TOKENS)
+        report = {
+            "input_tokens": input_tokens,
+            "compacted_tokens": compacted_tokens,
+            "sent_tokens": sent_tokens,
+            "budget": budget,
+            "chunked": chunked,
+            "truncated": truncated,
+            "calls": calls,
+            "estimated_seconds": seconds,
+        }
+        s.update(report)
+    return text, report
+
+
+def describe_preflight(report) -> str:
+    """Короткий опис звіту preflight для інтерфейсу."""
+    text = f"Токенів: {report['input_tokens']}"
+    if report["compacted_tokens"] != report["input_tokens"]:
+        saved = 1 - report["compacted_tokens"] / max(1, report["input_tokens"])
+        text += f" → {report['compacted_tokens']} після стиснення (−{saved:.0%})"
+    if report["truncated"]:
+        text += f", обрізано до {report['sent_tokens']} (бюджет {report['budget']})"
+    if report["chunked"]:
+        text += f", {report['calls']} частин"
+    return text + f"; очікуваний час ≈ {report['estimated_seconds']:.0f} с"
+
+# ================== Фонове завдання ==================
+
+def gpt_job(report, user_text: str, chunked=False, count: int = 10, compact: bool = True):
+    """
+    Завдання для черги jobs: повертає {"xml", "fragments", "questions", "requested",
+    "errors", "preflight"}; fragments — XML кожного питання окремо (для
+    попереднього перегляду), preflight — звіт preflight про токени тексту.
+    Звичайний режим отримує питання потоково і показує їх у міру надходження;
+    chunked=None — ділити текст на частини лише тоді, коли він не влазить у бюджет.
+    """
+    user_text, checked = preflight(user_text, count, chunked, compact)
+    report(0.02, describe_preflight(checked))
+    if not checked["chunked"]:
+        return collect_streamed(report, stream_questions(user_text, count), count, checked)
+    report(0.2, "1/2: Паралельна генерація питань по частинах тексту…")
+    qs, errs = generate_questions_chunked(user_text, count=count)
+    report(0.8, "2/2: Генерація XML…")
+    return {
+        "xml": generate_moodle_xml_string(qs) if qs else None,
+        "fragments": [question_fragment(q) for q in qs],
+        "questions": len(qs),
+        "requested": count,
+        "errors": errs,
+        "preflight": checked,
+    }
+
+
+def collect_streamed(report, pairs, count: int, checked=None):
+    """
+    Збирає питання з stream_questions, публікуючи проміжний результат у
+    завдання; checked — звіт preflight, що йде в проміжний і кінцевий результат.
+    """
+    fragments, errors = [], []
+    report(0.05, "Очікування першого питання…", partial={"fragments": fragments, "preflight": checked})
+    for fragment, err in pairs:
+        if err is not None:
+            errors.append(err)
+            continue
+        fragments.append(fragment)
+        report(0.05 + 0.95 * len(fragments) / count, f"Отримано {len(fragments)} з {count} питань",
+               partial={"fragments": fragments, "preflight": checked})
+    return {
+        "xml": quiz_from_fragments(fragments) if fragments else None,
+        "fragments": fragments,
+        "questions": len(fragments),
+        "requested": count,
+        "errors": errors,
+        "preflight": checked,
+    }
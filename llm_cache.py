@@ -0,0 +1,107 @@
+"""Постійний (на диску) кеш відповідей LLM на базі SQLite."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "generation_moodle_xml")
+
+
+class LLMCache:
+    """
+    Кеш відповідей моделі з ключем (модель, промпт, хеш вхідного тексту).
+    Записи старші за ttl секунд вважаються простроченими; якщо сумарний
+    розмір перевищує max_bytes, витісняються найдавніше використані.
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 24 * 3600, max_bytes: int = 200 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, value TEXT,"
+                " size INTEGER, created REAL, accessed REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+
+    @contextmanager
+    def _connect(self):
+        # окреме з'єднання на операцію — Streamlit викликає кеш з різних потоків
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_text: str, **params) -> str:
+        """Ключ запиту: хеш моделі, промпту, параметрів і хешу вхідного тексту."""
+        text_hash = hashlib.sha256(user_text.encode('utf-8')).hexdigest()
+        payload = json.dumps([model, system_prompt, text_hash, params],
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """Повертає збережену відповідь або None (і оновлює лічильники)."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: str, model: str = ""):
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, value, size, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """Видаляє прострочені записи, а потім найстаріші за доступом понад max_bytes."""
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
@@ -0,0 +1,324 @@
+"""
+Вимірювання тривалості етапів (завантаження аудіо, Whisper, GPT, парсери,
+генерація XML) з експортом у JSON-логи і текстовий формат Prometheus.
+
+Кожен етап обгортається в span(); режим (excel, gpt, youtube, …) береться
+з контекстної змінної, яку встановлює set_mode().
+
+Метрики віддаються ендпоінтом /metrics (start_metrics_server) або, якщо
+задано METRICS_PROM_DIR, файлами для textfile collector node_exporter:
+кожен процес пише власний файл раз на METRICS_PROM_INTERVAL секунд
+у фоновому потоці і ще раз при завершенні.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Межі кошиків гістограми тривалості, секунди
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Каталог textfile collector; без нього файли метрик не пишуться
+PROM_DIR = os.getenv("METRICS_PROM_DIR")
+PROM_INTERVAL = float(os.getenv("METRICS_PROM_INTERVAL", 15))
+PROM_PREFIX = "generation_moodle_xml_"
+# JSON-лог етапів: у файл (METRICS_LOG_PATH) або в stderr (METRICS_LOG=stderr).
+# Без них модуль нічого не друкує — логер лишається на конфігурацію logging
+# застосунку (app.py вмикає stderr сам, cli.py — ні).
+LOG_PATH = os.getenv("METRICS_LOG_PATH")
+LOG_TARGET = os.getenv("METRICS_LOG")
+
+_mode = ContextVar("metrics_mode", default="unknown")
+
+logger = logging.getLogger("generation_moodle_xml.metrics")
+logger.addHandler(logging.NullHandler())
+_log_handler = None
+_log_lock = threading.Lock()
+
+
+def enable_span_log(target: str = "stderr"):
+    """
+    Пише JSON-лог кожного етапу в stderr (target="stderr") або у файл
+    (target — шлях). Діє один раз на процес: повторні виклики нічого не змінюють.
+    """
+    global _log_handler
+    with _log_lock:
+        if _log_handler is not None:
+            return
+        _log_handler = (logging.StreamHandler() if target == "stderr"
+                        else logging.FileHandler(target, encoding="utf-8"))
+        _log_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_log_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+if LOG_PATH or LOG_TARGET:
+    enable_span_log(LOG_PATH or LOG_TARGET)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count", "errors", "input_size")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+        self.input_size = 0
+
+    def observe(self, seconds: float, input_size, failed: bool):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+        self.sum += seconds
+        self.count += 1
+        self.errors += failed
+        self.input_size += input_size or 0
+
+
+class Registry:
+    """Гістограми тривалості етапів з ключем (режим, етап)."""
+
+    def __init__(self):
+        self._hists = {}
+        self._lock = threading.Lock()
+        self.version = 0  # росте з кожним спостереженням — чи є що записувати
+
+    def observe(self, mode: str, stage: str, seconds: float, input_size=None, failed=False):
+        with self._lock:
+            self.version += 1
+            hist = self._hists.get((mode, stage))
+            if hist is None:
+                hist = self._hists[(mode, stage)] = _Histogram()
+            hist.observe(seconds, input_size, failed)
+
+    def render(self, labels: str = "") -> str:
+        """
+        Текстовий формат експозиції Prometheus; labels — додаткові мітки
+        кожного ряду (наприклад, 'pid="123",').
+        """
+        out = [
+            "# HELP moodle_xml_stage_duration_seconds Тривалість етапу обробки.",
+            "# TYPE moodle_xml_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._hists.items())
+            for (mode, stage), h in items:
+                series = f'{labels}mode="{_escape(mode)}",stage="{_escape(stage)}"'
+                for bound, c in zip(BUCKETS, h.counts):
+                    out.append(f'moodle_xml_stage_duration_seconds_bucket{{{series},le="{bound}"}} {c}')
+                out.append(f'moodle_xml_stage_duration_seconds_bucket{{{series},le="+Inf"}} {h.count}')
+                out.append(f"moodle_xml_stage_duration_seconds_sum{{{series}}} {h.sum:.6f}")
+                out.append(f"moodle_xml_stage_duration_seconds_count{{{series}}} {h.count}")
+            out.append("# HELP moodle_xml_stage_input_size_total Сумарний розмір входу етапу.")
+            out.append("# TYPE moodle_xml_stage_input_size_total counter")
+            for (mode, stage), h in items:
+                out.append(f'moodle_xml_stage_input_size_total{{{labels}mode="{_escape(mode)}",'
+                           f'stage="{_escape(stage)}"}} {h.input_size}')
+            out.append("# HELP moodle_xml_stage_errors_total Кількість етапів, що завершились винятком.")
+            out.append("# TYPE moodle_xml_stage_errors_total counter")
+            for (mode, stage), h in items:
+                out.append(f'moodle_xml_stage_errors_total{{{labels}mode="{_escape(mode)}",'
+                           f'stage="{_escape(stage)}"}} {h.errors}')
+        return "\n".join(out) + "\n"
+
+    def write(self, path: str, labels: str = ""):
+        """Атомарно записує метрики у файл (для node_exporter textfile collector)."""
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render(labels))
+        os.replace(tmp, path)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+
+def set_mode(mode: str):
+    """Режим, до якого відносяться наступні етапи в поточному контексті."""
+    _mode.set(mode)
+
+
+@contextmanager
+def span(stage: str, input_size=None, **attrs):
+    """
+    Вимірює тривалість блоку. Усередині можна доповнити атрибути:
+        with span("generate_xml", input_size=len(qs)) as s:
+            s["output_size"] = ...
+    """
+    record = dict(attrs)
+    mode = _mode.get()
+    failed = False
+    t0 = time.perf_counter()
+    try:
+        yield record
+    except GeneratorExit:
+        raise  # споживач потокового етапу зупинився сам — це не помилка
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        seconds = time.perf_counter() - t0
+        REGISTRY.observe(mode, stage, seconds, input_size, failed)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "ts": round(time.time(), 3),
+                "event": "stage",
+                "mode": mode,
+                "stage": stage,
+                "seconds": round(seconds, 6),
+                "input_size": input_size,
+                "ok": not failed,
+                **record,
+            }, ensure_ascii=False, default=str))
+        if PROM_DIR:
+            start_textfile_export(PROM_DIR)
+
+
+def source_size(source):
+    """Розмір вхідних даних у байтах для шляху, байтів чи файлоподібного об'єкта."""
+    if isinstance(source, str):
+        # парсери Excel/Word приймають шлях до файлу
+        return os.path.getsize(source) if os.path.isfile(source) else len(source)
+    if isinstance(source, bytes):
+        return len(source)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes
+    size = getattr(source, "size", None)
+    if isinstance(size, int):
+        return size
+    try:
+        if hasattr(source, "seek"):
+            # не через fileno(): SpooledTemporaryFile від нього скидається на диск
+            pos = source.tell()
+            size = source.seek(0, os.SEEK_END)
+            source.seek(pos)
+            return size
+        return os.fstat(source.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+# ================== Файли для textfile collector ==================
+
+_PROM_FILE_RE = re.compile(re.escape(PROM_PREFIX) + r"(\d+)\.prom$")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # процес є, але чужий
+    return True
+
+
+class TextfileExporter:
+    """
+    Пише REGISTRY у directory/generation_moodle_xml_<pid>.prom: раз на
+    interval секунд (лише якщо з'явились нові спостереження) і при виході
+    з процесу. Ряди мають мітку pid, тож файли різних процесів
+    (воркери Streamlit, cli --jobs) не конфліктують у node_exporter, а
+    файли завершених процесів прибираються при старті нового.
+    """
+
+    def __init__(self, directory: str, interval: float = PROM_INTERVAL):
+        self.pid = os.getpid()
+        self.path = os.path.join(directory, f"{PROM_PREFIX}{self.pid}.prom")
+        self.interval = interval
+        self._written = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        self._remove_stale(directory)
+        threading.Thread(target=self._run, name="metrics-textfile", daemon=True).start()
+        atexit.register(self.close)
+
+    @staticmethod
+    def _remove_stale(directory: str):
+        for path in glob.glob(os.path.join(directory, PROM_PREFIX + "*.prom")):
+            m = _PROM_FILE_RE.search(os.path.basename(path))
+            if m and not _pid_alive(int(m.group(1))):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def flush(self):
+        if os.getpid() != self.pid:
+            return  # копія після fork (зокрема її atexit) пише лише свій файл
+        with self._lock:
+            version = REGISTRY.version
+            if version == self._written:
+                return
+            try:
+                REGISTRY.write(self.path, f'pid="{self.pid}",')
+            except OSError:
+                return  # спробуємо наступного разу
+            self._written = version
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def start_textfile_export(directory: str = PROM_DIR, interval: float = PROM_INTERVAL):
+    """Запускає запис файлу метрик (один раз на процес, зокрема після fork)."""
+    global _exporter
+    exporter = _exporter
+    if exporter is not None and exporter.pid == os.getpid():
+        return exporter
+    with _exporter_lock:
+        if _exporter is None or _exporter.pid != os.getpid():
+            _exporter = TextfileExporter(directory, interval)
+        return _exporter
+
+# ================== HTTP-ендпоінт ==================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """Запускає /metrics у фоновому потоці (один раз на процес)."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
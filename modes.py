@@ -0,0 +1,181 @@
+"""
+Реєстр режимів введення (для інтерфейсу) і форматів файлів (для будь-якого
+коду, зокрема CLI). Обробники й парсери задаються рядками «модуль:функція»
+та імпортуються лише при першому використанні, тож запуск застосунку не
+тягне openai, numpy, openpyxl чи python-docx, доки відповідний режим не
+вибрано. Сам модуль не залежить від Streamlit.
+"""
+import importlib
+import os
+
+
+class Lazy:
+    """Функція, задана як «модуль:ім'я»; модуль імпортується при першому виклику."""
+
+    __slots__ = ("target", "_fn")
+
+    def __init__(self, target: str):
+        self.target = target
+        self._fn = None
+
+    def load(self):
+        if self._fn is None:
+            module, _, attr = self.target.partition(":")
+            self._fn = getattr(importlib.import_module(module), attr)
+        return self._fn
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"Lazy({self.target!r})"
+
+
+class InputFormat:
+    """Формат вхідного файлу: ключ кешу, парсер і потоковий парсер (пари питання/помилка)."""
+
+    __slots__ = ("ext", "kind", "parse", "iterate")
+
+    def __init__(self, ext: str, kind: str, parse: str, iterate: str):
+        self.ext = ext
+        self.kind = kind
+        self.parse = Lazy(parse)
+        self.iterate = Lazy(iterate)
+
+
+class InputMode:
+    """Режим інтерфейсу: назва в меню, slug для метрик, обробник і довідка."""
+
+    __slots__ = ("label", "slug", "handler", "help")
+
+    def __init__(self, label: str, slug: str, handler: str, help: str = ""):
+        self.label = label
+        self.slug = slug
+        self.handler = Lazy(handler)
+        self.help = help
+
+
+# ================== Формати файлів ==================
+
+# Парсери приймають шлях або файлоподібний об'єкт
+FORMATS = {f.ext: f for f in (
+    InputFormat(".xlsx", "excel", "parsers:parse_from_excel", "parsers:iter_from_excel"),
+    InputFormat(".docx", "word", "parsers:parse_from_word", "parsers:iter_from_word"),
+    InputFormat(".txt", "text", "parsers:parse_text_file", "parsers:iter_text_file"),
+    InputFormat(".xml", "moodle_xml", "parsers:parse_from_moodle_xml", "parsers:iter_from_moodle_xml"),
+)}
+
+
+def format_for(filename: str):
+    """InputFormat за розширенням імені файлу (None, якщо формат не підтримується)."""
+    return FORMATS.get(os.path.splitext(filename)[1].lower())
+
+# ================== Режими інтерфейсу ==================
+
+EXCEL_HELP = """
+**Excel-режим**
+- Підготуйте Excel-файл (.xlsx).
+- Колонка A: текст питання.
+- Колонка A: варіанти відповідей.
+- Позначте правильні відповіді жовтим фоном (FFFF00).
+- Питання зчитуються з усіх аркушів книги; блоки розділяйте порожнім рядком.
+"""
+
+GPT_HELP = """
+**GPT-режим**
+- Вставте текст українською мовою.
+- Система створить задану кількість питань (за замовчуванням 10; одним запитом — до 20, довгий текст частинами — до 200) приблизно в такій пропорції:
+  - половина Single-choice,
+  - чверть True/False,
+  - чверть Multiple-choice.
+- Для кожного, крім True/False, 4 варіанти A–D.
+- За потреби текст можна стиснути перед відправленням (пробіли, повтори речень, слова-паразити); під полем видно кількість токенів до і після стиснення та очікуваний час.
+"""
+
+MANUAL_HELP = """
+**Ручне створення**
+- Оберіть тип питання: Single-choice, Multiple-choice, True/False.
+- Введіть текст питання та варіанти.
+- Позначте правильні відповіді.
+"""
+
+READY_HELP = """
+**Готовий тест**
+- Формат:
+
+1. Питання...
+A. Відповідь A  
+B. Відповідь B  
+C. Відповідь C  
+D. Відповідь D  
+Правильний відповідь: B
+
+- Для True/False:
+
+7. Питання...  
+Варіанти: True / False  
+Правильний відповідь: True
+
+- Обов'язкові: нумерація, варіанти, рядок з `Правильний відповідь:`.
+"""
+
+WORD_HELP = """
+**Word-режим**
+    - **Правильний** варіант виділяйте **жирним** лише текст відповіді (не префікс).
+    - Якщо ваше питання займає кілька рядків, тримайте їх в одному параграфі до першої відповіді.
+    - **Не** використовуйте inline-список через `:` і `;` — кожен варіант має власний параграф.
+
+    Приклад:
+    1. Який термін подачі пропозиції по процедурі запит (ціни) пропозиції?
+    A. від 2 днів
+    B. від 3 днів
+    C. від 5 днів
+    2. Скільки днів після оголошення закупівлі тривають відкриті торги з особливостями:
+    A. 14 днів з дня оприлюднення в електронній системі закупівель
+    B. за рішенням замовника
+    C. не раніше ніж за сім днів
+    3. Після спливу якого терміну для підписання договору замовник має право відхилити пропозицію учасника
+    А. після спливу 5 днів (на 6 день)
+    A. після спливу 6 днів
+    С. . після спливу 3 днів (на 4 день)
+"""
+
+YOUTUBE_HELP = """
+**YouTube to XML**
+    Просто вставте посилання на відео та чекайте результату.
+    Транскрипт стискається перед відправленням до GPT, а задовгий — обробляється частинами.
+"""
+
+MERGE_HELP = """
+**Об'єднання з банком**
+- Завантажте наявний банк питань у Moodle XML і файли з новими питаннями (.xml, .xlsx, .docx, .txt).
+- Підтримуються питання multichoice, truefalse і matching; категорії пропускаються.
+- Великий банк можна розбити на кілька XML (zip) з обмеженням розміру чи кількості питань; питання кожного файлу потрапляють в окрему категорію.
+- Майже однакові питання (інший регістр, пунктуація, порядок відповідей, одне-два змінені слова) можна вилучити: з кожної групи лишається перше.
+"""
+
+STORE_HELP = """
+**Банк питань**
+- Питання з усіх режимів зберігаються кнопкою «💾 Зберегти в банк питань», з командного рядка — `python cli.py … --store`.
+- Банк зберігається між сесіями (SQLite, шлях задає змінна `QUESTION_STORE_PATH`); однакові питання не дублюються.
+- Пошук іде за словами в тексті питань і відповідей (усі слова мають бути присутні, `мереж*` — за початком слова); вибірку можна звузити за типом і джерелом та експортувати в Moodle XML.
+"""
+
+MODES = [
+    InputMode("1. Excel", "excel", "ui_modes:excel_mode", EXCEL_HELP),
+    InputMode("2. По тексту (GPT)", "gpt", "ui_modes:gpt_mode", GPT_HELP),
+    InputMode("3. Вручну", "manual", "ui_modes:manual_mode", MANUAL_HELP),
+    InputMode("4. Готовий тест", "ready", "ui_modes:ready_mode", READY_HELP),
+    InputMode("5. Word → XML", "word", "ui_modes:word_mode", WORD_HELP),
+    InputMode("6. YouTube → XML", "youtube", "ui_modes:youtube_mode", YOUTUBE_HELP),
+    InputMode("7. Об'єднання з банком", "merge", "ui_modes:merge_mode", MERGE_HELP),
+    InputMode("8. Банк питань", "store", "ui_modes:store_mode", STORE_HELP),
+]
+
+
+def get_mode(key: str) -> InputMode:
+    """Режим за назвою в меню або slug."""
+    for m in MODES:
+        if key in (m.label, m.slug):
+            return m
+    raise KeyError(key)
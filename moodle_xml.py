@@ -0,0 +1,247 @@
+"""Генерація Moodle XML зі списку питань (без залежності від Streamlit)."""
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from metrics import span
+from question import as_question, detect_question_type  # noqa: F401 (реекспорт)
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+
+# ================== Утиліти для XML ==================
+
+def wrap_cdata(text: str) -> str:
+    """Обгортає текст у CDATA з HTML-тегом <p>."""
+    return f"<![CDATA[<p>{text}</p>]]>"
+
+def question_xml_lines(q):
+    """
+    Повертає рядки XML для одного питання (Question або словник) з
+    відступами, без переносів. Для питань невідомого типу — порожній список.
+    """
+    q = as_question(q)
+    q_type = q.type
+    if q_type in ("single", "multiple"):
+        lines = ['  <question type="multichoice">']
+    elif q_type == "truefalse":
+        lines = ['  <question type="truefalse">']
+    elif q_type == "matching":
+        lines = ['  <question type="matching">']
+    else:
+        return []
+
+    text = q.text
+    preview = text[:30] + ('...' if len(text) > 30 else '')
+    lines.extend([
+        '    <name>',
+        f'      <text>{wrap_cdata(preview)}</text>',
+        '    </name>',
+        '    <questiontext format="html">',
+        f'      <text>{wrap_cdata(text)}</text>',
+        '    </questiontext>'
+    ])
+
+    if q_type in ("single", "multiple"):
+        lines.extend([
+            '    <shuffleanswers>true</shuffleanswers>',
+            f'    <single>{"true" if q_type=="single" else "false"}</single>',
+            '    <answernumbering>abc</answernumbering>',
+            f'    <penalty>{q.penalty:.6f}</penalty>',
+            '    <defaultgrade>1.000000</defaultgrade>'
+        ])
+        for (text, _), frac in zip(q.answers, q.fractions):
+            lines.extend([
+                f'    <answer fraction="{frac}" format="html">',
+                f'      <text><![CDATA[{text}]]></text>',
+                '    </answer>'
+            ])
+
+    elif q_type == "truefalse":
+        for val, frac in zip(("true", "false"), q.fractions):
+            lines.extend([
+                f'    <answer fraction="{frac}" format="html">',
+                f'      <text><![CDATA[{val}]]></text>',
+                '    </answer>'
+            ])
+
+    elif q_type == "matching":
+        lines.append('    <shuffleanswers>true</shuffleanswers>')
+        for pair, _ in q.answers:
+            left, right = map(str.strip, pair.split('-', 1))
+            lines.extend([
+                '    <subquestion format="html">',
+                f'      <text><![CDATA[{left}]]></text>',
+                f'      <answer><![CDATA[{right}]]></answer>',
+                '    </subquestion>'
+            ])
+
+    lines.append('  </question>')
+    return lines
+
+def question_fragment(q) -> str:
+    """XML одного питання без відступу першого рядка ("" для невідомого типу)."""
+    return "\n".join(question_xml_lines(q)).lstrip()
+
+def iter_moodle_xml_text(questions):
+    """
+    Генерує Moodle XML частинами (str): заголовок, по одному фрагменту
+    на питання, закриваючий тег. Склеєні частини дають рівно той самий
+    рядок, що й generate_moodle_xml_string.
+    """
+    yield XML_HEADER + '\n<quiz>'
+    for q in questions:
+        lines = question_xml_lines(q)
+        if lines:
+            yield '\n' + '\n'.join(lines)
+    yield '\n</quiz>'
+
+def iter_moodle_xml(questions, encoding: str = 'utf-8'):
+    """Те саме, що iter_moodle_xml_text, але віддає закодовані байти."""
+    for chunk in iter_moodle_xml_text(questions):
+        yield chunk.encode(encoding)
+
+def _count(questions):
+    return len(questions) if hasattr(questions, '__len__') else None
+
+def write_moodle_xml(questions, fp) -> int:
+    """
+    Записує Moodle XML у бінарний файлоподібний об'єкт питання за питанням,
+    не тримаючи весь документ у пам'яті. Повертає кількість записаних байтів.
+    """
+    written = 0
+    with span("generate_xml", input_size=_count(questions), streaming=True) as s:
+        for chunk in iter_moodle_xml(questions):
+            fp.write(chunk)
+            written += len(chunk)
+        s["output_size"] = written
+    return written
+
+def generate_moodle_xml_string(questions) -> str:
+    """Генерує Moodle XML зі списку питань."""
+    with span("generate_xml", input_size=_count(questions)) as s:
+        xml = "".join(iter_moodle_xml_text(questions))
+        s["output_size"] = len(xml)
+    return xml
+
+def quiz_from_fragments(fragments) -> str:
+    """
+    Moodle XML із готових фрагментів <question>…</question> (перший рядок
+    фрагмента — без відступу), наприклад отриманих потоково від GPT.
+    """
+    with span("generate_xml", input_size=_count(fragments)) as s:
+        xml = XML_HEADER + '\n<quiz>' + ''.join('\n  ' + f for f in fragments) + '\n</quiz>'
+        s["output_size"] = len(xml)
+    return xml
+
+class QuizBuilder:
+    """
+    Тест, що збирається поступово (ручний режим): XML-фрагмент кожного
+    питання генерується один раз — при додаванні чи редагуванні саме цього
+    питання, а весь документ — це склеювання готових фрагментів.
+    """
+
+    __slots__ = ("questions", "fragments")
+
+    def __init__(self, questions=()):
+        self.questions = []
+        self.fragments = []
+        for q in questions:
+            self.add(q)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def add(self, q):
+        q = as_question(q)
+        self.questions.append(q)
+        self.fragments.append(question_fragment(q))
+
+    def update(self, index: int, q):
+        q = as_question(q)
+        self.questions[index] = q
+        self.fragments[index] = question_fragment(q)
+
+    def remove(self, index: int):
+        del self.questions[index]
+        del self.fragments[index]
+
+    def xml(self) -> str:
+        """Moodle XML; питання невідомого типу (порожній фрагмент) пропускаються."""
+        return quiz_from_fragments([f for f in self.fragments if f])
+
+# ================== Категорії і розбиття на частини ==================
+
+def category_path(*parts) -> str:
+    """
+    Шлях категорії Moodle: $course$/частина/…; «/» усередині назви
+    подвоюється, як того вимагає формат імпорту.
+    """
+    return "/".join(["$course$", *(p.replace("/", "//") for p in parts if p)])
+
+def category_xml_lines(path: str):
+    """Рядки XML псевдо-питання category, що перемикає категорію для наступних питань."""
+    return [
+        '  <question type="category">',
+        '    <category>',
+        f'      <text>{escape(path)}</text>',
+        '    </category>',
+        '  </question>',
+    ]
+
+def write_sharded_zip(sections, fp, max_bytes: int = None, max_questions: int = None,
+                      name: str = "quiz"):
+    """
+    Записує питання в zip-архів із кількох Moodle XML (name_001.xml, …),
+    кожен не більший за max_bytes і max_questions (питання не розриваються,
+    тож надвелике питання займе окремий файл сам). sections — пари
+    (шлях категорії, ітерабельне питань); на початку кожного файлу і при
+    зміні розділу вставляється елемент категорії. Файли пишуться в архів
+    потоково, питання за питанням. Повертає список (ім'я файлу, питань, байтів).
+    """
+    header = (XML_HEADER + '\n<quiz>').encode('utf-8')
+    footer = '\n</quiz>'.encode('utf-8')
+    shards = []
+    entry = None
+    size = count = 0
+
+    def close():
+        entry.write(footer)
+        entry.close()
+        shards.append((entry_name, count, size + len(footer)))
+
+    with span("generate_xml", streaming=True, sharded=True) as s, \
+            zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for path, questions in sections:
+            category = ('\n' + '\n'.join(category_xml_lines(path))).encode('utf-8')
+            in_category = False
+            for q in questions:
+                lines = question_xml_lines(q)
+                if not lines:
+                    continue
+                fragment = ('\n' + '\n'.join(lines)).encode('utf-8')
+                need = len(fragment) + (0 if in_category else len(category))
+                if entry is not None and (
+                        (max_questions and count >= max_questions)
+                        or (max_bytes and size + need + len(footer) > max_bytes)):
+                    close()
+                    entry = None
+                if entry is None:
+                    entry_name = f"{name}_{len(shards) + 1:03d}.xml"
+                    info = zipfile.ZipInfo(entry_name, time.localtime()[:6])
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    entry = zf.open(info, 'w')
+                    entry.write(header)
+                    size, count, in_category = len(header), 0, False
+                if not in_category:
+                    entry.write(category)
+                    size += len(category)
+                    in_category = True
+                entry.write(fragment)
+                size += len(fragment)
+                count += 1
+        if entry is not None:
+            close()
+        s["questions"] = sum(c for _, c, _ in shards)
+        s["shards"] = len(shards)
+        s["output_size"] = sum(b for _, _, b in shards)
+    return shards
@@ -0,0 +1,289 @@
+"""
+Спільний на процес шар викликів OpenAI: ліміти запитів і токенів за
+хвилину (token bucket), повтори з експоненційною затримкою та джитером
+для 429/5xx і об'єднання однакових запитів, що виконуються одночасно
+(з різних сесій Streamlit чи фонових завдань).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import openai
+from openai import error as openai_error
+
+# Встановіть свій ключ OpenAI через змінну середовища (OPENAI_API_KEY)
+openai.api_key = os.getenv("OPENAI_API_KEY")
+
+# Ліміти облікового запису; значення за замовчуванням — з запасом для GPT-4
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", 200))
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", 40000))
+WHISPER_RPM = float(os.getenv("WHISPER_RPM", 50))
+
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 6))
+BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", 1.0))
+BACKOFF_CAP = float(os.getenv("OPENAI_BACKOFF_CAP", 60.0))
+# Оцінка довжини відповіді для резервування токенів, якщо max_tokens не задано
+COMPLETION_ALLOWANCE = 1000
+
+# Помилки, після яких запит має сенс повторити
+RETRYABLE = (
+    openai_error.RateLimitError,
+    openai_error.ServiceUnavailableError,
+    openai_error.APIConnectionError,
+    openai_error.Timeout,
+    openai_error.TryAgain,
+)
+
+
+def is_retryable(error) -> bool:
+    """429, 5xx, обрив з'єднання чи тайм-аут."""
+    if isinstance(error, RETRYABLE):
+        return True
+    return isinstance(error, openai_error.APIError) and (error.http_status or 500) >= 500
+
+
+class TokenBucket:
+    """
+    Відро на rate одиниць за хвилину з місткістю capacity (за замовчуванням
+    хвилинна норма). reserve() одразу списує одиниці, дозволяючи борг, і
+    повертає, скільки секунд почекати — так його можна використати і в
+    потоках, і в asyncio.
+    """
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, delta: float):
+        """Коригує баланс, коли фактична кількість відома (delta > 0 — повернути)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class RateLimiter:
+    """Пара відер: запити за хвилину і (необов'язково) токени за хвилину."""
+
+    def __init__(self, rpm: float, tpm: float = None):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def _reserve(self, tokens: int) -> float:
+        delay = self.requests.reserve(1)
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def acquire(self, tokens: int = 0):
+        delay = self._reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: int = 0):
+        delay = self._reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def settle(self, estimated: int, actual: int):
+        """Повертає у відро різницю між зарезервованими і використаними токенами."""
+        if self.tokens is not None and actual is not None:
+            self.tokens.adjust(estimated - actual)
+
+
+CHAT_LIMITER = RateLimiter(OPENAI_RPM, OPENAI_TPM)
+WHISPER_LIMITER = RateLimiter(WHISPER_RPM)
+
+# ================== Повтори ==================
+
+def backoff_delay(attempt: int, error=None) -> float:
+    """
+    Затримка перед повтором attempt (з 0): «повний джитер» у межах
+    експоненційного вікна, але не менше за Retry-After від сервера.
+    """
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    headers = getattr(error, "headers", None) or {}
+    try:
+        delay = max(delay, float(headers.get("retry-after") or headers.get("Retry-After") or 0))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
+
+def _usage_tokens(resp):
+    try:
+        return resp["usage"]["total_tokens"]
+    except (KeyError, TypeError):
+        return None
+
+
+def _prompt_tokens(params) -> int:
+    # ≈3 символи на токен для українського тексту
+    return sum(len(m.get("content") or "") for m in params.get("messages", ())) // 3
+
+
+def estimate_tokens(params) -> int:
+    """Груба оцінка токенів запиту плюс запас на відповідь."""
+    return _prompt_tokens(params) + (params.get("max_tokens") or COMPLETION_ALLOWANCE)
+
+# ================== Об'єднання однакових запитів ==================
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _request_key(params) -> str:
+    payload = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _join(key: str):
+    """(future, лідер?) — лідер виконує запит, решта чекає на його результат."""
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        if fut is not None:
+            return fut, False
+        fut = _inflight[key] = Future()
+        return fut, True
+
+
+def _finish(key: str, fut: Future, result=None, error=None):
+    with _inflight_lock:
+        _inflight.pop(key, None)
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
+def _coalescable(params) -> bool:
+    # відповіді з temperature > 0 мають право відрізнятись, їх не об'єднуємо
+    return not params.get("stream") and (params.get("temperature") or 0) == 0
+
+# ================== Виклики ==================
+
+def _call_with_retries(call, params, limiter: RateLimiter, tokens: int, retries: int):
+    for attempt in range(retries + 1):
+        limiter.acquire(tokens)
+        try:
+            resp = call(**params)
+        except openai_error.OpenAIError as e:
+            limiter.settle(tokens, 0)
+            if attempt == retries or not is_retryable(e):
+                raise
+            time.sleep(backoff_delay(attempt, e))
+        else:
+            limiter.settle(tokens, _usage_tokens(resp))
+            return resp
+
+
+async def _acall_with_retries(acall, params, limiter: RateLimiter, tokens: int, retries: int):
+    for attempt in range(retries + 1):
+        await limiter.aacquire(tokens)
+        try:
+            resp = await acall(**params)
+        except openai_error.OpenAIError as e:
+            limiter.settle(tokens, 0)
+            if attempt == retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, e))
+        else:
+            limiter.settle(tokens, _usage_tokens(resp))
+            return resp
+
+
+def create_chat(create=None, limiter: RateLimiter = CHAT_LIMITER, retries: int = MAX_RETRIES, **params):
+    """
+    openai.ChatCompletion.create з лімітами, повторами й об'єднанням
+    однакових одночасних запитів. create — замінник для заглушок.
+    """
+    create = create or openai.ChatCompletion.create
+    tokens = estimate_tokens(params)
+    if not _coalescable(params):
+        return _call_with_retries(create, params, limiter, tokens, retries)
+
+    key = _request_key(params)
+    fut, leader = _join(key)
+    if not leader:
+        return fut.result()
+    try:
+        resp = _call_with_retries(create, params, limiter, tokens, retries)
+    except BaseException as e:
+        _finish(key, fut, error=e)
+        raise
+    _finish(key, fut, result=resp)
+    return resp
+
+
+async def acreate_chat(acreate=None, limiter: RateLimiter = CHAT_LIMITER, retries: int = MAX_RETRIES,
+                       **params):
+    """Асинхронний варіант create_chat (openai.ChatCompletion.acreate)."""
+    acreate = acreate or openai.ChatCompletion.acreate
+    tokens = estimate_tokens(params)
+    if not _coalescable(params):
+        return await _acall_with_retries(acreate, params, limiter, tokens, retries)
+
+    key = _request_key(params)
+    fut, leader = _join(key)
+    if not leader:
+        # Future потокобезпечний, тож чекати можна з будь-якого циклу подій
+        return await asyncio.wrap_future(fut)
+    try:
+        resp = await _acall_with_retries(acreate, params, limiter, tokens, retries)
+    except BaseException as e:
+        _finish(key, fut, error=e)
+        raise
+    _finish(key, fut, result=resp)
+    return resp
+
+
+def stream_chat(create=None, limiter: RateLimiter = CHAT_LIMITER, retries: int = MAX_RETRIES, **params):
+    """
+    Потокова відповідь чату: генератор фрагментів тексту в міру надходження.
+    Повтори можливі лише до першого фрагмента (помилка на старті запиту).
+    Закриття генератора (break у споживача) обриває з'єднання — решта
+    відповіді не генерується і не оплачується.
+    """
+    create = create or openai.ChatCompletion.create
+    tokens = estimate_tokens(params)
+    chunks = _call_with_retries(create, dict(params, stream=True), limiter, tokens, retries)
+    received = 0
+    try:
+        for chunk in chunks:
+            delta = chunk["choices"][0].get("delta") or {}
+            text = delta.get("content")
+            if text:
+                received += len(text)
+                yield text
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+        limiter.settle(tokens, _prompt_tokens(params) + received // 3)
+
+
+def transcribe_file(model: str, path: str, limiter: RateLimiter = WHISPER_LIMITER,
+                    retries: int = MAX_RETRIES) -> str:
+    """Whisper для файлу з лімітом і повторами (файл відкривається на кожну спробу)."""
+    def call(**_):
+        with open(path, 'rb') as audio_file:
+            return openai.Audio.transcribe(model, audio_file)
+
+    return _call_with_retries(call, {}, limiter, 0, retries)["text"].strip()
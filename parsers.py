@@ -0,0 +1,464 @@
+"""
+Парсери вхідних форматів (Excel, Word, готовий текст) без залежності від Streamlit.
+openpyxl, python-docx і lxml імпортуються лише при розборі відповідного формату.
+"""
+import io
+import re
+
+from metrics import source_size, span
+from question import Question
+
+# ================== Парсери ==================
+
+# Українські літери варіантів → латинські
+LETTER_MAP = {'а':'A','А':'A','б':'B','Б':'B','в':'C','В':'C','г':'D','Г':'D'}
+
+_BLOCK_START_RE = re.compile(r"\d+\.")
+_QUESTION_RE = re.compile(r"^\d+\.\s*(.+)")
+_ANSWER_RE = re.compile(r"^([A-Г])[\)\.]*\s*(.+)")
+_CORRECT_LINE_RE = re.compile(r"(?i)^(?:правильн\w*\s+(?:ответ|відповід))[:]?", re.IGNORECASE)
+_CORRECT_LETTER_RE = re.compile(r"[A-ГA-D]")
+_TRUE_RE = re.compile(r"(?i)true")
+
+
+def _finish_text_block(idx, q_text, ans_lines, corr_line):
+    """Розбирає відповіді блоку після рядка з правильними відповідями."""
+    correct_set = {LETTER_MAP.get(l, l.upper()) for l in _CORRECT_LETTER_RE.findall(corr_line)}
+
+    answers = []
+    if len(ans_lines) == 1 and _TRUE_RE.search(ans_lines[0]):
+        is_true = _TRUE_RE.search(corr_line) is not None
+        answers = [("true", is_true), ("false", not is_true)]
+    else:
+        for ln in ans_lines:
+            m_a = _ANSWER_RE.match(ln)
+            if not m_a:
+                yield None, (idx, f"Невірний формат відповіді: '{ln}'")
+                break
+            letter = LETTER_MAP.get(m_a.group(1), m_a.group(1).upper())
+            answers.append((m_a.group(2).strip(), letter in correct_set))
+        if len(answers) < 2:
+            yield None, (idx, "Менше двох варіантів відповіді")
+            return
+
+    yield Question(q_text, answers), None
+
+
+def iter_text_format(source):
+    """
+    Потоковий парсер готового тесту: читає рядок або текстовий файлоподібний
+    об'єкт рядок за рядком і віддає пари (питання, помилка), де рівно одне
+    значення не None. Помилка — (номер_блоку, повідомлення).
+
+    Новий блок починається з рядка «N.»; питання віддається одразу після
+    рядка «Правильна відповідь: …», решта рядків блоку ігнорується.
+    """
+    if isinstance(source, str):
+        yield from _iter_text_lines(io.StringIO(source))
+    elif (isinstance(source, (io.RawIOBase, io.BufferedIOBase)) or hasattr(source, 'getbuffer')
+          or 'b' in getattr(source, 'mode', '')):
+        # бінарний потік (наприклад, завантажений файл) читаємо як UTF-8
+        wrapper = io.TextIOWrapper(source, encoding='utf-8')
+        try:
+            yield from _iter_text_lines(wrapper)
+        finally:
+            # від'єднуємо обгортку, щоб вона не закрила чужий потік
+            wrapper.detach()
+    else:
+        yield from _iter_text_lines(source)
+
+
+def _iter_text_lines(lines):
+    idx = 0
+    q_text = None      # None — блок ще не почався (або текст до першого блоку порожній)
+    ans_lines = []
+    done = False       # рядок з правильними відповідями вже оброблено
+
+    for raw in lines:
+        if _BLOCK_START_RE.match(raw) or (q_text is None and raw.strip()):
+            # закриваємо попередній блок
+            if q_text is not None and not done:
+                yield None, (idx, "Не знайдено рядок із правильними відповідями")
+            idx += 1
+            q_text, ans_lines, done = None, [], False
+        if done:
+            continue
+        for ln in raw.splitlines():
+            ln = ln.strip()
+            if not ln:
+                continue
+            if q_text is None:
+                m_q = _QUESTION_RE.match(ln)
+                q_text = m_q.group(1).strip() if m_q else ln
+                if _CORRECT_LINE_RE.match(ln):
+                    done = True
+                    yield from _finish_text_block(idx, q_text, [], ln)
+                    break
+            elif _CORRECT_LINE_RE.match(ln):
+                done = True
+                yield from _finish_text_block(idx, q_text, ans_lines, ln)
+                break
+            else:
+                ans_lines.append(ln)
+
+    if q_text is not None and not done:
+        yield None, (idx, "Не знайдено рядок із правильними відповідями")
+
+
+def parse_text_format(text):
+    """Парсер готового тесту з тексту (рядка або текстового файлу)."""
+    size = len(text) if isinstance(text, str) else source_size(text)
+    with span("parse_text", input_size=size) as s:
+        questions, errors = _collect(iter_text_format(text))
+        s.update(questions=len(questions), errors=len(errors))
+    return questions, errors
+
+
+def iter_text_file(source):
+    """iter_text_format для файлу готового тесту: шлях (UTF-8) або файлоподібний об'єкт."""
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            yield from iter_text_format(f)
+    else:
+        yield from iter_text_format(source)
+
+
+def parse_text_file(source):
+    """parse_text_format для файлу: шлях (UTF-8) або файлоподібний об'єкт."""
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            return parse_text_format(f)
+    return parse_text_format(source)
+
+
+def _collect(pairs):
+    """Розкладає пари (питання, помилка) у два списки."""
+    questions, errors = [], []
+    for q, err in pairs:
+        if err is not None:
+            errors.append(err)
+        else:
+            questions.append(q)
+    return questions, errors
+
+
+def _is_correct_cell(cell) -> bool:
+    """Чи залита клітинка жовтим кольором (FFFF00) — ознака правильної відповіді."""
+    # Перевіряємо, чи в клітинки є заливка типу 'solid'
+    fill = getattr(cell, 'fill', None)
+    if fill and getattr(fill, 'fill_type', None) == 'solid':
+        # Отримуємо об'єкт Color (start_color)
+        start_color = getattr(fill, 'start_color', None)
+        # Спробуємо дістати значення rgb, якщо воно є
+        raw_rgb = getattr(start_color, 'rgb', None)
+
+        # Перетворюємо вхідне значення у рядок (щоб уникнути помилок),
+        # або встановлюємо пустий рядок, якщо raw_rgb ≠ str
+        rgb = raw_rgb if isinstance(raw_rgb, str) else ""
+        # Перевіряємо, чи кінець rgb збігається з 'FFFF00' (жовтий)
+        return rgb.upper().endswith('FFFF00')
+    return False
+
+def iter_excel_blocks(uploaded_file):
+    """
+    Потоково читає колонку A всіх аркушів книги (режим read_only) і віддає
+    пари (назва_аркуша, блок), де блок — список (текст, is_corr) до першого
+    порожнього рядка. Блок не переходить межу аркуша.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            curr = []
+            for row in ws.iter_rows(min_col=1, max_col=1):
+                cell = row[0] if row else None
+                value = getattr(cell, 'value', None)
+                # Отримуємо текст у клітинці (якщо є), приводимо до рядка
+                txt = str(value).strip() if value is not None else ""
+                if not txt:
+                    if curr:
+                        # зустріли порожню клітинку — віддаємо попередній блок
+                        yield ws.title, curr
+                        curr = []
+                    continue
+                curr.append((txt, _is_correct_cell(cell)))
+            if curr:
+                # останній блок аркуша, якщо він не пустий
+                yield ws.title, curr
+    finally:
+        # у режимі read_only книга тримає відкритий zip — закриваємо явно
+        wb.close()
+
+def iter_from_excel(uploaded_file):
+    """
+    Потоковий парсер тестів з Excel: віддає пари (питання, помилка), де
+    рівно одне значення не None. Помилка — (номер_блоку, повідомлення);
+    блоки нумеруються наскрізно по всіх аркушах.
+    """
+    for idx, (_, blk) in enumerate(iter_excel_blocks(uploaded_file), 1):
+        # Переконуємося, що в блоці є хоча б 1 питання + ≥2 відповіді
+        if len(blk) < 3:
+            yield None, (idx, "Потрібно принаймні 1 питання та 2 відповіді")
+            continue
+        # Перший елемент блоку — текст питання, решта — відповіді
+        yield Question(blk[0][0], blk[1:]), None
+
+def parse_from_excel(uploaded_file):
+    """
+    Парсер тестів з Excel.
+    Витягує з першої колонки (A) кожного аркуша питання та відповіді, де
+    правильні відповіді відмічені заливкою жовтим кольором (код FFFF00).
+    Повертає список питань і список помилок.
+    """
+    with span("parse_excel", input_size=source_size(uploaded_file)) as s:
+        questions, errors = _collect(iter_from_excel(uploaded_file))
+        s.update(questions=len(questions), errors=len(errors))
+    return questions, errors
+
+# ================== Word (.docx) ==================
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_TBL, _W_SDT = _W + "body", _W + "p", _W + "tbl", _W + "sdt"
+_W_R, _W_HYPERLINK, _W_RPR, _W_B = _W + "r", _W + "hyperlink", _W + "rPr", _W + "b"
+_W_VAL, _W_TYPE = _W + "val", _W + "type"
+_OFFICE_DOCUMENT_REL = "/officeDocument"
+
+# Текстові еквіваленти вмісту <w:r>, як у python-docx (Run.text)
+_RUN_TEXT = {
+    _W + "t": lambda el: el.text or "",
+    _W + "tab": lambda el: "\t",
+    _W + "ptab": lambda el: "\t",
+    _W + "cr": lambda el: "\n",
+    _W + "noBreakHyphen": lambda el: "-",
+    _W + "br": lambda el: "\n" if el.get(_W_TYPE, "textWrapping") == "textWrapping" else "",
+}
+
+_WORD_ANSWER_RE = re.compile(r'^[A-ЯA-Z]\.\s*', re.U)
+
+# Розділювач текстів жирних ранів: у XML документа нульовий символ неможливий,
+# тож «seg in bold_text» рівносильне пошуку seg у кожному рані окремо
+_RUN_SEP = "\x00"
+
+
+def _run_text(r) -> str:
+    return "".join(_RUN_TEXT[c.tag](c) for c in r if c.tag in _RUN_TEXT)
+
+
+def _run_is_bold(r) -> bool:
+    """<w:b/> або <w:b w:val="1|true|on"/> у власних властивостях рану."""
+    rpr = r.find(_W_RPR)
+    b = rpr.find(_W_B) if rpr is not None else None
+    if b is None:
+        return False
+    return b.get(_W_VAL, "true") in ("1", "true", "on")
+
+
+def _docx_main_part(zf) -> str:
+    """Шлях до основної частини документа (зазвичай word/document.xml)."""
+    from lxml import etree
+
+    rels = etree.fromstring(zf.read("_rels/.rels"))
+    for rel in rels:
+        if rel.get("Type", "").endswith(_OFFICE_DOCUMENT_REL):
+            return rel.get("Target").lstrip("/")
+    return "word/document.xml"
+
+
+def iter_docx_paragraphs(uploaded_file):
+    """
+    Потоково читає абзаци верхнього рівня з document.xml (без побудови DOM
+    python-docx) і віддає трійки (текст, жирний_текст, є_жирний_ран).
+    Семантика збігається з python-docx: Document.paragraphs (без таблиць),
+    Paragraph.text (разом із гіперпосиланнями) і Run.bold лише для <w:r>.
+    """
+    import zipfile
+    from lxml import etree
+
+    with zipfile.ZipFile(uploaded_file) as zf, zf.open(_docx_main_part(zf)) as xml:
+        for _, el in etree.iterparse(xml, events=("end",), tag=(_W_P, _W_TBL, _W_SDT)):
+            parent = el.getparent()
+            if parent is None or parent.tag != _W_BODY:
+                continue
+            if el.tag == _W_P:
+                texts, bold_texts, has_bold = [], [], False
+                for child in el:
+                    if child.tag == _W_R:
+                        text = _run_text(child)
+                        texts.append(text)
+                        if _run_is_bold(child):
+                            has_bold = True
+                            bold_texts.append(text)
+                    elif child.tag == _W_HYPERLINK:
+                        texts.extend(_run_text(r) for r in child.findall(_W_R))
+                yield "".join(texts), _RUN_SEP.join(bold_texts), has_bold
+            # звільняємо пам'ять: оброблений елемент і всі попередні в <w:body>
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+
+
+def _iter_python_docx_paragraphs(uploaded_file):
+    """Ті самі трійки, але через DOM python-docx (попередній рушій)."""
+    from docx import Document
+
+    doc = Document(uploaded_file)
+    for para in doc.paragraphs:
+        runs = para.runs
+        bold_runs = [run for run in runs if run.bold]
+        yield para.text, _RUN_SEP.join(run.text for run in bold_runs), bool(bold_runs)
+
+
+def _iter_word_questions(paragraphs):
+    """Розбір абзаців Word у пари (питання, помилка); помилка — рядок."""
+    # питання збирається в q_text/answers і стає Question, коли завершене
+    q_text, answers = None, []
+
+    for text, bold_text, has_bold in paragraphs:
+        for line in text.splitlines():
+            txt = line.strip()
+            if not txt:
+                continue
+
+            # Inline формат: "Питання: A; B; C;"
+            if ':' in txt and txt.count(';') >= 2 and not _WORD_ANSWER_RE.match(txt):
+                if q_text is not None:
+                    yield Question(q_text, answers), None
+                part_q, part_ans = txt.split(':', 1)
+                q_text, answers = part_q.strip(), []
+                segments = [seg.strip().rstrip(';') for seg in part_ans.split(';') if seg.strip()]
+                for seg in segments:
+                    # правильний — якщо сегмент міститься в якомусь жирному рані
+                    answers.append((seg, seg in bold_text))
+
+            # Окремі абзаци-відповіді "A. Відповідь"
+            elif _WORD_ANSWER_RE.match(txt):
+                if q_text is None:
+                    yield None, f"Відповідь без питання: «{txt}»"
+                    continue
+                ans_txt = _WORD_ANSWER_RE.sub('', txt)
+                answers.append((ans_txt, has_bold))
+
+            else:
+                if q_text is None:
+                    q_text = txt
+                elif answers:
+                    yield Question(q_text, answers), None
+                    q_text, answers = txt, []
+                else:
+                    q_text += " " + txt
+
+    if q_text is not None:
+        yield Question(q_text, answers), None
+
+
+# Рушії читання .docx: потоковий (за замовчуванням) і через python-docx
+WORD_ENGINES = {
+    "stream": iter_docx_paragraphs,
+    "python-docx": _iter_python_docx_paragraphs,
+}
+
+
+def iter_from_word(uploaded_file, engine: str = "stream"):
+    """Потоковий парсер тестів з Word: пари (питання, помилка)."""
+    return _iter_word_questions(WORD_ENGINES[engine](uploaded_file))
+
+
+def parse_from_word(uploaded_file, engine: str = "stream"):
+    """Парсер тестів з Word (.docx)."""
+    with span("parse_word", input_size=source_size(uploaded_file), engine=engine) as s:
+        questions, errors = _collect(iter_from_word(uploaded_file, engine))
+        s.update(questions=len(questions), errors=len(errors))
+    return questions, errors
+
+# ================== Moodle XML (імпорт банку питань) ==================
+
+MOODLE_TYPES = ("multichoice", "truefalse", "matching")
+
+
+def _unwrap_p(html: str) -> str:
+    """Знімає обгортку <p>…</p>, яку додає wrap_cdata."""
+    if html.startswith("<p>") and html.endswith("</p>"):
+        return html[3:-4]
+    return html
+
+
+def _fraction(value) -> float:
+    """Оцінка варіанта з атрибута fraction («100», «33.33333», «-50»); цілі — як int."""
+    frac = float(value or 0)
+    return int(frac) if frac.is_integer() else frac
+
+
+def _moodle_question(el):
+    """
+    Елемент <question> → Question з типом і оцінками джерела. Повертає
+    (питання, повідомлення про помилку): питання, яке не можна передати без
+    змін (немає правильної відповіді, «-» у лівій частині пари), не
+    змінюється, а потрапляє в помилки.
+    """
+    q_type = el.get("type")
+    text = _unwrap_p(el.findtext("questiontext/text") or "")
+    if q_type == "multichoice":
+        answers, fractions = [], []
+        for a in el.iterfind("answer"):
+            frac = _fraction(a.get("fraction"))
+            answers.append((a.findtext("text") or "", frac > 0))
+            fractions.append(frac)
+        if not answers:
+            return None, "Питання без варіантів відповіді"
+        if not any(c for _, c in answers):
+            return None, "Питання multichoice без правильної відповіді"
+        # у Moodle <single> за замовчуванням true
+        single = (el.findtext("single") or "true").strip().lower() in ("true", "1")
+        return Question(text, answers, "single" if single else "multiple", fractions), None
+    if q_type == "truefalse":
+        is_true = any(_fraction(a.get("fraction")) > 0
+                      for a in el.iterfind("answer") if (a.findtext("text") or "").strip() == "true")
+        return Question(text, [("true", is_true), ("false", not is_true)], "truefalse"), None
+    if q_type == "matching":
+        answers = []
+        for sub in el.iterfind("subquestion"):
+            ans = sub.find("answer")
+            # наш генератор пише відповідь прямо в <answer>, Moodle — в <answer><text>
+            right = ans.findtext("text") if ans is not None and ans.find("text") is not None \
+                else (ans.text if ans is not None else "")
+            left = (sub.findtext('text') or '').strip()
+            if "-" in left:
+                # пара зберігається як «ліве - праве» і ділиться по першому «-»
+                return None, f"Ліва частина пари містить «-»: {left[:50]}"
+            answers.append((f"{left} - {(right or '').strip()}", False))
+        if not answers:
+            return None, "Питання без варіантів відповіді"
+        return Question(text, answers, "matching"), None
+    return None, f"Непідтримуваний тип питання: {q_type}"
+
+
+def iter_from_moodle_xml(uploaded_file):
+    """
+    Потоковий імпорт Moodle XML (шлях або файлоподібний об'єкт): пари
+    (питання, помилка) для multichoice, truefalse і matching. Кожен
+    <question> звільняється одразу після розбору, тож пам'ять не залежить
+    від розміру банку. Питання категорій пропускаються.
+    """
+    from lxml import etree
+
+    idx = 0
+    for _, el in etree.iterparse(uploaded_file, events=("end",), tag="question",
+                                 huge_tree=True, resolve_entities=False):
+        q_type = el.get("type")
+        if q_type != "category":
+            idx += 1
+            q, message = _moodle_question(el)
+            yield (q, None) if q is not None else (None, (idx, message))
+        el.clear()
+        parent = el.getparent()
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def parse_from_moodle_xml(uploaded_file):
+    """Імпорт питань з Moodle XML (банку питань або результату цього застосунку)."""
+    with span("parse_moodle_xml", input_size=source_size(uploaded_file)) as s:
+        questions, errors = _collect(iter_from_moodle_xml(uploaded_file))
+        s.update(questions=len(questions), errors=len(errors))
+    return questions, errors
@@ -0,0 +1,102 @@
+"""
+Модель питання: текст, варіанти відповідей і все, що з них випливає
+(тип, кількість правильних, штраф, оцінки варіантів), рахується один раз
+при створенні, а не на кожне звернення генератора XML чи відбору питань.
+"""
+
+
+def detect_question_type(answers, correct: int = None):
+    """Визначаємо тип питання за списком відповідей."""
+    if all('-' in ans for ans, _ in answers):
+        return "matching"
+    if correct is None:
+        correct = sum(1 for _, c in answers if c)
+    if len(answers) == 2 and correct <= 1:
+        return "truefalse"
+    if correct == 1:
+        return "single"
+    if correct > 1:
+        return "multiple"
+    return "unknown"
+
+
+# Типи, які можна задати явно (Question(..., q_type=…))
+QUESTION_TYPES = ("single", "multiple", "truefalse", "matching")
+
+# Штрафи й набори оцінок повторюються з питання в питання (їх лише кілька
+# десятків варіантів), тож усі питання ділять ті самі об'єкти
+_SHARED = {}
+
+
+def _shared(value):
+    return _SHARED.setdefault(value, value)
+
+
+class Question:
+    """
+    Питання з варіантами відповідей (текст, правильна?). Похідні поля
+    рахуються в конструкторі, тож після створення питання не змінюють.
+        type      — single / multiple / truefalse / matching / unknown
+        correct   — кількість правильних варіантів
+        penalty   — штраф за неправильну спробу (1 / correct)
+        fractions — оцінка кожного варіанта у відсотках (для truefalse —
+                    варіантів «true» і «false»)
+    Тип і оцінки можна задати явно (q_type, fractions) — так імпорт Moodle XML
+    зберігає тип і часткові оцінки джерела, а не виводить їх з відповідей.
+    Підтримує q["text"] і q["answers"], як колишні словники.
+    """
+
+    __slots__ = ("text", "answers", "type", "correct", "penalty", "fractions")
+
+    def __init__(self, text: str, answers, q_type: str = None, fractions=None):
+        answers = tuple(answers)
+        correct = sum(1 for _, c in answers if c)
+        if q_type is None:
+            q_type = detect_question_type(answers, correct)
+        elif q_type not in QUESTION_TYPES:
+            raise ValueError(f"Невідомий тип питання: {q_type}")
+        self.text = text
+        self.answers = answers
+        self.type = q_type
+        self.correct = correct
+        self.penalty = _shared(1.0 / correct if correct else 0)
+        if fractions is not None:
+            fractions = tuple(fractions)
+            if len(fractions) != (2 if q_type == "truefalse" else len(answers)):
+                raise ValueError("Кількість оцінок не збігається з кількістю варіантів")
+        elif q_type == "truefalse":
+            correct_true = answers[0][1]
+            fractions = (100, 0) if correct_true else (0, 100)
+        else:
+            fractions = tuple(100 if c else 0 for _, c in answers)
+        self.fractions = _shared(fractions)
+
+    def __getitem__(self, key):
+        if key not in ("text", "answers"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return (self.text == other.text and self.answers == other.answers
+                and self.type == other.type and self.fractions == other.fractions)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Question({self.text!r}, {list(self.answers)!r}, q_type={self.type!r})"
+
+    def __getstate__(self):
+        return self.text, self.answers, self.type, self.fractions
+
+    def __setstate__(self, state):
+        text, answers, q_type, fractions = state
+        self.__init__(text, answers, q_type if q_type in QUESTION_TYPES else None, fractions)
+
+
+def as_question(q) -> Question:
+    """Question як є; словник {"text", "answers"} перетворюється."""
+    if isinstance(q, Question):
+        return q
+    return Question(q["text"], q["answers"])
@@ -0,0 +1,226 @@
+"""
+Постійне (на диску) сховище питань на базі SQLite: питання з усіх
+режимів і CLI зберігаються між сесіями, шукаються повнотекстово (FTS5 за
+текстом питання й відповідей) і фільтруються за типом та джерелом через
+індекси, тож вибірку з великого банку можна одразу експортувати в XML.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from llm_cache import DEFAULT_CACHE_DIR
+from moodle_xml import generate_moodle_xml_string
+from question import QUESTION_TYPES, Question, as_question
+
+DEFAULT_STORE_PATH = os.getenv("QUESTION_STORE_PATH", os.path.join(DEFAULT_CACHE_DIR, "questions.db"))
+
+# Скільки питань вставляти за один executemany
+_BATCH = 5000
+
+
+def fts_query(text: str) -> str:
+    """
+    Рядок пошуку користувача → запит FTS5: кожне слово шукається як фраза
+    (усі слова мають бути присутні), «*» у кінці слова — пошук за префіксом.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _question_hash(text: str, answers, q_type: str, fractions) -> str:
+    payload = json.dumps([text, answers, q_type, fractions], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _row_question(text: str, answers: str, q_type: str, fractions) -> Question:
+    return Question(text, [tuple(a) for a in json.loads(answers)],
+                    q_type if q_type in QUESTION_TYPES else None,
+                    json.loads(fractions) if fractions else None)
+
+
+class QuestionStore:
+    """
+    Банк питань:
+        store.add(questions, source="lecture1.docx")
+        store.search("мережа", types=["single"], limit=20)   # [(id, Question, source)]
+        store.export("мережа", limit=1000)                   # Moodle XML
+    Однакові питання (той самий текст, відповіді, тип і оцінки) зберігаються
+    один раз; тип і оцінки варіантів зберігаються як є (див. Question).
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                " id INTEGER PRIMARY KEY, hash TEXT UNIQUE NOT NULL,"
+                " text TEXT NOT NULL, answers TEXT NOT NULL, type TEXT NOT NULL,"
+                " source TEXT NOT NULL DEFAULT '', created REAL, fractions TEXT)"
+            )
+            # бази, створені до появи стовпця fractions (оцінки варіантів джерела)
+            if "fractions" not in {row[1] for row in conn.execute("PRAGMA table_info(questions)")}:
+                conn.execute("ALTER TABLE questions ADD COLUMN fractions TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS questions_type ON questions(type, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS questions_source ON questions(source, id)")
+            # contentless: текст уже є в questions, індекс зберігає лише токени;
+            # префікси з 2–3 літер індексуються окремо, щоб «ме*» не перебирав
+            # усі слова на «ме»
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5("
+                " text, answers, content='', prefix='2 3',"
+                " tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # окреме з'єднання на операцію — Streamlit і воркери звертаються з різних потоків
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------- запис ----------
+
+    def add(self, questions, source: str = "") -> int:
+        """Додає питання (Question або словники); повертає кількість нових."""
+        now = time.time()
+        added = 0
+        with self._connect() as conn:
+            # запис одразу блокує базу: нові id для FTS беремо після max(id)
+            conn.execute("BEGIN IMMEDIATE")
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM questions").fetchone()[0]
+            batch = []
+            for q in questions:
+                q = as_question(q)
+                answers = [list(a) for a in q.answers]
+                fractions = list(q.fractions)
+                batch.append((_question_hash(q.text, answers, q.type, fractions), q.text,
+                              json.dumps(answers, ensure_ascii=False), q.type, source, now,
+                              json.dumps(fractions)))
+                if len(batch) >= _BATCH:
+                    added += self._insert(conn, batch)
+                    batch = []
+            if batch:
+                added += self._insert(conn, batch)
+            conn.execute(
+                "INSERT INTO questions_fts (rowid, text, answers)"
+                " SELECT id, text, (SELECT group_concat(json_extract(value, '$[0]'), char(10))"
+                "                   FROM json_each(questions.answers))"
+                " FROM questions WHERE id > ?", (last_id,)
+            )
+        return added
+
+    @staticmethod
+    def _insert(conn, rows) -> int:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO questions (hash, text, answers, type, source, created, fractions)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        return conn.total_changes - before
+
+    def delete(self, query: str = "", types=None, sources=None) -> int:
+        """Видаляє питання, що відповідають фільтрам (без фільтрів — усі)."""
+        sql, params, _ = self._where(query, types, sources)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT questions.id, questions.text, questions.answers {sql}", params
+            ).fetchall()
+            # з contentless FTS видаляють, передаючи ті самі значення, що індексувались
+            conn.executemany(
+                "INSERT INTO questions_fts (questions_fts, rowid, text, answers)"
+                " VALUES ('delete', ?, ?, ?)",
+                [(i, text, "\n".join(a for a, _ in json.loads(answers))) for i, text, answers in rows]
+            )
+            conn.executemany("DELETE FROM questions WHERE id = ?", [(i,) for i, _, _ in rows])
+        return len(rows)
+
+    # ---------- читання ----------
+
+    @staticmethod
+    def _where(query: str = "", types=None, sources=None):
+        """
+        FROM/WHERE вибірки і стовпець її порядку. З пошуком вибірка йде від
+        індексу FTS у порядку його rowid (= id), тож LIMIT зупиняється на
+        перших збігах, не сортуючи всіх.
+        """
+        clauses, params = [], []
+        match = fts_query(query or "")
+        if match:
+            source = "questions_fts JOIN questions ON questions.id = questions_fts.rowid"
+            order = "questions_fts.rowid"
+            clauses.append("questions_fts MATCH ?")
+            params.append(match)
+        else:
+            source, order = "questions", "questions.id"
+        for column, values in (("type", types), ("source", sources)):
+            if values:
+                clauses.append(f"questions.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        where = f"FROM {source}" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        return where, params, order
+
+    def count(self, query: str = "", types=None, sources=None) -> int:
+        sql, params, _ = self._where(query, types, sources)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) {sql}", params).fetchone()[0]
+
+    def search(self, query: str = "", types=None, sources=None, limit: int = None, offset: int = 0):
+        """Питання за пошуком і фільтрами в порядку додавання: [(id, Question, джерело)]."""
+        sql, params, order = self._where(query, types, sources)
+        sql = (f"SELECT questions.id, questions.text, questions.answers, questions.type,"
+               f" questions.fractions, questions.source {sql} ORDER BY {order}")
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [(i, _row_question(text, answers, q_type, fractions), source)
+                for i, text, answers, q_type, fractions, source in rows]
+
+    def questions(self, query: str = "", types=None, sources=None, limit: int = None, offset: int = 0):
+        """Лише питання (Question) вибірки search()."""
+        return [q for _, q, _ in self.search(query, types, sources, limit, offset)]
+
+    def export(self, query: str = "", types=None, sources=None, limit: int = None) -> str:
+        """Moodle XML для вибірки (generate_moodle_xml_string)."""
+        return generate_moodle_xml_string(self.questions(query, types, sources, limit))
+
+    def sources(self):
+        """[(джерело, кількість питань)] за алфавітом."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT source, COUNT(*) FROM questions GROUP BY source ORDER BY source"
+            ).fetchall()
+
+    def types(self):
+        """[(тип, кількість питань)]."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT type, COUNT(*) FROM questions GROUP BY type ORDER BY type"
+            ).fetchall()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> QuestionStore:
+    """Спільне на процес сховище за шляхом DEFAULT_STORE_PATH."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = QuestionStore()
+        return _store
@@ -0,0 +1,35 @@
+"""Спільне для тестів: модулі застосунку (корінь репозиторію, без пакета) і заглушка OpenAI."""
+import os
+import sys
+
+import openai
+import pytest
+from openai.openai_object import OpenAIObject
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+# генератор синтетичного корпусу (benchmarks/corpus.py) — і для тестів
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+def completion(content: str, total_tokens: int = 10):
+    """Відповідь у форматі openai.ChatCompletion.create."""
+    return OpenAIObject.construct_from({
+        "choices": [{"message": {"role": "assistant", "content": content}}],
+        "usage": {"total_tokens": total_tokens},
+    })
+
+
+@pytest.fixture
+def fake_create(monkeypatch):
+    """
+    Заглушка openai.ChatCompletion.create: відповідає «відповідь N» (N —
+    номер виклику) і записує параметри кожного виклику в fake_create.calls.
+    """
+    def create(**params):
+        create.calls.append(params)
+        return completion(f"відповідь {len(create.calls)}")
+
+    create.calls = []
+    monkeypatch.setattr(openai.ChatCompletion, "create", create)
+    return create
@@ -0,0 +1,188 @@
+"""
+Еталонні реалізації з початкової версії app.py (до розбиття на модулі),
+без змін: з ними порівнюються оптимізовані генератор і парсери.
+"""
+
+# ================== Утиліти для XML ==================
+
+def wrap_cdata(text: str) -> str:
+    """Обгортає текст у CDATA з HTML-тегом <p>."""
+    return f"<![CDATA[<p>{text}</p>]]>"
+
+def detect_question_type(answers):
+    """Визначаємо тип питання за списком відповідей."""
+    if all('-' in ans for ans, _ in answers):
+        return "matching"
+    correct = sum(1 for _, c in answers if c)
+    if len(answers) == 2 and correct <= 1:
+        return "truefalse"
+    if correct == 1:
+        return "single"
+    if correct > 1:
+        return "multiple"
+    return "unknown"
+
+def generate_moodle_xml_string(questions) -> str:
+    """Генерує Moodle XML зі списку питань."""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<quiz>']
+    for q in questions:
+        q_type = detect_question_type(q["answers"])
+        if q_type in ("single", "multiple"):
+            lines.append('  <question type="multichoice">')
+        elif q_type == "truefalse":
+            lines.append('  <question type="truefalse">')
+        elif q_type == "matching":
+            lines.append('  <question type="matching">')
+        else:
+            continue
+
+        preview = q["text"][:30] + ('...' if len(q["text"]) > 30 else '')
+        lines.extend([
+            '    <name>',
+            f'      <text>{wrap_cdata(preview)}</text>',
+            '    </name>',
+            '    <questiontext format="html">',
+            f'      <text>{wrap_cdata(q["text"])}</text>',
+            '    </questiontext>'
+        ])
+
+        if q_type in ("single", "multiple"):
+            total_correct = sum(1 for _, c in q["answers"] if c)
+            penalty = 1.0 / total_correct if total_correct else 0
+            lines.extend([
+                '    <shuffleanswers>true</shuffleanswers>',
+                f'    <single>{"true" if q_type=="single" else "false"}</single>',
+                '    <answernumbering>abc</answernumbering>',
+                f'    <penalty>{penalty:.6f}</penalty>',
+                '    <defaultgrade>1.000000</defaultgrade>'
+            ])
+            for text, corr in q["answers"]:
+                frac = 100 if corr else 0
+                lines.extend([
+                    f'    <answer fraction="{frac}" format="html">',
+                    f'      <text><![CDATA[{text}]]></text>',
+                    '    </answer>'
+                ])
+
+        elif q_type == "truefalse":
+            correct_true = q["answers"][0][1]
+            for val in ("true", "false"):
+                frac = 100 if (val=="true" and correct_true) or (val=="false" and not correct_true) else 0
+                lines.extend([
+                    f'    <answer fraction="{frac}" format="html">',
+                    f'      <text><![CDATA[{val}]]></text>',
+                    '    </answer>'
+                ])
+
+        elif q_type == "matching":
+            lines.append('    <shuffleanswers>true</shuffleanswers>')
+            for pair, _ in q["answers"]:
+                left, right = map(str.strip, pair.split('-', 1))
+                lines.extend([
+                    '    <subquestion format="html">',
+                    f'      <text><![CDATA[{left}]]></text>',
+                    f'      <answer><![CDATA[{right}]]></answer>',
+                    '    </subquestion>'
+                ])
+
+        lines.append('  </question>')
+    lines.append('</quiz>')
+    return "\n".join(lines)
+
+# ================== Парсери ==================
+
+import re
+
+
+def parse_text_format(text: str):
+    """Парсер готового тесту з тексту."""
+    mapping = {'а':'A','А':'A','б':'B','Б':'B','в':'C','В':'C','г':'D','Г':'D'}
+    blocks = re.split(r"(?m)(?=^\d+\.)", text.strip())
+    blocks = [blk for blk in blocks if blk.strip()]
+    corr_pattern = re.compile(r"(?i)^(?:правильн\w*\s+(?:ответ|відповід))[:]?", re.IGNORECASE)
+    questions, errors = [], []
+
+    for idx, block in enumerate(blocks, 1):
+        lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
+        m_q = re.match(r"^\d+\.\s*(.+)", lines[0])
+        q_text = m_q.group(1).strip() if m_q else lines[0]
+
+        corr_idx = next((i for i, ln in enumerate(lines) if corr_pattern.match(ln)), None)
+        if corr_idx is None:
+            errors.append((idx, "Не знайдено рядок із правильними відповідями"))
+            continue
+
+        ans_lines = lines[1:corr_idx]
+        corr_line = lines[corr_idx]
+        letters = re.findall(r"[A-ГA-D]", corr_line)
+        correct_set = {mapping.get(l, l.upper()) for l in letters}
+
+        answers = []
+        if len(ans_lines) == 1 and re.search(r"(?i)true", ans_lines[0]):
+            is_true = re.search(r"(?i)true", corr_line) is not None
+            answers = [("true", is_true), ("false", not is_true)]
+        else:
+            for ln in ans_lines:
+                m_a = re.match(r"^([A-Г])[\)\.]*\s*(.+)", ln)
+                if not m_a:
+                    errors.append((idx, f"Невірний формат відповіді: '{ln}'"))
+                    break
+                letter = mapping.get(m_a.group(1), m_a.group(1).upper())
+                answers.append((m_a.group(2).strip(), letter in correct_set))
+            if len(answers) < 2:
+                errors.append((idx, "Менше двох варіантів відповіді"))
+                continue
+
+        questions.append({"text": q_text, "answers": answers})
+
+    return questions, errors
+
+
+def parse_from_word(uploaded_file):
+    """Парсер тестів з Word (.docx)."""
+    from docx import Document
+
+    doc = Document(uploaded_file)
+    answer_pattern = re.compile(r'^[A-ЯA-Z]\.\s*', re.U)
+    questions, errors = [], []
+    curr_q = None
+
+    for para in doc.paragraphs:
+        for line in para.text.splitlines():
+            txt = line.strip()
+            if not txt:
+                continue
+
+            # Inline формат: "Питання: A; B; C;"
+            if ':' in txt and txt.count(';') >= 2 and not answer_pattern.match(txt):
+                if curr_q:
+                    questions.append(curr_q)
+                part_q, part_ans = txt.split(':', 1)
+                curr_q = {"text": part_q.strip(), "answers": []}
+                segments = [seg.strip().rstrip(';') for seg in part_ans.split(';') if seg.strip()]
+                for seg in segments:
+                    is_corr = any(run.bold and seg in run.text for run in para.runs)
+                    curr_q["answers"].append((seg, is_corr))
+
+            # Окремі абзаци-відповіді "A. Відповідь"
+            elif answer_pattern.match(txt):
+                if curr_q is None:
+                    errors.append(f"Відповідь без питання: «{txt}»")
+                    continue
+                is_corr = any(run.bold for run in para.runs)
+                ans_txt = answer_pattern.sub('', txt)
+                curr_q["answers"].append((ans_txt, is_corr))
+
+            else:
+                if curr_q is None:
+                    curr_q = {"text": txt, "answers": []}
+                elif curr_q["answers"]:
+                    questions.append(curr_q)
+                    curr_q = {"text": txt, "answers": []}
+                else:
+                    curr_q["text"] += " " + txt
+
+    if curr_q:
+        questions.append(curr_q)
+
+    return questions, errors
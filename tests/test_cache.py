@@ -0,0 +1,79 @@
+"""Кеш розборів завантажень (cache.cached_parse)."""
+from io import BytesIO
+
+import pytest
+
+import cache
+from cache import PARSE_CACHE, UPLOAD_KEYS, cached_parse
+
+
+class Upload(BytesIO):
+    """Як UploadedFile Streamlit: байти плюс file_id і ім'я."""
+
+    def __init__(self, data: bytes, file_id: str = None, name: str = "test.txt"):
+        super().__init__(data)
+        self.file_id = file_id
+        self.name = name
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    PARSE_CACHE.clear()
+    UPLOAD_KEYS.clear()
+    counts = {"hash": 0, "parse": 0}
+    content_hash = cache.content_hash
+
+    def counting_hash(data):
+        counts["hash"] += 1
+        return content_hash(data)
+
+    monkeypatch.setattr(cache, "content_hash", counting_hash)
+    yield counts
+    PARSE_CACHE.clear()
+    UPLOAD_KEYS.clear()
+
+
+def _parser(counts):
+    def parse(f):
+        counts["parse"] += 1
+        return [f.read().decode("utf-8")], []
+    return parse
+
+
+def test_rerun_with_same_upload_skips_hashing(counters):
+    parse = _parser(counters)
+    upload = Upload("питання".encode(), file_id="id-1")
+    first = cached_parse("text", upload, parse)
+    for _ in range(3):  # rerun Streamlit: той самий UploadedFile
+        assert cached_parse("text", upload, parse) is first
+    assert counters == {"hash": 1, "parse": 1}
+    assert first.questions == ["питання"]
+
+
+def test_same_content_under_new_file_id_is_hashed_but_not_parsed(counters):
+    parse = _parser(counters)
+    first = cached_parse("text", Upload(b"same", file_id="id-1"), parse)
+    assert cached_parse("text", Upload(b"same", file_id="id-2", name="copy.txt"), parse) is first
+    assert counters == {"hash": 2, "parse": 1}
+    # інший режим з тим самим вмістом — окремий запис
+    cached_parse("word", Upload(b"same", file_id="id-2"), parse)
+    assert counters["parse"] == 2
+
+
+def test_without_file_id_content_hash_is_the_key(counters):
+    parse = _parser(counters)
+    cached_parse("text", b"bytes", parse)
+    cached_parse("text", BytesIO(b"bytes"), parse)
+    assert counters == {"hash": 2, "parse": 1}
+
+
+def test_evicted_entry_falls_back_to_content_hash(counters):
+    parse = _parser(counters)
+    upload = Upload(b"data", file_id="id-1")
+    cached_parse("text", upload, parse)
+    PARSE_CACHE.clear()
+    cached_parse("text", upload, parse)
+    assert counters == {"hash": 2, "parse": 2}
+    # file_id той самий, а розмір інший — не довіряємо старому запису
+    cached_parse("text", Upload(b"other data", file_id="id-1"), parse)
+    assert counters == {"hash": 3, "parse": 3}
@@ -0,0 +1,26 @@
+"""Перевірка аргументів командного рядка cli.py."""
+import pytest
+
+import cli
+
+
+@pytest.mark.parametrize("argv", [
+    ["in/", "--merge", "a.xml", "--zip", "b.zip"],
+    ["in/", "--merge", "a.xml", "--store"],
+    ["in/", "--zip", "b.zip", "--store", "q.db"],
+    ["in/", "--dedupe"],
+    ["in/", "--zip", "b.zip", "--dedupe", "0.8"],
+    ["in/", "--shard-size", "5M"],
+    ["in/", "--merge", "a.xml", "--shard-questions", "100"],
+])
+def test_conflicting_options_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert "error:" in capsys.readouterr().err
+
+
+def test_merge_with_dedupe_is_accepted(tmp_path, capsys):
+    # без вхідних файлів main повертає 2, але аргументи проходять перевірку
+    assert cli.main([str(tmp_path), "--merge", str(tmp_path / "a.xml"), "--dedupe"]) == 2
+    assert "error:" not in capsys.readouterr().err
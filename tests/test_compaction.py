@@ -0,0 +1,46 @@
+"""Стиснення транскриптів (compaction.py)."""
+import pytest
+
+from compaction import collapse_repeated_sentences, compact_text, drop_fillers, normalize_whitespace
+
+
+@pytest.mark.parametrize("text", [
+    "Це дуже дуже важливо.",
+    "I think that that matters.",
+    "What it is is a protocol.",
+    "Що ж, так-так, домовились.",
+    "Маємо пакет пакет-ідентифікатор і ключ ключів.",
+    "Значить це правило працює завжди.",  # без коми — не вставне слово
+    "Ну добре, домовились.",
+    "Ну і що з того?",
+    "А ну покажи.",
+])
+def test_legitimate_repeats_and_words_are_kept(text):
+    assert drop_fillers(text) == text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Я я я думаю, що the the пакет дійде.", "Я думаю, що the пакет дійде."),
+    ("І, і, і тоді на на сервер.", "І тоді на сервер."),
+    ("Протокол, типу, надійний.", "Протокол надійний."),
+    ("Ну, значить, протокол TCP надійний.", "Протокол TCP надійний."),
+    ("Е-е, ну, протокол. Ем, Київ — столиця. Ммм... так.", "Протокол. Київ — столиця. Так."),
+    ("Швидкість, ну, е-е, висока.", "Швидкість висока."),
+    ("ну, з маленької", "з маленької"),
+    ("Отже. Короче, все.\nТипу, далі.", "Отже. Все.\nДалі."),
+])
+def test_fillers_are_dropped_and_sentences_keep_capitals(text, expected):
+    assert drop_fillers(text) == expected
+
+
+def test_repeated_sentences_and_whitespace():
+    text = "Перше  речення.\tДруге речення!\r\n\r\n\r\nПерше речення. Нове?  "
+    assert normalize_whitespace(text) == "Перше речення. Друге речення!\n\nПерше речення. Нове?"
+    assert collapse_repeated_sentences(normalize_whitespace(text)) == \
+        "Перше речення. Друге речення!\n\nНове?"
+
+
+def test_compact_text_without_fillers_keeps_words():
+    text = "Ну, протокол протокол. Ну, протокол протокол."
+    assert compact_text(text, fillers=False) == "Ну, протокол протокол."
+    assert compact_text(text) == "Протокол протокол."
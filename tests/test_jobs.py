@@ -0,0 +1,71 @@
+"""Відновлення і прибирання завдань у jobs.JobQueue."""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import jobs
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+def _job(directory, job_id, status, **fields):
+    os.makedirs(os.path.join(directory, job_id))
+    meta = {"id": job_id, "status": status, "finished": None, **fields}
+    with open(os.path.join(directory, job_id, "job.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _dead_pid():
+    return int(subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True).stdout)
+
+
+def _wait(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_only_jobs_of_dead_processes_are_recovered(tmp_path):
+    d = str(tmp_path)
+    host = jobs._HOST
+    _job(d, "a" * 32, RUNNING, host=host, pid=_dead_pid(), process="x")
+    _job(d, "b" * 32, QUEUED, host=host, pid=os.getppid(), process="x")  # живий сусідній процес
+    _job(d, "c" * 32, RUNNING, host=host, pid=os.getpid(), process="old")  # попередній запуск з тим самим pid
+    _job(d, "d" * 32, RUNNING, host="other-host", pid=1, process="x")
+    _job(d, "e" * 32, RUNNING)  # без запису процесу (стара версія)
+    _job(d, "f" * 32, RUNNING, **jobs._process_info())  # наше власне
+
+    queue = JobQueue(d, workers=1)
+    status = {job_id[0]: queue.status(job_id)["status"] for job_id in os.listdir(d)}
+    assert status == {"a": FAILED, "b": QUEUED, "c": FAILED, "d": RUNNING, "e": FAILED, "f": RUNNING}
+
+
+def test_new_queue_keeps_jobs_of_a_live_queue(tmp_path):
+    release = threading.Event()
+    first = JobQueue(str(tmp_path), workers=1)
+    job_id = first.submit("test", lambda report: release.wait(5) and {"ok": True})
+    _wait(lambda: first.status(job_id)["status"] == RUNNING)
+
+    JobQueue(str(tmp_path), workers=1)  # ще один у тому ж процесі, як після rerun
+    assert first.status(job_id)["status"] == RUNNING
+    assert first.status(job_id)["pid"] == os.getpid()
+    release.set()
+    _wait(lambda: first.status(job_id)["status"] == DONE)
+    assert first.result(job_id) == {"ok": True}
+
+
+def test_queue_cleans_up_periodically(tmp_path):
+    d = str(tmp_path)
+    queue = JobQueue(d, workers=1, ttl=0.2, housekeeping_interval=0.1)
+    job_id = queue.submit("test", lambda report: {"ok": True})
+    _wait(lambda: (queue.status(job_id) or {}).get("status") == DONE)
+    # завдання іншого процесу, що помер уже після старту черги
+    _job(d, "a" * 32, RUNNING, host=jobs._HOST, pid=_dead_pid(), process="x")
+
+    _wait(lambda: queue.status(job_id) is None)  # прострочене завершене видалено
+    _wait(lambda: not os.path.exists(os.path.join(d, "a" * 32)))  # перерване, а згодом і видалене
+    queue.close()
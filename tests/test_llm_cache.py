@@ -0,0 +1,65 @@
+"""Кеш відповідей LLM (llm_cache.LLMCache) на шляху llm.chat_completion."""
+import pytest
+
+import llm_cache
+from llm import chat_completion
+from llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm.sqlite3"))
+
+
+def test_miss_then_hit(cache, fake_create):
+    assert chat_completion("текст", cache=cache) == "відповідь 1"
+    assert chat_completion("текст", cache=cache) == "відповідь 1"
+    assert len(fake_create.calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": len("відповідь 1".encode())}
+
+
+def test_nonzero_temperature_bypasses_cache(cache, fake_create):
+    chat_completion("текст", cache=cache, temperature=0.7)
+    chat_completion("текст", cache=cache, temperature=0.7)
+    assert len(fake_create.calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("change", [
+    {"model": "gpt-3.5-turbo"},
+    {"system_prompt": "Інший промпт"},
+    {"user_text": "інший текст"},
+])
+def test_key_changes_with_model_prompt_and_text(cache, fake_create, change):
+    request = dict(user_text="текст", system_prompt="Промпт", model="gpt-4")
+    chat_completion(cache=cache, **request)
+    assert chat_completion(cache=cache, **dict(request, **change)) == "відповідь 2"
+    assert fake_create.calls[1]["model"] == dict(request, **change)["model"]
+    assert cache.stats()["entries"] == 2
+
+
+def test_expired_entry_is_refetched(cache, fake_create, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    chat_completion("текст", cache=cache)
+    now[0] += cache.ttl - 1
+    assert chat_completion("текст", cache=cache) == "відповідь 1"
+    now[0] += 2
+    assert chat_completion("текст", cache=cache) == "відповідь 2"
+    assert len(fake_create.calls) == 2
+
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = LLMCache(str(tmp_path / "llm.sqlite3"), max_bytes=25)
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.set(key, "x" * 10)
+    now[0] += 1
+    assert cache.get("a") == "x" * 10  # «a» тепер використано пізніше за «b»
+    now[0] += 1
+    cache.set("c", "x" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] == 20
@@ -0,0 +1,41 @@
+"""Генерація з довгого тексту частинами (llm.generate_questions_chunked)."""
+from conftest import completion
+from llm import generate_questions_chunked
+
+REPLY = """1. Що таке протокол TCP у мережах?
+A. Протокол транспортного рівня
+B. Кабель
+C. Маршрутизатор
+D. Порт
+Правильна відповідь: A
+
+2. Частина {n}: що вивчає розділ {n}?
+A. Тему {n}
+B. Іншу тему
+C. Ще одну
+D. Жодну
+Правильна відповідь: A
+"""
+
+
+def test_duplicates_across_chunks_are_dropped():
+    calls = []
+
+    async def acreate(**params):
+        calls.append(params)
+        n = len(calls)
+        # перше питання кожна частина формулює майже однаково
+        reply = REPLY.format(n=n)
+        if n == 2:
+            reply = reply.replace("Що таке протокол TCP у мережах?", "Що таке протокол TCP у мережах")
+        return completion(reply)
+
+    text = "\n\n".join(f"Розділ {i}. " + "Текст розділу про мережі. " * 40 for i in range(3))
+    questions, errors = generate_questions_chunked(text, count=10, max_tokens=400, cache=None,
+                                                   acreate=acreate)
+    assert len(calls) == 3 and errors == []
+    texts = [q.text for q in questions]
+    assert texts.count("Що таке протокол TCP у мережах?") == 1
+    assert not any(t == "Що таке протокол TCP у мережах" for t in texts)
+    assert sorted(t for t in texts if t.startswith("Частина")) == [
+        f"Частина {n}: що вивчає розділ {n}?" for n in (1, 2, 3)]
@@ -0,0 +1,53 @@
+"""Промпт звичайної GPT-генерації будується з кількості питань."""
+import re
+
+import pytest
+
+from llm import SYSTEM_PROMPT, build_system_prompt, input_budget, stream_questions
+
+
+def test_default_prompt_is_unchanged_for_ten_questions():
+    # той самий текст, що й до параметризації: ключі кешу відповідей лишаються чинними
+    assert SYSTEM_PROMPT == build_system_prompt(10)
+    assert "обмеженням на 10 питань" in SYSTEM_PROMPT
+    assert "   – 4–5 питань Single-choice,\n   – 2–3 питання True/False,\n" in SYSTEM_PROMPT
+
+
+@pytest.mark.parametrize("count, phrases", [
+    (1, ["на 1 питання ", "**саме 1** логічне питання", "= 1.", "після 1-го питання",
+         "   – 1 питання Single-choice.\n"]),
+    (2, ["**саме 2** логічні питання", "   – 1 питання Single-choice,\n   – 1 питання True/False.\n"]),
+    (3, ["на 3 питання ", "**саме 3** логічні питання", "1–2 питання Single-choice"]),
+    (12, ["на 12 питань ", "**саме 12** логічних питань", "5–6 питань Single-choice",
+          "2–3 питання True/False"]),
+])
+def test_prompt_follows_count(count, phrases):
+    prompt = build_system_prompt(count)
+    for phrase in phrases:
+        assert phrase in prompt
+    assert "10" not in prompt
+
+
+@pytest.mark.parametrize("count", range(1, 41))
+def test_type_ranges_add_up_to_count(count):
+    lines = [line for line in build_system_prompt(count).splitlines() if line.startswith("   – ")]
+    lo = hi = 0
+    for line in lines:
+        m = re.match(r"   – (\d+)(?:–(\d+))? ", line)
+        assert m, line
+        lo += int(m.group(1))
+        hi += int(m.group(2) or m.group(1))
+        assert int(m.group(1)) > 0  # без «0–1» і «0 питань»
+    assert lo <= count <= hi
+
+
+def test_stream_and_budget_use_prompt_for_count():
+    sent = []
+
+    def create(**params):
+        sent.append(params["messages"][0]["content"])
+        return iter([{"choices": [{"delta": {"content": ""}}]}])
+
+    list(stream_questions("текст", count=3, cache=None, create=create))
+    assert sent == [build_system_prompt(3)]
+    assert input_budget(3) - input_budget(4) >= 250  # на кожне питання — місце для відповіді
@@ -0,0 +1,75 @@
+"""Експорт метрик у файли textfile collector (metrics.TextfileExporter)."""
+import os
+import subprocess
+import sys
+
+import metrics
+from metrics import TextfileExporter, span
+
+
+def test_span_does_not_write_files_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "PROM_DIR", None)
+    monkeypatch.setattr(metrics, "_exporter", None)
+    with span("test_stage"):
+        pass
+    assert metrics._exporter is None
+
+
+def test_exporter_writes_only_new_observations(tmp_path):
+    exporter = TextfileExporter(str(tmp_path), interval=3600)
+    try:
+        with span("test_stage", input_size=10):
+            pass
+        exporter.flush()
+        path = tmp_path / f"generation_moodle_xml_{os.getpid()}.prom"
+        text = path.read_text(encoding="utf-8")
+        assert f'pid="{os.getpid()}",mode="unknown",stage="test_stage"' in text
+        mtime = path.stat().st_mtime_ns
+        os.utime(path, ns=(0, 0))
+        exporter.flush()  # нових спостережень немає — файл не переписується
+        assert path.stat().st_mtime_ns == 0 != mtime
+        assert [p.name for p in tmp_path.iterdir()] == [path.name]  # без .tmp
+    finally:
+        exporter._stop.set()
+
+
+def test_stale_files_of_dead_processes_are_removed(tmp_path):
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                          capture_output=True, text=True).stdout.strip()
+    (tmp_path / f"generation_moodle_xml_{dead}.prom").write_text("")
+    (tmp_path / f"generation_moodle_xml_{os.getppid()}.prom").write_text("")
+    (tmp_path / "other.prom").write_text("")
+    exporter = TextfileExporter(str(tmp_path), interval=3600)
+    exporter._stop.set()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [f"generation_moodle_xml_{os.getppid()}.prom", "other.prom"])
+
+
+def test_each_process_writes_its_own_file_at_exit(tmp_path):
+    code = ("import metrics\n"
+            "with metrics.span('child'):\n"
+            "    pass\n")
+    env = dict(os.environ, METRICS_PROM_DIR=str(tmp_path), METRICS_PROM_INTERVAL="3600",
+               PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+    # другий процес прибирає файл першого (вже завершеного) і пише свій
+    files = list(tmp_path.glob("generation_moodle_xml_*.prom"))
+    assert len(files) == 1
+    assert 'stage="child"} 1' in files[0].read_text(encoding="utf-8")
+
+
+def _run_span(**env):
+    code = "import metrics\nwith metrics.span('child'):\n    pass\n"
+    env = dict({k: v for k, v in os.environ.items() if not k.startswith("METRICS_")}, **env,
+               PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                          capture_output=True, text=True).stderr
+
+
+def test_span_log_is_silent_unless_enabled(tmp_path):
+    assert _run_span() == ""
+    assert '"stage": "child"' in _run_span(METRICS_LOG="stderr")
+    log = tmp_path / "spans.log"
+    assert _run_span(METRICS_LOG_PATH=str(log)) == ""
+    assert '"stage": "child"' in log.read_text(encoding="utf-8")
@@ -0,0 +1,73 @@
+"""Імпорт Moodle XML зберігає тип і оцінки джерела (parsers.iter_from_moodle_xml)."""
+from io import BytesIO
+
+from moodle_xml import generate_moodle_xml_string
+from parsers import parse_from_moodle_xml
+from question import Question
+
+
+def _quiz(*questions: str) -> BytesIO:
+    return BytesIO(('<?xml version="1.0"?><quiz>' + "".join(questions) + "</quiz>").encode("utf-8"))
+
+
+def _multichoice(text, answers, single=None):
+    single_tag = f"<single>{single}</single>" if single is not None else ""
+    body = "".join(f'<answer fraction="{frac}"><text>{a}</text></answer>' for a, frac in answers)
+    return (f'<question type="multichoice"><questiontext><text>{text}</text></questiontext>'
+            f"{single_tag}{body}</question>")
+
+
+def _roundtrip(qs):
+    again, errors = parse_from_moodle_xml(BytesIO(generate_moodle_xml_string(qs).encode("utf-8")))
+    assert errors == []
+    return again
+
+
+def test_two_option_multichoice_stays_multichoice():
+    qs, errors = parse_from_moodle_xml(_quiz(_multichoice("Так?", [("Yes", 100), ("No", 0)])))
+    assert errors == []
+    assert qs[0].type == "single"
+    assert qs[0].answers == (("Yes", True), ("No", False))
+    assert _roundtrip(qs) == qs
+
+
+def test_answers_with_dashes_are_not_matching():
+    qs, _ = parse_from_moodle_xml(_quiz(_multichoice("Температура?", [("-5", 100), ("-10", 0), ("-15", 0)])))
+    assert qs[0].type == "single"
+    assert [a for a, _ in qs[0].answers] == ["-5", "-10", "-15"]
+    assert _roundtrip(qs) == qs
+
+
+def test_single_flag_and_partial_fractions_are_kept():
+    qs, _ = parse_from_moodle_xml(_quiz(
+        _multichoice("Оберіть", [("a", 50), ("b", 50), ("c", -100)], single="false"),
+        _multichoice("Одна", [("a", 100), ("b", 100), ("c", 0)], single="true"),
+    ))
+    assert qs[0].type == "multiple"
+    assert qs[0].fractions == (50, 50, -100)
+    assert qs[1].type == "single"
+    assert _roundtrip(qs) == qs
+    assert 'fraction="-100"' in generate_moodle_xml_string(qs)
+
+
+def test_unrepresentable_questions_go_to_errors():
+    qs, errors = parse_from_moodle_xml(_quiz(
+        _multichoice("Нуль", [("a", 0), ("b", 0)]),
+        '<question type="matching"><questiontext><text>Пари</text></questiontext>'
+        "<subquestion><text>x-y</text><answer><text>1</text></answer></subquestion></question>",
+        '<question type="essay"><questiontext><text>Есе</text></questiontext></question>',
+        _multichoice("Добре", [("a", 100), ("b", 0), ("c", 0)]),
+    ))
+    assert [q.text for q in qs] == ["Добре"]
+    assert [idx for idx, _ in errors] == [1, 2, 3]
+
+
+def test_explicit_type_is_validated():
+    q = Question("Q", [("a", True), ("b", False)], "single", (100, 0))
+    assert q.type == "single" and q.penalty == 1.0
+    try:
+        Question("Q", [("a", True)], "essay")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("невідомий тип має відхилятись")
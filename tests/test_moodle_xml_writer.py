@@ -0,0 +1,43 @@
+"""Потоковий генератор Moodle XML дає байт у байт той самий документ, що й початковий."""
+from io import BytesIO
+
+import pytest
+
+import legacy
+from corpus import make_questions
+from moodle_xml import generate_moodle_xml_string, iter_moodle_xml, iter_moodle_xml_text, write_moodle_xml
+
+QUESTIONS = [
+    {"text": "Одна правильна", "answers": [("a", False), ("b", True), ("c", False), ("d", False)]},
+    {"text": "Кілька правильних відповідей у питанні довшому за тридцять символів",
+     "answers": [("a", True), ("b", False), ("c", True), ("d", True)]},
+    {"text": "Рівно тридцять символів тексту", "answers": [("так", True), ("ні", False), ("можливо", False)]},
+    {"text": "Істина", "answers": [("true", True), ("false", False)]},
+    {"text": "Хиба", "answers": [("true", False), ("false", True)]},
+    {"text": "Без правильної з двох", "answers": [("x", False), ("y", False)]},
+    {"text": "Відповідність", "answers": [("Київ - Україна", False), ("Париж -Франція", True)]},
+    {"text": "Без правильних", "answers": [("a", False), ("b", False), ("c", False)]},
+    {"text": "Спецсимволи <b>&amp;</b> \"лапки\" і ]]>", "answers": [("<i>", True), ("&", False), ("'", False)]},
+    {"text": "", "answers": [("порожній текст", True), ("b", False), ("c", False)]},
+]
+
+
+@pytest.mark.parametrize("questions", [QUESTIONS, [], [QUESTIONS[7]], make_questions(500)],
+                         ids=["типи", "порожній", "лише_невідомий", "корпус"])
+def test_streaming_output_is_byte_identical(questions):
+    expected = legacy.generate_moodle_xml_string(questions)
+    assert "".join(iter_moodle_xml_text(questions)) == expected
+    assert generate_moodle_xml_string(questions) == expected
+    assert b"".join(iter_moodle_xml(questions)) == expected.encode("utf-8")
+
+    fp = BytesIO()
+    written = write_moodle_xml(iter(questions), fp)  # генератор, без len()
+    assert fp.getvalue() == expected.encode("utf-8")
+    assert written == len(fp.getvalue())
+
+
+def test_chunks_are_one_per_question():
+    chunks = list(iter_moodle_xml_text(QUESTIONS))
+    # заголовок, питання відомих типів (без «Без правильних»), закриваючий тег
+    assert len(chunks) == 2 + len(QUESTIONS) - 1
+    assert chunks[0].startswith('<?xml') and chunks[-1] == "\n</quiz>"
@@ -0,0 +1,171 @@
+"""Ліміти, повтори й об'єднання запитів у openai_client."""
+import threading
+
+import pytest
+from openai import error as openai_error
+
+import openai_client
+from conftest import completion
+from openai_client import RateLimiter, TokenBucket, create_chat
+
+REQUEST = dict(model="gpt-4", messages=[{"role": "user", "content": "текст"}], temperature=0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Затримки між спробами записуються замість очікування."""
+    slept = []
+    monkeypatch.setattr(openai_client.time, "sleep", slept.append)
+    return slept
+
+
+def _failing(*errors):
+    """create, що спершу кидає errors по черзі, а потім відповідає."""
+    def create(**params):
+        create.calls += 1
+        if create.calls <= len(errors):
+            raise errors[create.calls - 1]
+        return completion("ok")
+
+    create.calls = 0
+    return create
+
+
+def _limiter():
+    return RateLimiter(rpm=1e6, tpm=None)
+
+
+@pytest.mark.parametrize("error", [
+    openai_error.RateLimitError("429", http_status=429),
+    openai_error.ServiceUnavailableError("503", http_status=503),
+    openai_error.APIError("502", http_status=502),
+])
+def test_retries_429_and_5xx_with_jitter(error, sleeps, monkeypatch):
+    windows = []
+    monkeypatch.setattr(openai_client.random, "uniform", lambda lo, hi: windows.append(hi) or hi / 2)
+    create = _failing(error, error, error)
+    resp = create_chat(create, limiter=_limiter(), retries=3, **REQUEST)
+    assert resp.choices[0].message.content == "ok"
+    assert create.calls == 4
+    # повний джитер у вікні, що подвоюється: base·2^attempt
+    assert windows == [openai_client.BACKOFF_BASE * 2 ** i for i in range(3)]
+    assert sleeps == [w / 2 for w in windows]
+
+
+def test_retry_after_header_is_a_floor(sleeps, monkeypatch):
+    monkeypatch.setattr(openai_client.random, "uniform", lambda lo, hi: 0.0)
+    error = openai_error.RateLimitError("429", http_status=429, headers={"retry-after": "7"})
+    create_chat(_failing(error), limiter=_limiter(), **REQUEST)
+    assert sleeps == [7.0]
+
+
+def test_client_errors_and_exhausted_retries_raise(sleeps):
+    create = _failing(openai_error.InvalidRequestError("400", param=None, http_status=400))
+    with pytest.raises(openai_error.InvalidRequestError):
+        create_chat(create, limiter=_limiter(), **REQUEST)
+    assert create.calls == 1 and sleeps == []
+
+    error = openai_error.RateLimitError("429", http_status=429)
+    create = _failing(error, error, error)
+    with pytest.raises(openai_error.RateLimitError):
+        create_chat(create, limiter=_limiter(), retries=2, **REQUEST)
+    assert create.calls == 3 and len(sleeps) == 2
+
+
+def test_token_bucket_throttles_past_capacity(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(openai_client.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    # відро порожнє: третій запит чекає секунду, четвертий — дві
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    now[0] += 10
+    assert bucket.reserve() == 0  # поповнилось, але не понад capacity
+    assert bucket.tokens == pytest.approx(1.0)
+
+
+def test_limiter_waits_and_settles_tokens(sleeps, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(openai_client.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter(rpm=60, tpm=600)
+    limiter.requests = TokenBucket(60, capacity=1)
+
+    create_chat(lambda **p: completion("ok", total_tokens=100), limiter=limiter,
+                max_tokens=500, **REQUEST)
+    assert sleeps == []
+    # зарезервовано оцінку (≈500), повернуто все понад фактичні 100 токенів
+    assert limiter.tokens.tokens == pytest.approx(500)
+
+    # другий запит за секунду: токенів досить, але відро запитів порожнє
+    create_chat(lambda **p: completion("ok"), limiter=limiter, max_tokens=100, **REQUEST)
+    assert sleeps == [pytest.approx(1.0)]
+    # третій не вміщується в залишок токенів: чекає, поки відро наповниться (10 токенів/с)
+    now[0] += 60
+    create_chat(lambda **p: completion("ok"), limiter=limiter, max_tokens=1100, **REQUEST)
+    assert sleeps[1] == pytest.approx((1101 - 600) / 10)
+
+
+def test_identical_inflight_requests_share_one_call(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    calls, followers_joined = [], threading.Semaphore(0)
+    join = openai_client._join
+
+    def counting_join(key):
+        fut, leader = join(key)
+        if not leader:
+            followers_joined.release()
+        return fut, leader
+
+    monkeypatch.setattr(openai_client, "_join", counting_join)
+
+    def create(**params):
+        calls.append(params)
+        started.set()
+        release.wait(5)
+        return completion("спільна")
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(create_chat(create, limiter=_limiter(), **REQUEST)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(create_chat(create, limiter=_limiter(), **REQUEST)))
+                 for _ in range(3)]
+    for t in followers:
+        t.start()
+    for _ in followers:
+        assert followers_joined.acquire(timeout=5)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert [r.choices[0].message.content for r in results] == ["спільна"] * 4
+    assert openai_client._inflight == {}
+
+
+def test_failed_inflight_request_propagates_and_is_not_reused(sleeps):
+    error = openai_error.InvalidRequestError("400", param=None, http_status=400)
+    with pytest.raises(openai_error.InvalidRequestError):
+        create_chat(_failing(error), limiter=_limiter(), **REQUEST)
+    assert openai_client._inflight == {}
+    assert create_chat(_failing(), limiter=_limiter(), **REQUEST).choices[0].message.content == "ok"
+
+
+def test_sampled_requests_are_not_coalesced():
+    started = threading.Barrier(2, timeout=5)
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        started.wait()  # обидва виклики мають бути в польоті одночасно
+        return completion("ok")
+
+    params = dict(REQUEST, temperature=0.7)
+    threads = [threading.Thread(target=create_chat, args=(create,), kwargs=dict(limiter=_limiter(), **params))
+               for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 2
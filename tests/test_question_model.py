@@ -0,0 +1,44 @@
+"""Question дає той самий XML і ті самі похідні поля, що й колишні словники."""
+import pickle
+
+import legacy
+from corpus import make_questions
+from moodle_xml import QuizBuilder, generate_moodle_xml_string, question_fragment
+from question import Question, as_question
+from test_moodle_xml_writer import QUESTIONS
+
+
+def test_question_objects_give_legacy_xml():
+    dicts = QUESTIONS + make_questions(300)
+    questions = [as_question(q) for q in dicts]
+    expected = legacy.generate_moodle_xml_string(dicts)
+    assert generate_moodle_xml_string(questions) == expected
+    # словники й питання можна змішувати
+    assert generate_moodle_xml_string([q if i % 2 else dicts[i] for i, q in enumerate(questions)]) == expected
+    assert QuizBuilder(dicts).xml() == expected
+
+
+def test_derived_fields_match_legacy_rules():
+    for d in QUESTIONS + make_questions(40):
+        q = as_question(d)
+        correct = sum(1 for _, c in d["answers"] if c)
+        assert q.type == legacy.detect_question_type(d["answers"])
+        assert q.correct == correct
+        assert q.penalty == (1.0 / correct if correct else 0)
+        assert q["text"] == d["text"] and list(q["answers"]) == d["answers"]
+        if q.type == "truefalse":
+            assert q.fractions == ((100, 0) if d["answers"][0][1] else (0, 100))
+        else:
+            assert q.fractions == tuple(100 if c else 0 for _, c in d["answers"])
+
+
+def test_question_is_immutable_value():
+    q = Question("Q", [("a", True), ("b", False), ("c", False)])
+    assert as_question(q) is q
+    assert q == Question("Q", (("a", True), ("b", False), ("c", False)))
+    assert q != Question("Q", [("a", False), ("b", True), ("c", False)])
+    assert pickle.loads(pickle.dumps(q)) == q
+    assert question_fragment(pickle.loads(pickle.dumps(q))) == question_fragment(q)
+    # однакові штрафи й набори оцінок ділять один об'єкт
+    other = Question("Інше", [("x", True), ("y", False), ("z", False)])
+    assert other.fractions is q.fractions and other.penalty is q.penalty
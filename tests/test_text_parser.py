@@ -0,0 +1,114 @@
+"""Потоковий парсер готового тесту збігається з початковим parse_text_format."""
+import io
+import random
+import tempfile
+
+import pytest
+
+import legacy
+from corpus import make_ready_text
+from parsers import iter_text_format, parse_text_file, parse_text_format
+
+SAMPLE = """Вступ до тесту без номера
+
+1. Столиця України?
+A. Львів
+Б) Київ
+C. Одеса
+Правильна відповідь: Б
+
+2.Оберіть прості числа
+А. 2
+B. 4
+В. 5
+Г. 9
+Правильні відповіді: A, В
+
+3. Земля кругла
+Варіанти: True / False
+Правильна відповідь: True
+коментар після відповіді ігнорується
+
+4. Без рядка з відповіддю
+A. так
+B. ні
+
+5. Поганий варіант
+A. перший
+другий без літери
+Правильна відповідь: A
+
+6. Один варіант
+A. лише один
+Правильный ответ: A
+"""
+
+# Рядки, з яких складаються випадкові тексти: номери, варіанти різних
+# форм, рядки відповідей, True/False, сміття і порожні рядки
+_LINES = [
+    "1. Питання?", "2.Друге", "12. ", "A. раз", "B) два", "В. три", "г. чотири", "D.", "E. п'ять",
+    "Правильна відповідь: A", "правильні відповіді: В, г", "Правильный ответ: B", "Правильна відповідь:",
+    "Варіанти: True / False", "Правильна відповідь: False", "Правильна відповідь: true",
+    "3. Правильна відповідь: A", "вступ", "  ", "",
+]
+
+
+def _fuzz_texts(n=2000, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        text = "\n".join(rng.choice(_LINES) for _ in range(rng.randint(0, 14)))
+        yield text.replace("\n", "\r\n") if rng.random() < 0.3 else text
+
+
+def _as_dicts(pairs):
+    questions, errors = [], []
+    for q, err in pairs:
+        if err is None:
+            questions.append({"text": q.text, "answers": list(q.answers)})
+        else:
+            errors.append(err)
+    return questions, errors
+
+
+def test_sample_matches_legacy():
+    expected = legacy.parse_text_format(SAMPLE)
+    assert _as_dicts(iter_text_format(SAMPLE)) == expected
+    assert len(expected[0]) == 3
+    # вступ — окремий блок без відповіді, далі блоки 5, 6 (двічі) і 7
+    assert [idx for idx, _ in expected[1]] == [1, 5, 6, 6, 7]
+
+
+def test_random_texts_match_legacy():
+    for text in _fuzz_texts():
+        assert _as_dicts(iter_text_format(text)) == legacy.parse_text_format(text), text
+
+
+@pytest.mark.parametrize("wrap", [
+    io.StringIO,
+    lambda s: io.BytesIO(s.encode("utf-8")),
+    lambda s: _spooled(s.encode("utf-8")),
+], ids=["текстовий", "бінарний", "spooled"])
+def test_file_sources_match_string(wrap):
+    expected = legacy.parse_text_format(SAMPLE)
+    source = wrap(SAMPLE)
+    assert _as_dicts(iter_text_format(source)) == expected
+    assert not source.closed  # обгортка не закриває чужий потік
+
+
+def _spooled(data):
+    f = tempfile.SpooledTemporaryFile(max_size=16)
+    f.write(data)
+    f.seek(0)
+    return f
+
+
+def test_corpus_file_matches_legacy(tmp_path):
+    path = str(tmp_path / "ready.txt")
+    make_ready_text(path, 400)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    expected = legacy.parse_text_format(text)
+    questions, errors = parse_text_file(path)
+    assert (questions, errors) == parse_text_format(text)
+    assert _as_dicts((q, None) for q in questions) == expected
+    assert len(questions) == 400 and errors == []
@@ -0,0 +1,116 @@
+"""Потоковий розбір document.xml збігається з python-docx і початковим parse_from_word."""
+from io import BytesIO
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+import legacy
+from corpus import make_docx
+from parsers import _iter_python_docx_paragraphs, iter_docx_paragraphs, parse_from_word
+
+
+def _hyperlink(paragraph, text, bold=False):
+    """Гіперпосилання з одним раном (python-docx не має API для їх створення)."""
+    link = OxmlElement("w:hyperlink")
+    run = OxmlElement("w:r")
+    if bold:
+        rpr = OxmlElement("w:rPr")
+        rpr.append(OxmlElement("w:b"))
+        run.append(rpr)
+    t = OxmlElement("w:t")
+    t.text = text
+    run.append(t)
+    link.append(run)
+    paragraph._p.append(link)
+
+
+def _bold_off(run):
+    """<w:b w:val="0"/> — явно не жирний."""
+    b = OxmlElement("w:b")
+    b.set(qn("w:val"), "0")
+    run._r.get_or_add_rPr().append(b)
+
+
+def _document() -> BytesIO:
+    doc = Document()
+    doc.add_paragraph("A. осиротіла відповідь")
+
+    doc.add_paragraph("1. Столиця України?")
+    doc.add_paragraph("A. Львів")
+    doc.add_paragraph().add_run("B. Київ").bold = True
+    p = doc.add_paragraph("C. ")
+    p.add_run("Одеса").bold = False
+    _bold_off(doc.add_paragraph().add_run("D. Харків"))
+
+    # питання з двох абзаців і розрив рядка всередині абзацу
+    doc.add_paragraph("2. Текст питання,")
+    p = doc.add_paragraph("що продовжується")
+    p.add_run().add_break()
+    p.add_run("A. з розривом рядка").bold = True
+    p.add_run().add_break(WD_BREAK.PAGE)
+    p.add_run("\tB.\tз табуляцією")
+
+    # inline-формат: правильний — сегмент усередині жирного рану
+    p = doc.add_paragraph("3. Оберіть кольори: червоний; ")
+    p.add_run("зелений;").bold = True
+    p.add_run(" синій; жовтий")
+    p = doc.add_paragraph("4. Посилання: ")
+    _hyperlink(p, "перше; ", bold=True)
+    p.add_run("друге; третє")
+
+    # таблиці python-docx у Document.paragraphs не потрапляють
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "5. Питання в таблиці"
+    table.cell(0, 1).paragraphs[0].add_run("A. не враховується").bold = True
+
+    doc.add_paragraph("6. Останнє")
+    doc.add_paragraph().add_run("A. так").bold = True
+    doc.add_paragraph("B. ні")
+    doc.add_paragraph("   ")
+
+    buf = BytesIO()
+    doc.save(buf)
+    buf.seek(0)
+    return buf
+
+
+def _as_dicts(questions):
+    return [{"text": q.text, "answers": list(q.answers)} for q in questions]
+
+
+@pytest.fixture(params=["документ", "корпус"])
+def docx_file(request, tmp_path):
+    if request.param == "документ":
+        return _document()
+    path = str(tmp_path / "corpus.docx")
+    make_docx(path, 300)
+    with open(path, "rb") as f:
+        return BytesIO(f.read())
+
+
+def test_paragraphs_match_python_docx(docx_file):
+    expected = list(_iter_python_docx_paragraphs(docx_file))
+    docx_file.seek(0)
+    assert list(iter_docx_paragraphs(docx_file)) == expected
+
+
+def test_both_engines_match_legacy_parser(docx_file):
+    expected_qs, expected_errors = legacy.parse_from_word(docx_file)
+    for engine in ("stream", "python-docx"):
+        docx_file.seek(0)
+        questions, errors = parse_from_word(docx_file, engine=engine)
+        assert _as_dicts(questions) == expected_qs, engine
+        assert errors == expected_errors, engine
+
+
+def test_sample_document_is_nontrivial():
+    questions, errors = legacy.parse_from_word(_document())
+    assert errors == ["Відповідь без питання: «A. осиротіла відповідь»"]
+    inline = {q["text"]: q["answers"] for q in questions}
+    assert inline["3. Оберіть кольори"] == [
+        ("червоний", False), ("зелений", True), ("синій", False), ("жовтий", False)]
+    assert inline["4. Посилання"][0] == ("перше", False)  # python-docx не бачить ранів у посиланні
+    assert "5. Питання в таблиці" not in inline
@@ -0,0 +1,237 @@
+"""
+Спільні елементи інтерфейсу Streamlit для режимів: попередній перегляд і
+завантаження XML, фонові завдання та їхні результати.
+"""
+import time
+import uuid
+from io import BytesIO
+from itertools import groupby
+
+import streamlit as st
+
+from cache import cached_parse
+from jobs import get_queue
+from moodle_xml import category_path, question_fragment, write_sharded_zip
+from uploads import MemoryBudgetExceeded, UploadTooLarge
+
+# ================== Стан сесії ==================
+
+def session_memo(name: str, key, compute):
+    """
+    compute(), перерахований лише тоді, коли змінився key (наприклад, текст і
+    параметри): Streamlit перезапускає скрипт на кожну дію, зокрема на кожне
+    опитування фонового завдання. Зберігається в st.session_state[name].
+    """
+    cached = st.session_state.get(name)
+    if cached is None or cached[0] != key:
+        cached = st.session_state[name] = (key, compute())
+    return cached[1]
+
+# ================== Завантаження ==================
+
+def parse_upload(fmt, upload):
+    """
+    Розбирає завантажений файл парсером формату fmt (modes.InputFormat) через
+    кеш розборів; None з повідомленням, якщо файл завеликий або сервер не
+    має вільної пам'яті для розбору.
+    """
+    try:
+        with st.spinner(f"Розбір {upload.name}…"):
+            return cached_parse(fmt.kind, upload, fmt.parse)
+    except (UploadTooLarge, MemoryBudgetExceeded) as e:
+        st.error(f"{upload.name}: {e}")
+        return None
+
+# ================== Утиліти для XML ==================
+
+def download_xml(data, filename: str):
+    """
+    Створює кнопку для завантаження XML-файлу.
+    data — рядок, байти або ітератор байтових частин (iter_moodle_xml).
+    """
+    if isinstance(data, str):
+        xml_bytes = data.encode('utf-8')
+    elif isinstance(data, (bytes, bytearray)):
+        xml_bytes = data
+    else:
+        # частини збираємо одразу в байти, без проміжного рядка
+        xml_bytes = b"".join(data)
+    st.download_button(
+        label="📥 Завантажити XML",
+        data=xml_bytes,
+        file_name=filename,
+        mime="application/xml"
+    )
+
+def download_on_demand(make_data, filename: str, key: str):
+    """
+    Кнопка завантаження, для якої файл формується лише на запит:
+    make_data() (те саме, що data у download_xml) викликається тільки після
+    «Підготувати файл», а не на кожен rerun.
+    """
+    if st.button("📦 Підготувати файл для завантаження", key=f"{key}_prepare"):
+        download_xml(make_data(), filename)
+
+# Скільки питань показує попередній перегляд на одній сторінці
+PREVIEW_PAGE_SIZE = 20
+
+def _preview_text(item) -> str:
+    return item if isinstance(item, str) else item.text
+
+def xml_preview(items, key: str, fragments=None):
+    """
+    Посторінковий перегляд XML: items — питання (Question) або готові
+    фрагменти XML. XML генерується лише для питань поточної сторінки
+    (або береться з fragments, якщо їх уже пораховано), пошук іде за
+    текстом питання (для фрагментів — за самим XML).
+    """
+    st.subheader("📄 Попередній перегляд XML")
+    col1, col2 = st.columns([3, 1])
+    query = col1.text_input("Пошук у питаннях", key=f"{key}_query").strip().lower()
+    if query:
+        matches = [i for i, item in enumerate(items) if query in _preview_text(item).lower()]
+    else:
+        matches = range(len(items))
+    pages = max(1, -(-len(matches) // PREVIEW_PAGE_SIZE))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = 1  # після нового пошуку сторінок могло стати менше
+    page = int(col2.number_input("Сторінка", 1, pages, 1, key=page_key))
+
+    start = (page - 1) * PREVIEW_PAGE_SIZE
+    window = matches[start:start + PREVIEW_PAGE_SIZE]
+    if not window:
+        st.info("Немає питань, що відповідають пошуку.")
+        return
+    st.caption(f"Сторінка {page} з {pages}: питання {start + 1}–{start + len(window)} з {len(matches)}"
+               + (f" (знайдено за запитом, усього {len(items)})" if query else ""))
+
+    def fragment(i):
+        if fragments is not None:
+            return fragments[i]
+        return items[i] if isinstance(items[i], str) else question_fragment(items[i])
+
+    st.code("\n".join(fragment(i) for i in window), language="xml")
+
+def download_zip(questions, sources, max_bytes: int, max_questions: int = None):
+    """
+    Кнопка завантаження zip із частин Moodle XML; sources — назва джерела
+    (категорії) для кожного питання, сусідні питання одного джерела йдуть
+    в одну категорію.
+    """
+    buf = BytesIO()
+    sections = ((category_path(src), [q for q, _ in group])
+                for src, group in groupby(zip(questions, sources), key=lambda p: p[1]))
+    shards = write_sharded_zip(sections, buf, max_bytes, max_questions, name="merged_bank")
+    st.write(f"Частин: {len(shards)}")
+    st.download_button(
+        label="📥 Завантажити ZIP",
+        data=buf.getvalue(),
+        file_name="merged_bank.zip",
+        mime="application/zip"
+    )
+
+def save_to_store(questions, source, key: str):
+    """
+    Кнопка «Зберегти в банк питань» (question_store). questions — список
+    питань або функція, що його повертає (викликається лише після
+    натискання); source — назва джерела, список назв для кожного питання
+    або функція, що повертає такий список.
+    """
+    if not st.button("💾 Зберегти в банк питань", key=f"{key}_store"):
+        return
+    from question_store import get_store
+
+    if callable(questions):
+        questions = questions()
+    if callable(source):
+        source = source()
+    sources = [source] * len(questions) if isinstance(source, str) else source
+    store = get_store()
+    added = sum(store.add([q for q, _ in group], src)
+                for src, group in groupby(zip(questions, sources), key=lambda p: p[1]))
+    st.success(f"Збережено в банк питань: {added} нових з {len(questions)} "
+               f"(решта вже були в банку)" if added < len(questions) else
+               f"Збережено в банк питань: {added} нових")
+
+# ================== Фонові завдання ==================
+
+# Як часто сторінка перевіряє стан фонового завдання, секунди
+POLL_SECONDS = 2
+
+def _session_owner():
+    """Ідентифікатор сесії: черга чергує завдання різних сесій по колу."""
+    if "job_owner" not in st.session_state:
+        st.session_state.job_owner = uuid.uuid4().hex
+    return st.session_state.job_owner
+
+def submit_job(param, kind, fn, *args):
+    """Ставить завдання в чергу; ID зберігається в URL і переживає оновлення сторінки."""
+    st.query_params[param] = get_queue().submit(kind, fn, *args, owner=_session_owner())
+
+def poll_job(param, show_partial=None):
+    """
+    Показує стан завдання з параметра URL. Поки воно в черзі чи виконується,
+    перезапускає скрипт кожні POLL_SECONDS (проміжний результат, якщо він є,
+    віддається show_partial); повертає результат, коли готово.
+    """
+    job_id = st.query_params.get(param)
+    if not job_id:
+        return None
+    queue = get_queue()
+    job = queue.status(job_id)
+    if job is None:
+        st.warning("Завдання не знайдено (можливо, його вже видалено).")
+        del st.query_params[param]
+        return None
+    if job["status"] == "failed":
+        st.error(f"Помилка: {job['error']}")
+        return None
+    if job["status"] == "done":
+        return queue.result(job_id)
+    if job["status"] == "queued":
+        running, queued = queue.load()
+        st.info(f"Завдання в черзі (виконується: {running}, очікує: {queued}). "
+                "Сторінку можна оновити — результат не загубиться.")
+    else:
+        st.progress(job["progress"])
+        st.text(job["message"] or "Виконується…")
+        partial = queue.partial(job_id)
+        if partial is not None and show_partial is not None:
+            show_partial(partial)
+    time.sleep(POLL_SECONDS)
+    st.rerun()
+
+def _show_preflight(data):
+    """Звіт llm.preflight (токени до і після стиснення, очікуваний час), якщо він є."""
+    if data.get("preflight"):
+        from llm import describe_preflight
+
+        st.caption(describe_preflight(data["preflight"]))
+
+def show_streamed_questions(partial):
+    """Питання, що вже надійшли від GPT, поки генерація триває."""
+    _show_preflight(partial)
+    for n, fragment in enumerate(partial["fragments"], 1):
+        with st.expander(f"Питання {n}", expanded=n == len(partial["fragments"])):
+            st.code(fragment, language="xml")
+
+def _generated_questions(xml: str):
+    from parsers import parse_from_moodle_xml
+
+    return parse_from_moodle_xml(BytesIO(xml.encode('utf-8')))[0]
+
+def show_generation_result(result, filename, source: str):
+    """Результат llm.gpt_job / youtube.youtube_job: звіт preflight, помилки, кількість, XML."""
+    _show_preflight(result)
+    if result["errors"]:
+        with st.expander(f"Пропущено {len(result['errors'])} некоректних кандидатів"):
+            for i, m in result["errors"]:
+                st.write(f"- Блок {i}: {m}")
+    if result["questions"] < result["requested"]:
+        st.error(f"GPT згенерував тільки {result['questions']} питань, "
+                 f"а потрібно {result['requested']}.")
+    if result["xml"]:
+        xml_preview(result.get("fragments") or [result["xml"]], filename)
+        download_on_demand(lambda: result["xml"], filename, filename)
+        save_to_store(lambda: _generated_questions(result["xml"]), source, filename)
@@ -0,0 +1,323 @@
+"""
+Обробники режимів інтерфейсу (реєструються в modes.MODES). Важкі
+залежності (openai, yt-dlp, numpy) імпортуються всередині обробника, тож
+завантажуються лише тоді, коли режим вибрано вперше.
+"""
+import streamlit as st
+
+from modes import FORMATS, format_for
+from moodle_xml import QuizBuilder, iter_moodle_xml
+from parsers import parse_text_format
+from question import Question
+from ui import (
+    PREVIEW_PAGE_SIZE, download_on_demand, download_xml, download_zip, parse_upload, poll_job,
+    save_to_store, session_memo, show_generation_result, show_streamed_questions, submit_job,
+    xml_preview,
+)
+
+
+def show_llm_cache_stats():
+    """Статистика кешу відповідей GPT у бічній панелі (оновлюється на кожен rerun)."""
+    from llm import LLM_CACHE
+
+    cache_stats = LLM_CACHE.stats()
+    st.sidebar.caption(
+        f"Кеш GPT: {cache_stats['hits']} влучань, {cache_stats['misses']} промахів, "
+        f"{cache_stats['entries']} записів ({cache_stats['bytes'] / 1024:.0f} КБ)"
+    )
+
+
+def excel_mode():
+    """Excel: правильні відповіді залиті жовтим."""
+    st.header("1️⃣ Режим Excel")
+    fmt = FORMATS[".xlsx"]
+    uploaded = st.file_uploader("Завантажте .xlsx", type=["xlsx"])
+    parsed = parse_upload(fmt, uploaded) if uploaded else None
+    if parsed is not None:
+        qs, errs = parsed.questions, parsed.errors
+        if errs:
+            st.error("Помилки при парсингу Excel:")
+            for i, m in errs:
+                st.write(f"- Блок {i}: {m}")
+        elif not qs:
+            st.warning("Питань не знайдено.")
+        else:
+            st.success(f"Знайдено {len(qs)} питань")
+            xml_preview(qs, "excel")
+            download_on_demand(parsed.xml, "excel_test.xml", "excel")
+            save_to_store(qs, uploaded.name, "excel")
+
+
+def gpt_mode():
+    """Генерація питань GPT за текстом (фонове завдання)."""
+    from llm import CHUNK_TOKENS, GPT_MODEL, count_tokens, describe_preflight, gpt_job, preflight
+
+    st.header("2️⃣ Режим GPT-генерації")
+    user_text = st.text_area("Вставте текст для генерації тесту українською", height=200)
+    # токени й preflight рахуються лише при зміні тексту чи параметрів,
+    # а не на кожен rerun (зокрема опитування запущеного завдання)
+    tokens = session_memo("gpt_text_tokens", (user_text, GPT_MODEL), lambda: count_tokens(user_text))
+    chunked = st.checkbox(
+        "Довгий текст: розбити на частини і генерувати паралельно",
+        value=tokens > CHUNK_TOKENS
+    )
+    # одним запитом — не більше, ніж уміщує відповідь моделі; частинами — скільки завгодно
+    q_count = int(st.number_input("Кількість питань", min_value=1, max_value=200 if chunked else 20,
+                                  value=10, key="gpt_count_chunked" if chunked else "gpt_count"))
+    # набраний текст зазвичай чистий, тож стиснення вмикається вручну
+    # (транскрипти YouTube стискаються завжди — youtube.youtube_job)
+    compact = st.checkbox("Стиснути текст: зайві пробіли, повтори речень, слова-паразити", value=False)
+    if user_text.strip():
+        checked = session_memo("gpt_preflight", (user_text, q_count, chunked, compact, GPT_MODEL),
+                               lambda: preflight(user_text, q_count, chunked, compact)[1])
+        st.caption(describe_preflight(checked))
+        if checked["truncated"]:
+            st.warning("Текст не вміщується в контекст моделі й буде обрізаний — "
+                       "краще розбити його на частини.")
+    if st.button("Створити тест"):
+        submit_job("gpt_job", "gpt", gpt_job, user_text, chunked, q_count, compact)
+    result = poll_job("gpt_job", show_streamed_questions)
+    if result is not None:
+        show_generation_result(result, "gpt_test.xml", "gpt")
+    show_llm_cache_stats()
+
+
+def manual_mode():
+    """Ручне створення, редагування й видалення питань."""
+    st.header("3️⃣ Ручне створення питань")
+    if "manual_bank" not in st.session_state:
+        st.session_state.manual_bank = QuizBuilder()
+    bank = st.session_state.manual_bank
+    editing = st.session_state.get("manual_edit")
+    current = bank.questions[editing] if editing is not None else None
+
+    if current is not None:
+        st.info(f"Редагування питання {editing + 1}")
+    types = ["Single-choice", "Multiple-choice", "True/False"]
+    default_type = {"multiple": 1, "truefalse": 2}.get(current.type, 0) if current is not None else 0
+    qtype = st.selectbox("Тип питання", types, index=default_type, key=f"manual_type_{editing}")
+    # ключі віджетів залежать від редагованого питання, щоб форма заповнилась його значеннями
+    with st.form(f"manual_form_{editing}"):
+        q_txt = st.text_input("Текст питання", value=current.text if current is not None else "")
+        answers = []
+        if qtype == "True/False":
+            is_true = current.fractions[0] > 0 if current is not None and current.type == "truefalse" else True
+            corr = st.radio("Правильна відповідь", ["true", "false"], index=0 if is_true else 1)
+            answers = [("true", corr == "true"), ("false", corr == "false")]
+        else:
+            prev = list(current.answers)[:4] if current is not None and current.type != "truefalse" else []
+            prev += [("", False)] * (4 - len(prev))
+            cols = st.columns([8, 1])
+            for letter, (text, corr) in zip("ABCD", prev):
+                answers.append((
+                    cols[0].text_input(f"{letter}.", value=text, key=f"a{letter}_{editing}"),
+                    cols[1].checkbox(f"Правильна {letter}", value=corr, key=f"c{letter}_{editing}",
+                                    label_visibility="collapsed"),
+                ))
+        submitted = st.form_submit_button("Зберегти зміни" if current is not None else "Додати питання")
+        if submitted:
+            if current is not None:
+                bank.update(editing, Question(q_txt, answers))
+                del st.session_state.manual_edit
+                st.rerun()
+            bank.add(Question(q_txt, answers))
+    if current is not None and st.button("Скасувати редагування"):
+        del st.session_state.manual_edit
+        st.rerun()
+
+    if len(bank):
+        st.subheader(f"Список питань ({len(bank)})")
+        pages = max(1, -(-len(bank) // PREVIEW_PAGE_SIZE))
+        if st.session_state.get("manual_list_page", 1) > pages:
+            st.session_state.manual_list_page = pages  # після видалення сторінок могло стати менше
+        page = int(st.number_input("Сторінка списку", 1, pages, 1, key="manual_list_page"))
+        start = (page - 1) * PREVIEW_PAGE_SIZE
+        for idx in range(start, min(start + PREVIEW_PAGE_SIZE, len(bank))):
+            col_text, col_edit, col_del = st.columns([10, 1, 1])
+            col_text.write(f"{idx + 1}. {bank.questions[idx].text}")
+            if col_edit.button("✏️", key=f"manual_edit_{idx}", help="Редагувати"):
+                st.session_state.manual_edit = idx
+                st.rerun()
+            if col_del.button("🗑️", key=f"manual_del_{idx}", help="Видалити"):
+                bank.remove(idx)
+                if editing is not None and editing >= idx:
+                    if editing == idx:
+                        del st.session_state.manual_edit
+                    else:
+                        st.session_state.manual_edit = editing - 1
+                st.rerun()
+        xml_preview(bank.questions, "manual", bank.fragments)
+        download_on_demand(bank.xml, "manual_test.xml", "manual")
+        save_to_store(bank.questions, "manual", "manual")
+
+
+def ready_mode():
+    """Готовий тест у текстовому форматі."""
+    st.header("4️⃣ Режим готового тесту")
+    ready = st.text_area(
+        "Вставте готовий тест у зазначеному форматі (1. … A. … Правильний відповідь: …)",
+        height=200
+    )
+    if st.button("Генерувати XML з готового тесту", key="gen_ready"):
+        st.session_state.ready_submitted = ready
+    # перегляд показується лише для тексту, з яким натиснули кнопку, а розбір
+    # пам'ятається за текстом, щоб пережити rerun (сторінки, пошук)
+    if st.session_state.get("ready_submitted") == ready:
+        qs, errs = session_memo("ready_parsed", ready, lambda: parse_text_format(ready))
+        if errs:
+            st.error("Помилки при розборі тесту:")
+            for idx, m in errs:
+                st.write(f"- Блок {idx}: {m}")
+        else:
+            st.success(f"Знайдено {len(qs)} питань")
+            xml_preview(qs, "ready")
+            download_on_demand(lambda: iter_moodle_xml(qs), "ready_test.xml", "ready")
+            save_to_store(qs, "ready", "ready")
+
+
+def word_mode():
+    """Word: правильні відповіді виділені жирним."""
+    st.header("5️⃣ Режим Word → Moodle XML")
+    fmt = FORMATS[".docx"]
+    file = st.file_uploader("Завантажте .docx з жирними правильними відповідіми", type=["docx"])
+    parsed = parse_upload(fmt, file) if file else None
+    if parsed is not None:
+        qs, errs = parsed.questions, parsed.errors
+        if errs:
+            st.error("Проблеми з розбором Word-документу:")
+            for e in errs:
+                st.write(f"- {e}")
+        elif not qs:
+            st.warning("Не знайдено жодного питання в документі.")
+        else:
+            st.success(f"Розпізнано {len(qs)} питань.")
+            xml_preview(qs, "word")
+            download_on_demand(parsed.xml, "word_test.xml", "word")
+            save_to_store(qs, file.name, "word")
+
+
+def youtube_mode():
+    """Тест за відео YouTube (фонове завдання)."""
+    from youtube import youtube_job
+
+    st.header("6️⃣ Режим YouTube → Moodle XML")
+    yt_url = st.text_input("Вставте посилання на YouTube відео")
+    if st.button("Створити тест з відео"):
+        submit_job("yt_job", "youtube", youtube_job, yt_url)
+    result = poll_job("yt_job", show_streamed_questions)
+    if result is not None:
+        if result["transcript_cached"]:
+            st.info("Транскрипт цього відео взято з кешу.")
+        show_generation_result(result, "youtube_test.xml", yt_url or "youtube")
+    show_llm_cache_stats()
+
+
+def merge_mode():
+    """Об'єднання з банком: дублікати, розбиття на частини."""
+    from dedup import DEFAULT_THRESHOLD, dedupe_bank
+
+    st.header("7️⃣ Об'єднання з банком питань (Moodle XML)")
+    bank = st.file_uploader("Банк питань (.xml)", type=["xml"])
+    uploads = st.file_uploader("Нові питання", type=[ext.lstrip(".") for ext in FORMATS], accept_multiple_files=True)
+    if bank and uploads:
+        parts = []
+        for up in [bank, *uploads]:
+            parsed = parse_upload(format_for(up.name), up)
+            if parsed is None:
+                return
+            parts.append(parsed)
+            if parsed.errors:
+                with st.expander(f"{up.name}: {len(parsed.errors)} помилок"):
+                    for e in parsed.errors:
+                        st.write(f"- Блок {e[0]}: {e[1]}" if isinstance(e, tuple) else f"- {e}")
+            st.write(f"{up.name}: {len(parsed.questions)} питань")
+        total = sum(len(p.questions) for p in parts)
+        st.success(f"Разом {total} питань")
+        dedupe = st.checkbox("Вилучити майже однакові питання", value=True)
+        threshold = st.slider("Поріг схожості", 0.5, 1.0, DEFAULT_THRESHOLD, 0.05, disabled=not dedupe)
+        sharded = st.checkbox("Розбити на частини (zip, окрема категорія для кожного файлу)")
+        if sharded:
+            col1, col2 = st.columns(2)
+            shard_mb = col1.number_input("Макс. розмір частини, МБ", 0.1, 500.0, 2.0, 0.5)
+            shard_questions = col2.number_input("Макс. питань у частині (0 — без обмеження)", 0, 100000, 0, 100)
+        questions = [q for p in parts for q in p.questions]
+        names = [up.name for up, p in zip([bank, *uploads], parts) for _ in p.questions]
+
+        def merged():
+            """(питання, назви файлів, кластери) після вилучення дублікатів — раз на набір файлів і поріг."""
+            if not dedupe:
+                return questions, names, []
+
+            def run():
+                kept, clusters = dedupe_bank(questions, threshold)
+                dropped = {i for cluster in clusters for i in cluster[1:]}
+                return kept, [n for i, n in enumerate(names) if i not in dropped], clusters
+
+            key = (tuple(getattr(up, "file_id", up.name) for up in [bank, *uploads]), threshold)
+            return session_memo("merge_deduped", key, run)
+
+        if st.button("Об'єднати"):
+            merged_qs, merged_names, clusters = merged()
+            sources = [name.rsplit(".", 1)[0] for name in merged_names]
+            if dedupe:
+                st.info(f"Вилучено {total - len(merged_qs)} дублікатів у {len(clusters)} групах")
+                if clusters:
+                    with st.expander("Групи майже однакових питань (лишається перше)"):
+                        for cluster in clusters[:200]:
+                            st.markdown("\n".join(f"- {questions[i].text[:150]}" for i in cluster))
+                            st.write("---")
+            if sharded:
+                download_zip(merged_qs, sources, int(shard_mb * 1024 * 1024), shard_questions or None)
+            else:
+                download_xml(iter_moodle_xml(merged_qs), "merged_bank.xml")
+        # у банк іде те саме, що й у файл: без вилучених дублікатів
+        save_to_store(lambda: merged()[0], lambda: merged()[1], "merge")
+
+
+def store_mode():
+    """Банк питань (question_store): пошук, фільтри, експорт і видалення вибірки."""
+    from question_store import get_store
+
+    st.header("8️⃣ Банк питань")
+    store = get_store()
+    if "store_deleted" in st.session_state:
+        st.success(f"Видалено {st.session_state.pop('store_deleted')} питань")
+    type_counts, source_counts = dict(store.types()), dict(store.sources())
+    if not type_counts:
+        st.info("Банк питань порожній: збережіть питання кнопкою «💾 Зберегти в банк питань» "
+                "в інших режимах або імпортуйте файли через `python cli.py … --store`.")
+        return
+
+    query = st.text_input("Пошук за текстом питань і відповідей («*» у кінці слова — за початком слова)",
+                          key="store_query")
+    col1, col2 = st.columns(2)
+    types = col1.multiselect("Тип", list(type_counts), key="store_types",
+                             format_func=lambda t: f"{t} ({type_counts[t]})")
+    sources = col2.multiselect("Джерело", list(source_counts), key="store_sources",
+                               format_func=lambda s: f"{s or '—'} ({source_counts[s]})")
+    filters = dict(query=query, types=types, sources=sources)
+    total = store.count(**filters)
+    if not total:
+        st.info("Немає питань, що відповідають пошуку.")
+        return
+
+    pages = max(1, -(-total // PREVIEW_PAGE_SIZE))
+    if st.session_state.get("store_page", 1) > pages:
+        st.session_state.store_page = 1  # після нового пошуку сторінок могло стати менше
+    page = int(st.number_input("Сторінка", 1, pages, 1, key="store_page"))
+    start = (page - 1) * PREVIEW_PAGE_SIZE
+    rows = store.search(limit=PREVIEW_PAGE_SIZE, offset=start, **filters)
+    st.caption(f"Сторінка {page} з {pages}: питання {start + 1}–{start + len(rows)} з {total} "
+               f"(усього в банку {sum(type_counts.values())})")
+    for i, q, source in rows:
+        st.write(f"{i}. {q.text} — {q.type}, {source or '—'}")
+
+    limit = int(st.number_input("Скільки питань експортувати (0 — усі знайдені)", 0, total, min(total, 1000)))
+    download_on_demand(lambda: store.export(limit=limit or None, **filters), "question_bank.xml", "store")
+
+    with st.expander(f"Видалити знайдені питання ({total})"):
+        confirm = st.checkbox("Так, видалити з банку", key="store_confirm_delete")
+        if st.button("🗑️ Видалити", disabled=not confirm, key="store_delete"):
+            st.session_state.store_deleted = store.delete(**filters)
+            del st.session_state.store_confirm_delete
+            st.rerun()
@@ -0,0 +1,136 @@
+"""
+Обробка завантажених файлів з обмеженням пам'яті процесу.
+
+- Файл більший за MAX_UPLOAD_BYTES відхиляється ще до розбору.
+- Для розбору вміст копіюється частинами в тимчасовий файл, який лишається
+  в пам'яті лише до SPOOL_BYTES, а більший іде на диск (UPLOAD_TMP_DIR);
+  парсери читають уже з нього. Файл закривається (і видаляється) при виході
+  з spooled_upload, навіть якщо розбір упав.
+- Одночасні розбори ділять бюджет пам'яті процесу (MEMORY_BUDGET): кожен
+  резервує оцінку своєї пікової пам'яті, той, кому бракує місця, чекає в
+  черзі до BUDGET_WAIT_SECONDS, а розбір, більший за весь бюджет,
+  відхиляється одразу.
+"""
+import os
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
+
+from metrics import source_size
+
+_MB = 1024 * 1024
+
+MAX_UPLOAD_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 200 * _MB))
+SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", 8 * _MB))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None  # None — системний тимчасовий каталог
+MEMORY_BUDGET_BYTES = int(os.getenv("UPLOAD_MEMORY_BUDGET", 1024 * _MB))
+BUDGET_WAIT_SECONDS = float(os.getenv("UPLOAD_BUDGET_WAIT", 60))
+
+# Пікова пам'ять розбору на байт розібраних даних (заміряно tracemalloc на
+# корпусі benchmarks/corpus.py з запасом). xlsx і docx — стиснені zip, тож для
+# них рахується розпакований розмір XML, який читає парсер: питання з 1 МБ
+# xlsx займають у пам'яті понад 40 МБ, а картинки в документі — нічого.
+PARSE_MEMORY_FACTOR = {"excel": 3, "word": 2, "text": 4, "moodle_xml": 3}
+_ZIP_PARTS = {"excel": ("xl/worksheets/", "xl/sharedStrings"), "word": ("word/document",)}
+
+_CHUNK = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Файл перевищує MAX_UPLOAD_BYTES."""
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Розбір не вміщується в бюджет пам'яті (одразу або після очікування)."""
+
+
+def _mb(nbytes: int) -> str:
+    return f"{nbytes / _MB:.0f} МБ"
+
+
+class MemoryBudget:
+    """
+    Бюджет пам'яті процесу для одночасних розборів:
+        with MEMORY_BUDGET.reserve(estimate):
+            parser(f)
+    reserve чекає, поки звільниться місце (не довше timeout секунд).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes: int, timeout: float = BUDGET_WAIT_SECONDS):
+        if nbytes > self.limit:
+            raise MemoryBudgetExceeded(
+                f"Файл завеликий для розбору: потрібно близько {_mb(nbytes)} пам'яті, "
+                f"доступно {_mb(self.limit)}. Розділіть його на кілька файлів.")
+        with self._cond:
+            self.waiting += 1
+            try:
+                if not self._cond.wait_for(lambda: self.used + nbytes <= self.limit, timeout):
+                    raise MemoryBudgetExceeded(
+                        f"Сервер зараз обробляє інші великі файли ({_mb(self.used)} з {_mb(self.limit)}). "
+                        "Спробуйте пізніше.")
+            finally:
+                self.waiting -= 1
+            self.used += nbytes
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.used -= nbytes
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"limit": self.limit, "used": self.used, "waiting": self.waiting}
+
+
+MEMORY_BUDGET = MemoryBudget(MEMORY_BUDGET_BYTES)
+
+
+def parse_memory_estimate(kind: str, f, size: int) -> int:
+    """Оцінка пікової пам'яті розбору файлу f (розміром size байтів) формату kind."""
+    parts = _ZIP_PARTS.get(kind)
+    if parts:
+        try:
+            with zipfile.ZipFile(f) as zf:
+                size = sum(i.file_size for i in zf.infolist() if i.filename.startswith(parts))
+        except zipfile.BadZipFile:
+            pass  # про пошкоджений файл повідомить сам парсер
+        finally:
+            f.seek(0)
+    return size * PARSE_MEMORY_FACTOR.get(kind, 4)
+
+
+def check_size(upload, max_bytes: int = MAX_UPLOAD_BYTES) -> int:
+    """Розмір завантаження; UploadTooLarge, якщо він більший за max_bytes."""
+    size = source_size(upload) or 0
+    if size > max_bytes:
+        raise UploadTooLarge(f"Файл завеликий: {_mb(size)}, максимум {_mb(max_bytes)}.")
+    return size
+
+
+@contextmanager
+def spooled_upload(upload, spool_bytes: int = SPOOL_BYTES, directory: str = UPLOAD_TMP_DIR):
+    """
+    Копія завантаження в SpooledTemporaryFile (у пам'яті до spool_bytes,
+    далі — анонімний файл на диску), позиція на початку. Файл закривається
+    при виході з блоку, тож на диску нічого не лишається.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=spool_bytes, dir=directory,
+                                       prefix="moodle_upload_") as f:
+        if isinstance(upload, (bytes, bytearray)):
+            f.write(upload)
+        else:
+            upload.seek(0)
+            for chunk in iter(lambda: upload.read(_CHUNK), b""):
+                f.write(chunk)
+            upload.seek(0)
+        f.seek(0)
+        yield f
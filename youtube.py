@@ -0,0 +1,198 @@
+"""Завантаження аудіо з YouTube і транскрибація Whisper (з кешем за ID відео)."""
+import glob
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from llm import gpt_job
+from llm_cache import DEFAULT_CACHE_DIR, LLMCache
+from metrics import span
+from openai_client import transcribe_file
+
+WHISPER_MODEL = "whisper-1"
+
+# Максимальна тривалість сегмента; 10 хв моно 32 кбіт/с ≈ 2.4 МБ — далеко
+# від ліміту Whisper на 25 МБ на один файл
+SEGMENT_SECONDS = float(os.getenv("WHISPER_SEGMENT_SECONDS", 600))
+# Сегменти коротші за цей поріг не відрізаємо (тиша надто близько до початку)
+MIN_SEGMENT_SECONDS = float(os.getenv("WHISPER_MIN_SEGMENT_SECONDS", 120))
+TRANSCRIBE_CONCURRENCY = int(os.getenv("WHISPER_CONCURRENCY", 4))
+
+# Транскрипти змінюються лише разом із відео, тож зберігаємо їх довго
+TRANSCRIPT_CACHE = LLMCache(
+    os.getenv("TRANSCRIPT_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "transcripts.sqlite3")),
+    ttl=float(os.getenv("TRANSCRIPT_CACHE_TTL", 365 * 24 * 3600)),
+    max_bytes=int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", 500 * 1024 * 1024)),
+)
+
+_VIDEO_ID_RE = re.compile(
+    r"(?:youtu\.be/|youtube(?:-nocookie)?\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|live/|v/))"
+    r"([A-Za-z0-9_-]{11})"
+)
+
+# ================== Завантаження ==================
+
+def extract_video_id(url: str):
+    """ID відео з посилання YouTube (або None, якщо посилання не розпізнано)."""
+    m = _VIDEO_ID_RE.search(url or "")
+    return m.group(1) if m else None
+
+
+def download_audio_from_youtube(url: str, tmpdir: str) -> str:
+    """
+    Завантажує оригінальний аудіо-потік з YouTube за допомогою yt-dlp
+    без пост-обробки ffmpeg у каталог tmpdir і повертає шлях до файлу.
+    Каталогом (і його очищенням) керує викликач.
+    """
+    # шаблон: збережемо файл у тому вигляді, в якому він був у джерелі
+    out_template = os.path.join(tmpdir, 'audio.%(ext)s')
+    with span("download_audio", video_id=extract_video_id(url)) as s:
+        result = subprocess.run(
+            ['yt-dlp', '-f', 'bestaudio', '-o', out_template, url],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise Exception(f"Помилка завантаження аудіо: {result.stderr}")
+        files = glob.glob(os.path.join(tmpdir, 'audio.*'))
+        if not files:
+            raise Exception("Не знайдено файлу аудіо після завантаження")
+        s["output_size"] = os.path.getsize(files[0])
+    return files[0]
+
+# ================== Розбиття на сегменти ==================
+
+def detect_silences(path: str, noise_db: int = -30, min_silence: float = 0.5):
+    """
+    Повертає (тривалість, [(початок, кінець) тиші, ...]) за фільтром
+    ffmpeg silencedetect.
+    """
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostats', '-i', path,
+         '-af', f'silencedetect=noise={noise_db}dB:d={min_silence}', '-f', 'null', '-'],
+        capture_output=True,
+        text=True
+    )
+    log = result.stderr
+    m = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", log)
+    duration = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3)) if m else 0.0
+    starts = [float(x) for x in re.findall(r"silence_start:\s*(-?[\d.]+)", log)]
+    ends = [float(x) for x in re.findall(r"silence_end:\s*([\d.]+)", log)]
+    return duration, list(zip(starts, ends))
+
+
+def plan_segments(duration: float, silences, max_seconds: float = SEGMENT_SECONDS,
+                  min_seconds: float = MIN_SEGMENT_SECONDS):
+    """
+    Межі сегментів [(початок, кінець), ...] не довших за max_seconds.
+    Різ ставиться посередині найпізнішої паузи у дозволеному вікні; якщо
+    пауз немає — жорстко по max_seconds.
+    """
+    cuts = sorted((s + e) / 2 for s, e in silences)
+    segments, start = [], 0.0
+    while duration - start > max_seconds:
+        window = [c for c in cuts if start + min_seconds <= c <= start + max_seconds]
+        end = window[-1] if window else start + max_seconds
+        segments.append((start, end))
+        start = end
+    segments.append((start, duration))
+    return segments
+
+
+def _extract_segment(path: str, start: float, end: float, out_path: str) -> str:
+    # моно 16 кГц mp3 — маленький файл, якого Whisper цілком достатньо
+    subprocess.run(
+        ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y', '-ss', f'{start:.3f}',
+         '-to', f'{end:.3f}', '-i', path, '-vn', '-ac', '1', '-ar', '16000',
+         '-b:a', '32k', out_path],
+        check=True,
+        capture_output=True
+    )
+    return out_path
+
+# ================== Транскрибація ==================
+
+def _transcribe_file(path: str) -> str:
+    return transcribe_file(WHISPER_MODEL, path)
+
+
+def transcribe_audio(path: str, workdir: str, concurrency: int = TRANSCRIBE_CONCURRENCY) -> str:
+    """
+    Транскрибує аудіофайл. Якщо є ffmpeg і запис довший за SEGMENT_SECONDS,
+    він ділиться по паузах на сегменти, які транскрибуються паралельно,
+    а частини тексту склеюються в початковому порядку.
+    Без ffmpeg файл відправляється одним запитом, як і раніше.
+    """
+    with span("transcribe", input_size=os.path.getsize(path)) as s:
+        if shutil.which('ffmpeg') is None:
+            s["segments"] = 1
+            return _transcribe_file(path)
+        duration, silences = detect_silences(path)
+        s["duration"] = round(duration, 1)
+        if duration <= SEGMENT_SECONDS:
+            s["segments"] = 1
+            return _transcribe_file(path)
+
+        segments = plan_segments(duration, silences)
+        s["segments"] = len(segments)
+
+        def work(item):
+            idx, (start, end) = item
+            seg_path = _extract_segment(path, start, end, os.path.join(workdir, f'segment_{idx:04d}.mp3'))
+            return _transcribe_file(seg_path)
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            parts = list(pool.map(work, enumerate(segments)))
+        return " ".join(p for p in parts if p)
+
+# ================== Кеш транскриптів ==================
+
+def _transcript_key(video_id: str) -> str:
+    return TRANSCRIPT_CACHE.make_key(WHISPER_MODEL, "", video_id)
+
+
+def cached_transcript(url: str):
+    """Транскрипт відео з кешу або None."""
+    video_id = extract_video_id(url)
+    if video_id is None:
+        return None
+    return TRANSCRIPT_CACHE.get(_transcript_key(video_id))
+
+
+def store_transcript(url: str, text: str):
+    video_id = extract_video_id(url)
+    if video_id is not None:
+        TRANSCRIPT_CACHE.set(_transcript_key(video_id), text, model=WHISPER_MODEL)
+
+# ================== Фонове завдання ==================
+
+def youtube_job(report, url: str):
+    """
+    Завдання для черги jobs: відео → транскрипт → Moodle XML від GPT
+    (llm.gpt_job: стиснення транскрипту, питання надходять потоково, а
+    задовгий транскрипт ділиться на частини). Повертає те саме, що llm.gpt_job,
+    плюс "transcript_cached" — чи взято транскрипт з кешу.
+    """
+    transcript_text = cached_transcript(url)
+    from_cache = transcript_text is not None
+    if not from_cache:
+        # тимчасовий каталог видаляється разом з аудіо та сегментами
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report(0.1, "1/4: Завантаження аудіо з YouTube…")
+            audio_path = download_audio_from_youtube(url, tmpdir)
+
+            report(0.3, "2/4: Транскрибація аудіо…")
+            transcript_text = transcribe_audio(audio_path, tmpdir)
+        store_transcript(url, transcript_text)
+
+    def gpt_report(fraction, message="", partial=None):
+        report(0.6 + 0.4 * fraction, f"3/4: {message}", partial)
+
+    # транскрипт стискається перед відправленням; якщо й тоді не влазить у
+    # контекст моделі, питання генеруються по частинах
+    result = gpt_job(gpt_report, transcript_text, chunked=None, compact=True)
+    result["transcript_cached"] = from_cache
+    return result